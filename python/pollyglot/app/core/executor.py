@@ -0,0 +1,145 @@
+"""Worker pool for CPU-bound stages and event-loop blocking metrics."""
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: Optional[Executor] = None
+
+# Counters for CPU-bound work run inline on the loop vs. offloaded
+_stats = {
+    "inline_calls": 0,
+    "inline_ms": 0.0,
+    "inline_max_ms": 0.0,
+    "offloaded_calls": 0,
+    "offloaded_ms": 0.0
+}
+
+
+def get_executor() -> Optional[Executor]:
+    """
+    Return the worker pool selected by settings.cpu_executor.
+
+    Returns:
+        Thread or process pool, or None when offloading is disabled
+    """
+    global _executor
+    if _executor is None and settings.cpu_executor != "none":
+        if settings.cpu_executor == "process":
+            _executor = ProcessPoolExecutor(max_workers=settings.cpu_executor_workers)
+        elif settings.cpu_executor == "thread":
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.cpu_executor_workers,
+                thread_name_prefix="pollyglot-cpu"
+            )
+        else:
+            raise ValueError(f"Unknown CPU executor: {settings.cpu_executor}")
+    return _executor
+
+
+async def run_cpu_bound(func: Callable[..., T], *args: Any, size: int = 0) -> T:
+    """
+    Run a CPU-bound function, offloading it when the input is large.
+
+    Inputs below settings.cpu_offload_threshold_chars run inline, where the
+    executor hand-off would cost more than the work itself.
+
+    Args:
+        func: Function to call; must be picklable for the process pool
+        *args: Positional arguments for func
+        size: Input size in characters used against the threshold
+
+    Returns:
+        The return value of func
+    """
+    executor = get_executor()
+    start_time = time.perf_counter()
+
+    if executor is None or size < settings.cpu_offload_threshold_chars:
+        result = func(*args)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        _stats["inline_calls"] += 1
+        _stats["inline_ms"] += elapsed_ms
+        _stats["inline_max_ms"] = max(_stats["inline_max_ms"], elapsed_ms)
+        return result
+
+    loop = asyncio.get_running_loop()
+    result = await loop.run_in_executor(executor, functools.partial(func, *args))
+    _stats["offloaded_calls"] += 1
+    _stats["offloaded_ms"] += (time.perf_counter() - start_time) * 1000
+    return result
+
+
+def shutdown_executor() -> None:
+    """Shut down the worker pool if it was started."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+class LoopLagMonitor:
+    """
+    Measure event-loop blocking as the lateness of a periodic timer.
+
+    A task sleeps for a fixed interval; any extra delay before it wakes up
+    is time the loop spent running other callbacks without yielding.
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.samples = 0
+        self.total_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.last_lag_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start sampling on the running loop."""
+        if self._task is None and self.interval > 0:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop sampling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (loop.time() - expected) * 1000)
+            self.samples += 1
+            self.total_lag_ms += lag_ms
+            self.last_lag_ms = lag_ms
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return loop lag statistics and CPU offload counters."""
+        return {
+            "lag_samples": self.samples,
+            "lag_avg_ms": self.total_lag_ms / self.samples if self.samples else 0.0,
+            "lag_max_ms": self.max_lag_ms,
+            "lag_last_ms": self.last_lag_ms,
+            "executor": settings.cpu_executor,
+            "offload_threshold_chars": settings.cpu_offload_threshold_chars,
+            **_stats
+        }
+
+
+# Global loop lag monitor
+loop_monitor = LoopLagMonitor(settings.loop_lag_interval)
@@ -0,0 +1,109 @@
+"""HTTP caching helpers: ETags, conditional requests and static asset headers."""
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from .settings import settings
+
+# Versioned asset URLs (?v=<asset version>) never change content
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def make_etag(payload: Any, weak: bool = False) -> str:
+    """
+    Build an ETag from bytes or a JSON-serializable value.
+
+    Args:
+        payload: Response body, or the fields that identify it
+        weak: Mark the tag weak (semantically, not byte-for-byte, equal)
+
+    Returns:
+        Quoted ETag header value
+    """
+    if not isinstance(payload, bytes):
+        payload = json.dumps(
+            payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")
+        ).encode("utf-8")
+    tag = f'"{hashlib.sha256(payload).hexdigest()[:32]}"'
+    return f"W/{tag}" if weak else tag
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match covers etag (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def conditional_response(
+    request: Request,
+    etag: str,
+    cache_control: str,
+    content: Optional[Dict[str, Any]] = None,
+    body: Optional[Response] = None
+) -> Response:
+    """
+    Answer a cacheable GET: 304 if the client's copy is current, else the body.
+
+    Args:
+        request: Incoming request (If-None-Match is read from it)
+        etag: ETag of the current representation
+        cache_control: Cache-Control header value
+        content: JSON body to send on a miss
+        body: Prebuilt response to send on a miss (instead of content)
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response = body if body is not None else JSONResponse(content)
+    response.headers.update(headers)
+    return response
+
+
+def asset_version(directory: str) -> str:
+    """Short hash of every file under directory, for cache-busting asset URLs."""
+    digest = hashlib.sha256()
+    for path in sorted(Path(directory).rglob("*")):
+        if path.is_file():
+            digest.update(str(path.relative_to(directory)).encode("utf-8"))
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:12]
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    StaticFiles that also sends Cache-Control.
+
+    Starlette already answers If-None-Match/If-Modified-Since with 304.
+    Requests carrying a ?v= version are cached for a year as immutable;
+    unversioned ones for settings.static_cache_seconds.
+    """
+
+    def file_response(
+        self, full_path, stat_result, scope: Scope, status_code: int = 200
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if response.status_code in (200, 304):
+            if "v" in parse_qs(scope.get("query_string", b"").decode("latin-1")):
+                response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+            else:
+                max_age = settings.static_cache_seconds
+                response.headers["Cache-Control"] = f"public, max-age={max_age}"
+        return response
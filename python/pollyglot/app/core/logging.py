@@ -1,33 +1,122 @@
 """Logging configuration for the application."""
+import json
 import logging
+import queue
+import random
 import sys
-from typing import Any, Dict
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
 
 from .settings import settings
+from .tracing import current_trace
+
+# Loggers carrying one record per request, subject to log_sample_rate
+SAMPLED_LOGGERS = ("pollyglot.request", "pollyglot.translation")
+
+_listener: Optional[QueueListener] = None
+
+
+class TextFormatter(logging.Formatter):
+    """Plain text formatter that appends structured fields."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            message = f"{message}: {fields}"
+        return message
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        log_data = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            log_data.update(fields)
+        if record.exc_info:
+            log_data["exception"] = self.formatException(record.exc_info)
+        return json.dumps(log_data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of INFO-and-below records; warnings always pass."""
+    
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        return random.random() < self.rate
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves all formatting to the listener thread.
+    
+    The stock QueueHandler formats the message on the calling thread so the
+    record can be pickled; records here never leave the process, so the
+    event loop only pays for an enqueue.
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
 
 
 def setup_logging() -> None:
     """Setup application logging configuration."""
+    global _listener
     
     # Configure log format
-    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    if settings.log_format == "json":
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = TextFormatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     
     # Set log level based on debug setting
     log_level = logging.DEBUG if settings.debug else logging.INFO
     
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+    
+    # Optionally move formatting and stdout writes to a background thread
+    if settings.log_queue:
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+        handler: logging.Handler = DeferredQueueHandler(log_queue)
+        if _listener is None:
+            _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+            _listener.start()
+    else:
+        handler = stream_handler
+    
     # Configure root logger
-    logging.basicConfig(
-        level=log_level,
-        format=log_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
-    )
+    logging.basicConfig(level=log_level, handlers=[handler])
     
     # Configure specific loggers
     logging.getLogger("uvicorn").setLevel(log_level)
     logging.getLogger("fastapi").setLevel(log_level)
     logging.getLogger("httpx").setLevel(logging.WARNING)
+    
+    if settings.log_sample_rate < 1.0:
+        for name in SAMPLED_LOGGERS:
+            logging.getLogger(name).addFilter(SamplingFilter(settings.log_sample_rate))
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background log thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
 
 
 def get_logger(name: str) -> logging.Logger:
@@ -57,7 +146,8 @@ def log_request(
     if extra_data:
         log_data.update(extra_data)
     
-    logger.info(f"Request completed: {log_data}")
+    # Fields are rendered by the handler, not on the request path
+    logger.info("Request completed", extra={"fields": log_data})
 
 
 def log_translation(
@@ -66,7 +156,8 @@ def log_translation(
     target_lang: str,
     model: str,
     latency_ms: float,
-    tokens_used: int = None
+    tokens_used: int = None,
+    cached: Optional[bool] = None
 ) -> None:
     """Log translation request details."""
     logger = get_logger("pollyglot.translation")
@@ -82,4 +173,12 @@ def log_translation(
     if tokens_used:
         log_data["tokens_used"] = tokens_used
     
-    logger.info(f"Translation completed: {log_data}")
\ No newline at end of file
+    if cached is not None:
+        log_data["cached"] = cached
+    
+    trace = current_trace()
+    if trace is not None:
+        log_data["trace_id"] = trace.trace_id
+        log_data["timings"] = trace.breakdown()
+    
+    logger.info("Translation completed", extra={"fields": log_data})
@@ -0,0 +1,133 @@
+"""Prometheus metrics for translation traffic and upstream calls."""
+import os
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from .settings import settings
+
+# Seconds; translations range from cached lookups to long multi-segment documents
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+TRANSLATION_REQUESTS = Counter(
+    "pollyglot_translation_requests_total",
+    "Translation requests by endpoint, model, language pair and outcome",
+    ["endpoint", "model", "source", "target", "status"]
+)
+TRANSLATION_LATENCY = Histogram(
+    "pollyglot_translation_latency_seconds",
+    "End-to-end translation latency",
+    ["endpoint", "model", "source", "target"],
+    buckets=LATENCY_BUCKETS
+)
+TRANSLATION_TOKENS = Counter(
+    "pollyglot_translation_tokens_total",
+    "Tokens consumed by translations",
+    ["model", "source", "target"]
+)
+INFLIGHT_REQUESTS = Gauge(
+    "pollyglot_inflight_requests",
+    "Translation requests currently being served",
+    ["endpoint"],
+    multiprocess_mode="livesum"
+)
+
+UPSTREAM_LATENCY = Histogram(
+    "pollyglot_upstream_request_duration_seconds",
+    "Duration of individual upstream API attempts",
+    ["model", "status"],
+    buckets=LATENCY_BUCKETS
+)
+UPSTREAM_RETRIES = Counter(
+    "pollyglot_upstream_retries_total",
+    "Upstream attempts that were retries",
+    ["model"]
+)
+UPSTREAM_INFLIGHT = Gauge(
+    "pollyglot_upstream_inflight_requests",
+    "Upstream API attempts currently in flight",
+    ["model"],
+    multiprocess_mode="livesum"
+)
+
+ADMISSION_WAIT = Histogram(
+    "pollyglot_admission_wait_seconds",
+    "Time upstream calls waited for an admission slot",
+    ["priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+ADMISSION_REJECTED = Counter(
+    "pollyglot_admission_rejected_total",
+    "Upstream calls shed by admission control",
+    ["reason"]
+)
+
+CACHE_REQUESTS = Counter(
+    "pollyglot_cache_requests_total",
+    "Translation cache lookups by result",
+    ["result"]
+)
+
+
+def model_label(model: Optional[str]) -> str:
+    """
+    Bound the model label to configured models.
+
+    Clients may name any model, so unknown ones are grouped under "other"
+    to keep label cardinality fixed.
+    """
+    configured = model == settings.openrouter_model or model in settings.openrouter_fallback_models
+    if model and configured:
+        return model
+    return "other"
+
+
+def record_translation(
+    endpoint: str,
+    model: Optional[str],
+    source: str,
+    target: str,
+    latency_ms: float,
+    tokens_used: Optional[int] = None,
+    error: bool = False
+) -> None:
+    """Record the outcome of one translation request."""
+    model = model_label(model)
+    TRANSLATION_REQUESTS.labels(endpoint, model, source, target, "error" if error else "ok").inc()
+    TRANSLATION_LATENCY.labels(endpoint, model, source, target).observe(latency_ms / 1000)
+    if tokens_used:
+        TRANSLATION_TOKENS.labels(model, source, target).inc(tokens_used)
+
+
+@contextmanager
+def track_inflight(endpoint: str) -> Iterator[None]:
+    """Count a request as in flight for the duration of the block."""
+    gauge = INFLIGHT_REQUESTS.labels(endpoint)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+def generate_metrics() -> bytes:
+    """
+    Render all metrics in the Prometheus text format.
+
+    With PROMETHEUS_MULTIPROC_DIR set (gunicorn with several workers),
+    values are aggregated from every worker's files instead of this
+    process only.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest()
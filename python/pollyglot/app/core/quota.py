@@ -0,0 +1,196 @@
+"""Per-client token quotas charged by estimated and actual token usage."""
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from fastapi import Request
+
+from .rate_limit import RateLimitExceeded, TokenBucket, _get_identifier
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "pollyglot:quota:"
+
+# Token bucket with reserve/adjust in one atomic round trip, on Redis time.
+#   ARGV[1] capacity (burst tokens)
+#   ARGV[2] refill rate in tokens per millisecond
+#   ARGV[3] tokens to reserve, or to return (negative: charge) when adjusting
+#   ARGV[4] "reserve" or "adjust"
+# Returns {allowed, retry_after_ms, tokens_left}
+TOKEN_BUCKET_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local amount = tonumber(ARGV[3])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 1
+local retry_after = 0
+if ARGV[4] == 'reserve' then
+    local needed = math.min(amount, capacity)
+    if tokens < needed then
+        allowed = 0
+        retry_after = math.ceil((needed - tokens) / rate)
+    else
+        tokens = tokens - amount
+    end
+else
+    tokens = math.min(capacity, tokens + amount)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 1000)
+return {allowed, retry_after, math.floor(tokens)}
+"""
+
+
+def quota_key(request: Request) -> str:
+    """Budget key for a request: the client address, as for request limits."""
+    return _get_identifier(request)
+
+
+@dataclass
+class Reservation:
+    """Tokens reserved for one request, to be settled against actual usage."""
+    key: str
+    reserved: int
+    settled: bool = False
+
+
+class TokenQuota:
+    """
+    Per-key token budgets with burst allowance.
+
+    Each key refills at tokens_per_minute up to burst_tokens. A request
+    reserves its estimated cost up front and is refused with
+    RateLimitExceeded if the bucket cannot cover it; once the real usage
+    is known the difference is refunded or charged. As with the request
+    limiter, Redis makes budgets shared across workers and local buckets
+    take over while it is unreachable.
+    """
+
+    MAX_LOCAL_BUCKETS = 10000
+
+    def __init__(
+        self,
+        tokens_per_minute: int,
+        burst_tokens: int,
+        redis_url: Optional[str] = None,
+        enabled: bool = True,
+        redis_retry_seconds: float = 5.0
+    ):
+        self.tokens_per_minute = tokens_per_minute
+        self.burst_tokens = burst_tokens
+        self.redis_url = redis_url
+        self.enabled = enabled
+        self.redis_retry_seconds = redis_retry_seconds
+        self._redis = None
+        self._script = None
+        self._redis_down_until = 0.0
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def _get_script(self):
+        if not self.redis_url or time.monotonic() < self._redis_down_until:
+            return None
+        if self._script is None:
+            import redis.asyncio as redis_async
+
+            self._redis = redis_async.from_url(
+                self.redis_url,
+                socket_timeout=settings.rate_limit_redis_timeout,
+                socket_connect_timeout=settings.rate_limit_redis_timeout
+            )
+            self._script = self._redis.register_script(TOKEN_BUCKET_SCRIPT)
+        return self._script
+
+    def _local_bucket(self, key: str) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.MAX_LOCAL_BUCKETS:
+                full = [name for name, existing in self._buckets.items() if existing.is_full()]
+                for stale in full:
+                    del self._buckets[stale]
+                while len(self._buckets) >= self.MAX_LOCAL_BUCKETS:
+                    self._buckets.popitem(last=False)
+            # Refill over the time it takes to earn a full burst at the per-minute rate
+            bucket = TokenBucket(self.burst_tokens, 60 * self.burst_tokens / self.tokens_per_minute)
+            self._buckets[key] = bucket
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    async def _apply(self, key: str, amount: float, mode: str) -> Tuple[bool, float]:
+        script = self._get_script()
+        if script is not None:
+            try:
+                allowed, retry_after_ms, _ = await script(
+                    keys=[REDIS_KEY_PREFIX + key],
+                    args=[self.burst_tokens, self.tokens_per_minute / 60000, amount, mode]
+                )
+                return bool(allowed), float(retry_after_ms) / 1000
+            except Exception as e:
+                self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+                logger.warning(f"Redis token quota unavailable ({e}), using in-memory quotas")
+
+        bucket = self._local_bucket(key)
+        if mode == "reserve":
+            return bucket.acquire(amount)
+        bucket.refund(amount)
+        return True, 0.0
+
+    async def reserve(self, key: str, estimated_tokens: int) -> Reservation:
+        """
+        Reserve estimated_tokens from key's budget.
+
+        Raises:
+            RateLimitExceeded: If the budget cannot cover the estimate yet
+        """
+        if not self.enabled:
+            return Reservation(key, 0, settled=True)
+        allowed, retry_after = await self._apply(key, estimated_tokens, "reserve")
+        if not allowed:
+            raise RateLimitExceeded(f"{self.tokens_per_minute} tokens/minute", retry_after)
+        return Reservation(key, estimated_tokens)
+
+    async def settle(self, reservation: Reservation, tokens_used: Optional[int]) -> None:
+        """
+        Reconcile a reservation with the tokens actually consumed.
+
+        Args:
+            reservation: Result of reserve()
+            tokens_used: Tokens reported upstream; None or 0 when nothing was
+                consumed (cache hit or failed call), refunding the reservation
+        """
+        if reservation.settled:
+            return
+        reservation.settled = True
+        difference = reservation.reserved - (tokens_used or 0)
+        if difference:
+            try:
+                await self._apply(reservation.key, difference, "adjust")
+            except Exception as e:
+                logger.warning(f"Token quota settlement failed: {e}")
+
+    async def close(self) -> None:
+        """Close the Redis connection pool if it was opened."""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+            self._script = None
+
+
+# Global token quota; connects to Redis lazily on first use
+token_quota = TokenQuota(
+    tokens_per_minute=settings.quota_tokens_per_min,
+    burst_tokens=settings.quota_burst_tokens,
+    redis_url=settings.redis_url,
+    enabled=settings.quota_enabled and settings.rate_limit_enabled
+)
@@ -1,63 +1,253 @@
-"""Rate limiting configuration using SlowAPI."""
-from typing import Optional
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
-from fastapi import Request, Response
-import redis
+"""Per-client rate limiting with an async Redis GCRA backend and in-memory fallback."""
+import functools
+import inspect
 import logging
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
 
 from .settings import settings
 
 logger = logging.getLogger(__name__)
 
+REDIS_KEY_PREFIX = "pollyglot:ratelimit:"
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Generic cell rate algorithm in one atomic round trip. The key holds the
+# theoretical arrival time (TAT) in milliseconds of Redis server time, so
+# all workers share one clock.
+#   ARGV[1] emission interval (ms) = period / limit
+#   ARGV[2] period (ms), i.e. the burst tolerance for `limit` requests
+# Returns {allowed, retry_after_ms, remaining}
+GCRA_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if tat == nil or tat < now then
+    tat = now
+end
+
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, allow_at - now, 0}
+end
+
+redis.call('SET', KEYS[1], new_tat, 'PX', math.ceil(new_tat - now))
+return {1, 0, math.floor((now - allow_at) / interval)}
+"""
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a client exceeds an endpoint's rate limit."""
+
+    def __init__(self, limit: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded: {limit}")
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+def parse_rate(rate: str) -> Tuple[int, float]:
+    """
+    Parse a rate such as "10/minute" or "100/hour".
+
+    Returns:
+        Tuple of (requests allowed, period in seconds)
+    """
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)?\s*(second|minute|hour|day)s?\s*", rate)
+    if not match:
+        raise ValueError(f"Invalid rate limit: {rate}")
+    count, multiplier, unit = match.groups()
+    return int(count), PERIODS[unit] * int(multiplier or 1)
+
+
+class TokenBucket:
+    """Token bucket holding up to `capacity` tokens, refilled over `period`."""
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        Take `cost` tokens.
+
+        Costs above capacity are admitted from a full bucket and leave it
+        in debt, so oversized requests are slowed rather than refused forever.
+
+        Returns:
+            Tuple of (allowed, seconds until enough tokens are available)
+        """
+        now = time.monotonic()
+        self._refill(now)
+        needed = min(cost, self.capacity)
+        if self.tokens >= needed:
+            self.tokens -= cost
+            return True, 0.0
+        return False, (needed - self.tokens) / self.rate
+
+    def refund(self, amount: float) -> None:
+        """Return tokens (or charge more, if negative) after the fact."""
+        self._refill(time.monotonic())
+        self.tokens = min(self.capacity, self.tokens + amount)
 
-def _get_redis_client() -> Optional[redis.Redis]:
-    """Get Redis client if URL is configured."""
-    if settings.redis_url:
-        try:
-            client = redis.from_url(settings.redis_url)
-            # Test connection
-            client.ping()
-            return client
-        except Exception as e:
-            logger.warning(f"Could not connect to Redis: {e}. Using in-memory storage.")
-    return None
+    def is_full(self) -> bool:
+        """True when the bucket has refilled and carries no state worth keeping."""
+        self._refill(time.monotonic())
+        return self.tokens >= self.capacity
+
+
+class Limiter:
+    """
+    Rate limiter applied per endpoint and client address.
+
+    With a Redis URL, each check is one EVALSHA of the GCRA script over a
+    pooled async connection, so the limit holds across workers. Without
+    Redis, or while Redis is unreachable, each worker enforces the limit
+    with local token buckets. Nothing connects until the first check.
+    """
+
+    # Bound on local buckets before refilled ones are dropped
+    MAX_LOCAL_BUCKETS = 10000
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        enabled: bool = True,
+        redis_retry_seconds: float = 5.0
+    ):
+        self.redis_url = redis_url
+        self.enabled = enabled
+        self.redis_retry_seconds = redis_retry_seconds
+        self._redis = None
+        self._script = None
+        self._redis_down_until = 0.0
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.redis_errors = 0
+
+    def _get_script(self):
+        if not self.redis_url or time.monotonic() < self._redis_down_until:
+            return None
+        if self._script is None:
+            import redis.asyncio as redis_async
+
+            self._redis = redis_async.from_url(
+                self.redis_url,
+                socket_timeout=settings.rate_limit_redis_timeout,
+                socket_connect_timeout=settings.rate_limit_redis_timeout
+            )
+            self._script = self._redis.register_script(GCRA_SCRIPT)
+        return self._script
+
+    def _check_local(self, key: str, limit: int, period: float) -> Tuple[bool, float]:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.MAX_LOCAL_BUCKETS:
+                self._prune()
+            bucket = self._buckets[key] = TokenBucket(limit, period)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.acquire()
+
+    def _prune(self) -> None:
+        for key in [key for key, bucket in self._buckets.items() if bucket.is_full()]:
+            del self._buckets[key]
+        while len(self._buckets) >= self.MAX_LOCAL_BUCKETS:
+            self._buckets.popitem(last=False)
+
+    async def check(self, key: str, limit: int, period: float) -> Tuple[bool, float]:
+        """
+        Count one request against key.
+
+        Returns:
+            Tuple of (allowed, seconds to wait before retrying)
+        """
+        script = self._get_script()
+        if script is not None:
+            interval_ms = period * 1000 / limit
+            try:
+                allowed, retry_after_ms, _ = await script(
+                    keys=[REDIS_KEY_PREFIX + key],
+                    args=[interval_ms, period * 1000]
+                )
+                return bool(allowed), float(retry_after_ms) / 1000
+            except Exception as e:
+                self.redis_errors += 1
+                self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+                logger.warning(f"Redis rate limiter unavailable ({e}), using in-memory limits")
+        return self._check_local(key, limit, period)
+
+    def limit(self, rate: str) -> Callable:
+        """
+        Decorate an endpoint to allow `rate` requests per client address.
+
+        The endpoint must take a `request: Request` parameter.
+        """
+        limit, period = parse_rate(rate)
+
+        def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+            if "request" not in inspect.signature(func).parameters:
+                raise TypeError(
+                    f"{func.__name__} needs a 'request: Request' parameter to be rate limited"
+                )
+            scope = f"{func.__module__}.{func.__name__}"
+
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if self.enabled:
+                    request: Request = kwargs["request"]
+                    key = f"{scope}:{_get_identifier(request)}"
+                    allowed, retry_after = await self.check(key, limit, period)
+                    if not allowed:
+                        raise RateLimitExceeded(rate, retry_after)
+                return await func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    async def close(self) -> None:
+        """Close the Redis connection pool if it was opened."""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+            self._script = None
 
 
 def _get_identifier(request: Request) -> str:
     """Get client identifier for rate limiting."""
-    return get_remote_address(request)
+    return request.client.host if request.client else "unknown"
 
 
-# Initialize limiter with Redis if available, fallback to in-memory
-redis_client = _get_redis_client()
-if redis_client:
-    limiter = Limiter(
-        key_func=_get_identifier,
-        storage_uri=settings.redis_url
-    )
-else:
-    limiter = Limiter(
-        key_func=_get_identifier,
-        default_limits=[f"{settings.rate_limit_per_min}/minute"]
-    )
+# Global limiter; connects to Redis lazily on the first check
+limiter = Limiter(redis_url=settings.redis_url, enabled=settings.rate_limit_enabled)
 
 
-def custom_rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> Response:
+def custom_rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> JSONResponse:
     """Custom rate limit exceeded handler."""
-    response = Response(
-        content=f"Rate limit exceeded: {exc.detail}",
+    return JSONResponse(
+        content={"detail": f"Rate limit exceeded: {exc.limit}"},
         status_code=429,
-        headers={"Content-Type": "application/json"}
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))}
     )
-    response.headers["Retry-After"] = str(exc.retry_after)
-    return response
 
 
 def setup_rate_limiting(app):
-    """Setup rate limiting middleware and handlers."""
+    """Setup rate limiting handlers."""
     app.state.limiter = limiter
     app.add_exception_handler(RateLimitExceeded, custom_rate_limit_exceeded_handler)
-    app.add_middleware(SlowAPIMiddleware)
\ No newline at end of file
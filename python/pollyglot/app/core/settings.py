@@ -1,5 +1,5 @@
 """Application settings using Pydantic Settings."""
-from typing import Optional
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -10,18 +10,124 @@ class Settings(BaseSettings):
     openrouter_api_key: str
     openrouter_model: str = "anthropic/claude-3.5-sonnet"
     public_app_url: Optional[str] = None
+    openrouter_timeout: float = 30.0
+    openrouter_base_url: str = "https://openrouter.ai/api/v1"
+    
+    # Retry Policy
+    retry_max_retries: int = 3
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 10.0
+    request_deadline: float = 45.0
+    retry_budget_ratio: float = 0.2
+    retry_budget_min_per_second: float = 1.0
+    
+    # Circuit Breaker (per upstream model)
+    circuit_failure_rate: float = 0.5
+    circuit_minimum_calls: int = 10
+    circuit_window_seconds: float = 30.0
+    circuit_open_seconds: float = 30.0
+    circuit_half_open_max_calls: int = 2
+    
+    # Model Routing (fallbacks used only when the request does not pin a model)
+    openrouter_fallback_models: List[str] = []
+    hedge_enabled: bool = False
+    hedge_percentile: float = 0.95
+    hedge_default_delay: float = 3.0
+    hedge_min_delay: float = 0.25
+    
+    # Admission Control (concurrent upstream calls; 0 disables a limit or bound)
+    admission_max_inflight: int = 32
+    admission_max_queue: int = 128
+    admission_queue_timeout: float = 10.0
+    admission_global_max_inflight: int = 0
+    
+    # HTTP Client Pool Configuration
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0
+    http_http2: bool = False
     
     # Rate Limiting
-    rate_limit_per_min: int = 10
+    rate_limit_per_min: int = 60
+    rate_limit_enabled: bool = True
+    rate_limit_redis_timeout: float = 0.25
+    
+    # Token Quota (per client, charged by estimated then actual tokens)
+    quota_enabled: bool = True
+    quota_tokens_per_min: int = 20000
+    quota_burst_tokens: int = 40000
     
     # Server Configuration
     host: str = "0.0.0.0"
     port: int = 8000
     debug: bool = False
     
+    # Logging ("text" or "json"); log_queue moves formatting and I/O off the event loop
+    log_format: str = "text"
+    log_queue: bool = False
+    log_sample_rate: float = 1.0
+    
+    # Tracing (Server-Timing header; export "none", "stdout" or "file")
+    tracing_enabled: bool = True
+    trace_export: str = "none"
+    trace_export_path: str = "traces.jsonl"
+    
+    # Token Estimation ("ratio" tables, or "tiktoken" when installed)
+    token_estimator: str = "ratio"
+    max_tokens_headroom: float = 1.5
+    max_tokens_floor: int = 64
+    
+    # Long-text chunking
+    max_input_chars: int = 100000
+    chunk_max_chars: int = 2000
+    chunk_concurrency: int = 4
+    
+    # Language Detection ("rules" or "ngram")
+    language_detector: str = "rules"
+    
+    # CPU-bound work offloading ("thread", "process" or "none")
+    cpu_executor: str = "thread"
+    cpu_executor_workers: Optional[int] = None
+    cpu_offload_threshold_chars: int = 2000
+    loop_lag_interval: float = 0.5
+    
+    # Batch Translation
+    batch_max_texts: int = 100
+    batch_max_targets: int = 10
+    batch_concurrency: int = 4
+    batch_pack_max_chars: int = 2000
+    batch_pack_max_segments: int = 20
+    
+    # Async Jobs (Redis stream when REDIS_URL is set, otherwise a SQLite file)
+    jobs_enabled: bool = True
+    jobs_workers: int = 4
+    jobs_sqlite_path: str = "var/jobs.db"
+    jobs_lease_seconds: float = 120.0
+    jobs_max_attempts: int = 3
+    jobs_ttl_seconds: int = 86400
+    jobs_webhook_timeout: float = 10.0
+    jobs_webhook_allowed_hosts: List[str] = []
+    
+    # HTTP Caching (GET /api/translate results and static assets)
+    http_cache_max_age: int = 3600
+    static_cache_seconds: int = 3600
+    
+    # Translation Memory (sentence-level reuse, SQLite file read via mmap)
+    memory_enabled: bool = False
+    memory_path: str = "var/translation_memory.db"
+    memory_mmap_bytes: int = 268435456
+    
     # Redis Configuration (optional)
     redis_url: Optional[str] = None
     
+    # Translation Cache
+    cache_enabled: bool = True
+    cache_max_entries: int = 10000
+    cache_ttl_seconds: int = 86400
+    cache_redis_enabled: bool = True
+    cache_redis_timeout: float = 0.25
+    cache_redis_retry_seconds: float = 5.0
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -0,0 +1,323 @@
+"""Per-request tracing with Server-Timing output and OTLP-style JSON export."""
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("pollyglot_trace", default=None)
+_current_span: ContextVar[Optional[str]] = ContextVar("pollyglot_span", default=None)
+
+
+def _new_id(num_bytes: int) -> str:
+    return os.urandom(num_bytes).hex()
+
+
+@dataclass
+class Span:
+    """One timed stage of a request."""
+    name: str
+    start: float
+    end: float
+    span_id: str = field(default_factory=lambda: _new_id(8))
+    parent_id: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end - self.start) * 1000
+
+
+class Trace:
+    """
+    Spans recorded for one request.
+
+    Times are perf_counter values; the wall-clock start is kept so spans can
+    be exported with absolute timestamps.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.trace_id = _new_id(16)
+        self.root_id = _new_id(8)
+        self.start = time.perf_counter()
+        self.start_unix = time.time()
+        self.end: Optional[float] = None
+        self.spans: List[Span] = []
+
+    def add_span(
+        self,
+        name: str,
+        start: float,
+        end: float,
+        parent_id: Optional[str] = None,
+        **attributes: Any
+    ) -> Span:
+        """Record a span measured by the caller."""
+        span = Span(
+            name=name,
+            start=start,
+            end=end,
+            parent_id=parent_id or _current_span.get() or self.root_id,
+            attributes=attributes
+        )
+        self.spans.append(span)
+        return span
+
+    def mark(self, name: str, **attributes: Any) -> Span:
+        """Record a span from the start of the request until now."""
+        return self.add_span(name, self.start, time.perf_counter(), parent_id=self.root_id, **attributes)
+
+    def breakdown(self) -> Dict[str, float]:
+        """Total milliseconds per span name, in first-seen order."""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+        if self.end is not None:
+            totals["total"] = (self.end - self.start) * 1000
+        return {name: round(value, 2) for name, value in totals.items()}
+
+    def server_timing(self) -> str:
+        """Render the breakdown as a Server-Timing header value."""
+        return ", ".join(f"{name};dur={value:.2f}" for name, value in self.breakdown().items())
+
+
+def current_trace() -> Optional[Trace]:
+    """Return the trace of the request being served, if any."""
+    return _current_trace.get()
+
+
+def mark(name: str, **attributes: Any) -> None:
+    """Record a span from the start of the current request until now."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.mark(name, **attributes)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Time a block as a span of the current trace.
+
+    Does nothing outside a traced request. Spans opened inside the block,
+    including in tasks it starts, become its children.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    recorded = Span(name=name, start=time.perf_counter(), end=0.0,
+                    parent_id=_current_span.get() or trace.root_id, attributes=attributes)
+    token = _current_span.set(recorded.span_id)
+    try:
+        yield recorded
+    finally:
+        _current_span.reset(token)
+        recorded.end = time.perf_counter()
+        trace.spans.append(recorded)
+
+
+class HttpTraceRecorder:
+    """
+    Collect httpcore trace events for one upstream attempt.
+
+    Passed as the "trace" request extension; turns connection setup,
+    header round-trip and body read events into spans of the current trace.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.events: Dict[str, float] = {}
+
+    async def __call__(self, event_name: str, info: Dict[str, Any]) -> None:
+        # e.g. "connection.connect_tcp.started", "http11.receive_response_headers.complete"
+        self.events.setdefault(event_name.split(".", 1)[-1], time.perf_counter())
+
+    def _first(self, *names: str) -> Optional[float]:
+        times = [self.events[name] for name in names if name in self.events]
+        return min(times) if times else None
+
+    def record(self, trace: Trace, parent_id: Optional[str] = None) -> None:
+        """Add connection, TTFB and body spans to trace."""
+        events = self.events
+        connect_start = self._first("connect_tcp.started", "connect_unix_socket.started")
+        request_start = events.get("send_request_headers.started")
+
+        # Time spent waiting for a pooled connection (or to start dialing)
+        acquired = connect_start or request_start
+        if acquired is not None:
+            trace.add_span("acquire", self.started, acquired, parent_id=parent_id)
+
+        connect_end = events.get("start_tls.complete") or events.get("connect_tcp.complete")
+        if connect_start is not None and connect_end is not None:
+            trace.add_span("connect", connect_start, connect_end, parent_id=parent_id,
+                           tls="start_tls.complete" in events)
+
+        headers_end = events.get("receive_response_headers.complete")
+        if request_start is not None and headers_end is not None:
+            trace.add_span("ttfb", request_start, headers_end, parent_id=parent_id)
+
+        body_start = events.get("receive_response_body.started")
+        body_end = events.get("receive_response_body.complete")
+        if body_start is not None and body_end is not None:
+            trace.add_span("body", body_start, body_end, parent_id=parent_id)
+
+
+class SpanExporter:
+    """
+    Write finished traces as OTLP/JSON lines from a background thread.
+
+    Each line is an ExportTraceServiceRequest body, which OpenTelemetry
+    collectors can ingest with the file receiver.
+    """
+
+    def __init__(self, target: str = "stdout", path: Optional[str] = None):
+        self.target = target
+        self.path = path
+        self._queue: "queue.SimpleQueue[Optional[Trace]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="pollyglot-trace-export", daemon=True)
+        self._thread.start()
+
+    def export(self, trace: Trace) -> None:
+        """Queue a finished trace for export."""
+        self._queue.put(trace)
+
+    def shutdown(self) -> None:
+        """Flush queued traces and stop the export thread."""
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        stream = open(self.path, "a", encoding="utf-8") if self.target == "file" else sys.stdout
+        try:
+            while True:
+                trace = self._queue.get()
+                if trace is None:
+                    break
+                try:
+                    stream.write(json.dumps(to_otlp(trace)) + "\n")
+                    stream.flush()
+                except Exception as e:
+                    logger.warning(f"Trace export failed: {e}")
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    values = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        values.append({"key": key, "value": typed})
+    return values
+
+
+def to_otlp(trace: Trace) -> Dict[str, Any]:
+    """Convert a trace to an OTLP/JSON ExportTraceServiceRequest."""
+    def unix_nanos(perf: float) -> str:
+        return str(int((trace.start_unix + perf - trace.start) * 1e9))
+
+    end = trace.end if trace.end is not None else time.perf_counter()
+    spans = [{
+        "traceId": trace.trace_id,
+        "spanId": trace.root_id,
+        "name": trace.name,
+        "kind": 2,  # SPAN_KIND_SERVER
+        "startTimeUnixNano": unix_nanos(trace.start),
+        "endTimeUnixNano": unix_nanos(end),
+        "attributes": []
+    }]
+    for recorded in trace.spans:
+        spans.append({
+            "traceId": trace.trace_id,
+            "spanId": recorded.span_id,
+            "parentSpanId": recorded.parent_id,
+            "name": recorded.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": unix_nanos(recorded.start),
+            "endTimeUnixNano": unix_nanos(recorded.end),
+            "attributes": _otlp_attributes(recorded.attributes)
+        })
+
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": "pollyglot-translator"})},
+            "scopeSpans": [{"scope": {"name": "pollyglot"}, "spans": spans}]
+        }]
+    }
+
+
+_exporter: Optional[SpanExporter] = None
+
+
+def get_exporter() -> Optional[SpanExporter]:
+    """Return the exporter selected by settings.trace_export, starting it on first use."""
+    global _exporter
+    if _exporter is None and settings.trace_export in ("stdout", "file"):
+        _exporter = SpanExporter(settings.trace_export, settings.trace_export_path)
+    return _exporter
+
+
+def shutdown_tracing() -> None:
+    """Flush and stop the trace exporter if it was started."""
+    global _exporter
+    if _exporter is not None:
+        _exporter.shutdown()
+        _exporter = None
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware that traces API requests.
+
+    Starts a trace per request under path_prefix, adds a Server-Timing
+    header with the per-stage breakdown when the response starts, and
+    hands the finished trace to the exporter.
+    """
+
+    def __init__(self, app: Callable, path_prefix: str = "/api/"):
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(f"{scope['method']} {scope['path']}")
+        token = _current_trace.set(trace)
+
+        async def send_with_timing(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                trace.end = time.perf_counter()
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_trace.reset(token)
+            trace.end = time.perf_counter()
+            exporter = get_exporter()
+            if exporter is not None:
+                exporter.export(trace)
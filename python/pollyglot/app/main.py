@@ -1,15 +1,19 @@
 """Main FastAPI application."""
 from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import os
 
 from .core.settings import settings
-from .core.logging import setup_logging, get_logger
-from .core.rate_limit import setup_rate_limiting
-from .routers import health, translate
+from .core.logging import setup_logging, shutdown_logging, get_logger
+from .core.rate_limit import limiter, setup_rate_limiting
+from .core.quota import token_quota
+from .core.executor import loop_monitor, shutdown_executor
+from .core.http_cache import CachedStaticFiles, asset_version, conditional_response, make_etag
+from .core.tracing import TracingMiddleware, shutdown_tracing
+from .routers import health, jobs, metrics, translate
 
 # Setup logging
 setup_logging()
@@ -22,12 +26,25 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting PollyGlot Translator API")
     logger.info(f"Using model: {settings.openrouter_model}")
-    logger.info(f"Rate limit: {settings.rate_limit_per_min} requests/minute")
+    logger.info(f"Rate limit: {settings.rate_limit_per_min} requests/minute, {settings.quota_tokens_per_min} tokens/minute")
+    await translate.openrouter_service.startup()
+    loop_monitor.start()
+    if settings.jobs_enabled:
+        jobs.job_workers.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down PollyGlot Translator API")
+    await jobs.job_workers.stop()
+    await jobs.job_queue.close()
+    await loop_monitor.stop()
+    shutdown_executor()
+    await translate.openrouter_service.shutdown()
+    await limiter.close()
+    await token_quota.close()
+    shutdown_tracing()
+    shutdown_logging()
 
 
 # Create FastAPI app
@@ -50,40 +67,52 @@ app.add_middleware(
 # Setup rate limiting
 setup_rate_limiting(app)
 
+# Trace API requests (outermost, so Server-Timing covers the whole stack)
+if settings.tracing_enabled:
+    app.add_middleware(TracingMiddleware)
+
 # Include routers
 app.include_router(health.router, tags=["health"])
+app.include_router(metrics.router, tags=["metrics"])
 app.include_router(translate.router, tags=["translation"])
+app.include_router(jobs.router, tags=["jobs"])
 
 # Setup templates and static files
 templates = Jinja2Templates(directory="app/templates")
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="app/static"), name="static")
 
+# Appended to asset URLs so a deploy that changes them busts browser caches
+ASSET_VERSION = asset_version("app/static")
 
-@app.get("/")
-async def serve_index(request: Request):
-    """Serve the main application page."""
-    return templates.TemplateResponse(
+
+def _index_response(request: Request):
+    """Render the main page; clients revalidate it by ETag on every load."""
+    page = templates.TemplateResponse(
         "index.html",
         {
             "request": request,
             "app_title": "PollyGlot",
-            "default_model": settings.openrouter_model
-        }
+            "default_model": settings.openrouter_model,
+            "max_input_chars": settings.max_input_chars,
+            "asset_version": ASSET_VERSION
+        },
+        status_code=200
     )
+    return conditional_response(request, make_etag(page.body), "no-cache", body=page)
+
+
+@app.get("/")
+async def serve_index(request: Request):
+    """Serve the main application page."""
+    return _index_response(request)
 
 
 @app.exception_handler(404)
 async def not_found_handler(request: Request, exc):
     """Handle 404 errors by serving the main page (SPA behavior)."""
-    return templates.TemplateResponse(
-        "index.html",
-        {
-            "request": request,
-            "app_title": "PollyGlot",
-            "default_model": settings.openrouter_model
-        },
-        status_code=200
-    )
+    if request.url.path.startswith("/api/"):
+        return JSONResponse({"detail": getattr(exc, "detail", "Not Found")}, status_code=404)
+    return _index_response(request)
 
 
 if __name__ == "__main__":
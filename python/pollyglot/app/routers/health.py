@@ -2,6 +2,11 @@
 from fastapi import APIRouter
 from datetime import datetime
 
+from ..core.executor import loop_monitor
+from ..services.tokens import token_estimator
+from .jobs import job_workers
+from .translate import openrouter_service
+
 router = APIRouter()
 
 
@@ -12,4 +17,31 @@ async def health_check():
         "status": "ok",
         "timestamp": datetime.utcnow().isoformat(),
         "service": "pollyglot-translator"
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/healthz/upstream")
+async def upstream_pool_stats():
+    """Upstream HTTP connection pool statistics."""
+    return {
+        "status": "ok",
+        "timestamp": datetime.utcnow().isoformat(),
+        "pool": openrouter_service.pool_stats(),
+        "cache": openrouter_service.cache.stats() if openrouter_service.cache else None,
+        "memory": openrouter_service.memory.stats() if openrouter_service.memory else None,
+        "circuits": openrouter_service.breakers.stats(),
+        "routing": openrouter_service.router.stats(),
+        "admission": openrouter_service.admission.stats(),
+        "token_calibration": token_estimator.stats(),
+        "jobs": job_workers.stats()
+    }
+
+
+@router.get("/healthz/loop")
+async def event_loop_stats():
+    """Event-loop blocking and CPU offload statistics."""
+    return {
+        "status": "ok",
+        "timestamp": datetime.utcnow().isoformat(),
+        "loop": loop_monitor.stats()
+    }
@@ -0,0 +1,113 @@
+"""Asynchronous translation jobs router."""
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from pydantic import BaseModel, Field, validator
+
+from ..core.logging import get_logger
+from ..core.quota import quota_key, token_quota
+from ..core.rate_limit import limiter
+from ..core.settings import settings
+from ..services.jobs import Job, JobWorkerPool, create_job_queue, webhook_url_error
+from ..services.tokens import token_estimator
+from .translate import TranslationRequest, TranslationResponse, openrouter_service
+
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+# Global queue and workers; workers are started in the application lifespan
+job_queue = create_job_queue()
+job_workers = JobWorkerPool(
+    job_queue,
+    openrouter_service,
+    concurrency=settings.jobs_workers,
+    max_attempts=settings.jobs_max_attempts,
+    webhook_timeout=settings.jobs_webhook_timeout
+)
+
+
+class JobRequest(TranslationRequest):
+    """Request model for an asynchronous translation job."""
+    webhook_url: Optional[str] = Field(None, description="URL to POST the finished job to")
+
+    @validator("webhook_url")
+    def validate_webhook_url(cls, v):
+        """Webhooks must be http(s) URLs on allowed, non-internal hosts."""
+        if v is not None:
+            error = webhook_url_error(v)
+            if error:
+                raise ValueError(error)
+        return v
+
+
+class JobResponse(BaseModel):
+    """Response model for a translation job."""
+    id: str
+    status: str
+    created_at: float
+    updated_at: float
+    result: Optional[TranslationResponse] = None
+    error: Optional[str] = None
+
+
+@router.post("/api/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+@limiter.limit(f"{settings.rate_limit_per_min}/minute")
+async def create_job(request: Request, job_request: JobRequest, response: Response):
+    """
+    Queue a translation to run in the background.
+
+    Returns 202 with the job; poll GET /api/jobs/{id} (the Location
+    header) or pass webhook_url to be called when it finishes. The
+    estimated tokens are charged to the client's quota now and settled
+    when the job completes. Returns 503 when JOBS_ENABLED is off, since
+    no worker would ever run the job.
+    """
+    if not settings.jobs_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Job queue disabled"
+        )
+
+    if job_request.source == job_request.target:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Source and target languages cannot be the same"
+        )
+
+    reservation = await token_quota.reserve(
+        quota_key(request),
+        token_estimator.estimate(job_request.text, job_request.source, job_request.target).total
+    )
+    job = Job.create({
+        "text": job_request.text,
+        "source": job_request.source,
+        "target": job_request.target,
+        "model": job_request.model,
+        "segmented": job_request.segmented,
+        "webhook_url": job_request.webhook_url,
+        "quota_key": reservation.key,
+        "reserved_tokens": reservation.reserved
+    })
+
+    try:
+        await job_queue.enqueue(job)
+    except Exception as e:
+        await token_quota.settle(reservation, None)
+        logger.error(f"Failed to enqueue job: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Job queue unavailable"
+        )
+
+    response.headers["Location"] = f"/api/jobs/{job.id}"
+    return job.view()
+
+
+@router.get("/api/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """Return a job's status and, once finished, its result or error."""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job.view()
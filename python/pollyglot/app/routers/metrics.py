@@ -0,0 +1,13 @@
+"""Prometheus metrics router."""
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST
+
+from ..core.metrics import generate_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics")
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return Response(content=generate_metrics(), media_type=CONTENT_TYPE_LATEST)
@@ -1,24 +1,44 @@
 """Translation router with validation and rate limiting."""
+import json
+import math
 import uuid
-from typing import Optional
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from fastapi import APIRouter, HTTPException, Request, status
-from pydantic import BaseModel, Field, validator
-from slowapi import Limiter
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel, Field, ValidationError, validator
 
 from ..core.rate_limit import limiter
+from ..core.quota import quota_key, token_quota
+from ..core.settings import settings
+from ..core.executor import run_cpu_bound
+from ..core.http_cache import conditional_response, etag_matches, make_etag
 from ..core.logging import log_translation
+from ..core.metrics import record_translation, track_inflight
+from ..core.tracing import current_trace, mark, span
+from ..services.cache import make_cache_key
 from ..services.openrouter import OpenRouterService
 from ..services.detect import detector
+from ..services.tokens import token_estimator
 
 router = APIRouter()
 
+VALID_LANGUAGE_CODES = {
+    "auto", "en", "es", "fr", "de", "it", "pt", "ru", "ja", "ko", 
+    "zh", "ar", "hi", "nl", "sv", "da", "no", "fi", "pl", "tr"
+}
+
 
 class TranslationRequest(BaseModel):
     """Request model for translation."""
-    text: str = Field(..., min_length=1, max_length=5000, description="Text to translate")
+    text: str = Field(..., min_length=1, max_length=settings.max_input_chars, description="Text to translate")
     source: str = Field(default="auto", description="Source language code")
     target: str = Field(..., description="Target language code")
     model: Optional[str] = Field(None, description="OpenRouter model to use")
+    segmented: bool = Field(False, description="Cache sentence by sentence so edited texts reuse unchanged sentences")
     
     @validator("text")
     def validate_text(cls, v):
@@ -30,11 +50,7 @@ class TranslationRequest(BaseModel):
     @validator("source", "target")
     def validate_language_codes(cls, v):
         """Validate language codes."""
-        valid_codes = {
-            "auto", "en", "es", "fr", "de", "it", "pt", "ru", "ja", "ko", 
-            "zh", "ar", "hi", "nl", "sv", "da", "no", "fi", "pl", "tr"
-        }
-        if v not in valid_codes:
+        if v not in VALID_LANGUAGE_CODES:
             raise ValueError(f"Invalid language code: {v}")
         return v
     
@@ -55,46 +71,212 @@ class TranslationResponse(BaseModel):
     latency_ms: float
     tokens_used: Optional[int] = None
     detected_language: Optional[str] = None
+    cached: bool = False
+    timings: Optional[Dict[str, float]] = None
+
+
+class BatchTranslationRequest(BaseModel):
+    """Request model for batch translation."""
+    texts: List[str] = Field(..., description="Texts to translate")
+    source: str = Field(default="auto", description="Source language code")
+    targets: List[str] = Field(..., description="Target language codes")
+    model: Optional[str] = Field(None, description="OpenRouter model to use")
+    
+    @validator("texts")
+    def validate_texts(cls, v):
+        """Validate text inputs."""
+        if not v or len(v) > settings.batch_max_texts:
+            raise ValueError(f"Provide between 1 and {settings.batch_max_texts} texts")
+        for text in v:
+            if not text or not text.strip():
+                raise ValueError("Text cannot be empty")
+            if len(text) > settings.max_input_chars:
+                raise ValueError(f"Text cannot exceed {settings.max_input_chars} characters")
+        return [text.strip() for text in v]
+    
+    @validator("source")
+    def validate_source(cls, v):
+        """Validate source language code."""
+        if v not in VALID_LANGUAGE_CODES:
+            raise ValueError(f"Invalid language code: {v}")
+        return v
+    
+    @validator("targets")
+    def validate_targets(cls, v):
+        """Validate target language codes."""
+        if not v or len(v) > settings.batch_max_targets:
+            raise ValueError(f"Provide between 1 and {settings.batch_max_targets} targets")
+        for code in v:
+            if code not in VALID_LANGUAGE_CODES:
+                raise ValueError(f"Invalid language code: {code}")
+            if code == "auto":
+                raise ValueError("Target language cannot be 'auto'")
+        return list(dict.fromkeys(v))
+
+
+class BatchTranslationItem(BaseModel):
+    """Result for one (text, target) pair of a batch."""
+    index: int
+    text: Optional[str] = None
+    source_language: str
+    target_language: str
+    model: Optional[str] = None
+    tokens_used: Optional[int] = None
+    detected_language: Optional[str] = None
+    cached: bool = False
+    error: Optional[str] = None
+
+
+class BatchTranslationResponse(BaseModel):
+    """Response model for batch translation."""
+    results: List[BatchTranslationItem]
+    latency_ms: float
 
 
 # Initialize OpenRouter service
 openrouter_service = OpenRouterService()
 
 
+async def _resolve_source_language(translation_request: TranslationRequest) -> Tuple[str, Optional[str]]:
+    """
+    Resolve the effective source language for a request.
+    
+    Returns:
+        Tuple of (source language, detected language or None)
+    
+    Raises:
+        HTTPException: If source and target languages are the same
+    """
+    # Detect source language if auto
+    detected_language = None
+    source_lang = translation_request.source
+    
+    if source_lang == "auto":
+        with span("detect"):
+            detected_language = await run_cpu_bound(
+                detector.detect_language,
+                translation_request.text,
+                size=len(translation_request.text)
+            )
+        if detected_language != "auto":
+            source_lang = detected_language
+    
+    # Validate that source and target are different
+    if source_lang == translation_request.target and source_lang != "auto":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Source and target languages cannot be the same"
+        )
+    
+    return source_lang, detected_language
+
+
 @router.post("/api/translate", response_model=TranslationResponse)
-@limiter.limit("10/minute")
-async def translate_text(request: Request, translation_request: TranslationRequest):
+@limiter.limit(f"{settings.rate_limit_per_min}/minute")
+async def translate_text(request: Request, translation_request: TranslationRequest, debug: bool = False):
     """
     Translate text using OpenRouter API.
     
-    Rate limited to 10 requests per minute per IP.
+    Rate limited per IP to settings.rate_limit_per_min requests per minute
+    and charged against the client's token quota. With ?debug=true the
+    response includes a per-stage timing breakdown.
     """
-    request_id = str(uuid.uuid4())
+    return await _translate_one(request, translation_request, debug)
+
+
+@router.get("/api/translate", response_model=TranslationResponse)
+@limiter.limit(f"{settings.rate_limit_per_min}/minute")
+async def translate_text_get(
+    request: Request,
+    text: str,
+    target: str,
+    source: str = "auto",
+    model: Optional[str] = None
+):
+    """
+    Cacheable translation: the same request as POST /api/translate as a URL.
     
+    Responses carry a weak ETag over the translation and Cache-Control
+    (settings.http_cache_max_age), so browsers and the reverse proxy can
+    serve repeats. If-None-Match is first checked against the translation
+    cache alone: a current ETag there is answered with 304 without
+    charging quota. Otherwise the request is translated (and charged) as
+    usual, and still answered with 304 if the result matches.
+    """
     try:
-        # Detect source language if auto
-        detected_language = None
-        source_lang = translation_request.source
-        
-        if source_lang == "auto":
-            detected_language = detector.detect_language(translation_request.text)
-            if detected_language != "auto":
-                source_lang = detected_language
-        
-        # Validate that source and target are different
-        if source_lang == translation_request.target and source_lang != "auto":
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Source and target languages cannot be the same"
+        translation_request = TranslationRequest(text=text, source=source, target=target, model=model)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    cache_control = f"public, max-age={settings.http_cache_max_age}"
+    
+    if request.headers.get("if-none-match") and openrouter_service.cache is not None:
+        source_lang, detected_language = await _resolve_source_language(translation_request)
+        cached = await openrouter_service.cache.get(
+            make_cache_key(text, source_lang, target, model or openrouter_service.default_model)
+        )
+        if cached is not None:
+            etag = _translation_etag(
+                cached["content"], source_lang, target, cached["model"], detected_language
             )
+            if etag_matches(request, etag):
+                return conditional_response(request, etag, cache_control)
+    
+    response = await _translate_one(request, translation_request)
+    etag = _translation_etag(
+        response.text,
+        response.source_language,
+        response.target_language,
+        response.model,
+        response.detected_language
+    )
+    return conditional_response(
+        request,
+        etag,
+        cache_control,
+        content=jsonable_encoder(response, exclude_none=True)
+    )
+
+
+def _translation_etag(
+    text: str,
+    source_language: str,
+    target_language: str,
+    model: str,
+    detected_language: Optional[str]
+) -> str:
+    """Weak ETag of a translation; latency_ms and cached differ between identical responses."""
+    return make_etag([text, source_language, target_language, model, detected_language], weak=True)
+
+
+async def _translate_one(
+    request: Request,
+    translation_request: TranslationRequest,
+    debug: bool = False
+) -> TranslationResponse:
+    """Translate one validated request, charging and settling the client's quota."""
+    request_id = str(uuid.uuid4())
+    mark("validation")
+    reservation = await token_quota.reserve(
+        quota_key(request),
+        token_estimator.estimate(
+            translation_request.text, translation_request.source, translation_request.target
+        ).total
+    )
+    tokens_used = None
+    
+    try:
+        source_lang, detected_language = await _resolve_source_language(translation_request)
         
         # Call translation service
-        result = await openrouter_service.translate(
-            text=translation_request.text,
-            source=source_lang,
-            target=translation_request.target,
-            model=translation_request.model
-        )
+        with track_inflight("translate"):
+            result = await openrouter_service.translate(
+                text=translation_request.text,
+                source=source_lang,
+                target=translation_request.target,
+                model=translation_request.model,
+                segmented=translation_request.segmented
+            )
+        tokens_used = result.tokens_used
         
         # Log translation
         log_translation(
@@ -103,14 +285,25 @@ async def translate_text(request: Request, translation_request: TranslationReque
             target_lang=translation_request.target,
             model=result.model,
             latency_ms=result.latency_ms,
-            tokens_used=result.tokens_used
+            tokens_used=result.tokens_used,
+            cached=result.cached
+        )
+        record_translation(
+            endpoint="translate",
+            model=result.model,
+            source=source_lang,
+            target=translation_request.target,
+            latency_ms=result.latency_ms,
+            tokens_used=result.tokens_used,
+            error=bool(result.error)
         )
         
         # Handle translation errors
         if result.error:
             raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=result.error
+                status_code=result.status_code or status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=result.error,
+                headers={"Retry-After": str(math.ceil(result.retry_after))} if result.retry_after else None
             )
         
         return TranslationResponse(
@@ -120,7 +313,9 @@ async def translate_text(request: Request, translation_request: TranslationReque
             model=result.model,
             latency_ms=result.latency_ms,
             tokens_used=result.tokens_used,
-            detected_language=detected_language
+            detected_language=detected_language,
+            cached=result.cached,
+            timings=_debug_timings() if debug else None
         )
         
     except HTTPException:
@@ -129,4 +324,187 @@ async def translate_text(request: Request, translation_request: TranslationReque
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Translation failed: {str(e)}"
-        )
\ No newline at end of file
+        )
+    finally:
+        await token_quota.settle(reservation, tokens_used)
+
+
+def _debug_timings() -> Optional[Dict[str, float]]:
+    """Per-stage milliseconds recorded so far for the current request."""
+    trace = current_trace()
+    return trace.breakdown() if trace is not None else None
+
+
+def _format_sse(event: str, data: dict) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/api/translate/stream")
+@limiter.limit(f"{settings.rate_limit_per_min}/minute")
+async def translate_text_stream(request: Request, translation_request: TranslationRequest):
+    """
+    Translate text, streaming tokens as server-sent events.
+    
+    Emits "token" events with text deltas followed by a trailing "done"
+    event carrying the same metadata as TranslationResponse, or an
+    "error" event if the upstream call fails.
+    """
+    request_id = str(uuid.uuid4())
+    source_lang, detected_language = await _resolve_source_language(translation_request)
+    reservation = await token_quota.reserve(
+        quota_key(request),
+        token_estimator.estimate(
+            translation_request.text, translation_request.source, translation_request.target
+        ).total
+    )
+    
+    async def event_stream() -> AsyncIterator[str]:
+        start_time = time.time()
+        tokens_used = None
+        with track_inflight("stream"):
+            try:
+                async for event in openrouter_service.translate_stream(
+                    text=translation_request.text,
+                    source=source_lang,
+                    target=translation_request.target,
+                    model=translation_request.model
+                ):
+                    if event.event == "done":
+                        tokens_used = event.data["tokens_used"]
+                        log_translation(
+                            request_id=request_id,
+                            source_lang=source_lang,
+                            target_lang=translation_request.target,
+                            model=event.data["model"],
+                            latency_ms=event.data["latency_ms"],
+                            tokens_used=event.data["tokens_used"],
+                            cached=event.data["cached"]
+                        )
+                        record_translation(
+                            endpoint="stream",
+                            model=event.data["model"],
+                            source=source_lang,
+                            target=translation_request.target,
+                            latency_ms=event.data["latency_ms"],
+                            tokens_used=event.data["tokens_used"]
+                        )
+                        event.data.update({
+                            "source_language": source_lang,
+                            "target_language": translation_request.target,
+                            "detected_language": detected_language
+                        })
+                    elif event.event == "error":
+                        record_translation(
+                            endpoint="stream",
+                            model=translation_request.model or openrouter_service.default_model,
+                            source=source_lang,
+                            target=translation_request.target,
+                            latency_ms=(time.time() - start_time) * 1000,
+                            error=True
+                        )
+                    yield _format_sse(event.event, event.data)
+            finally:
+                await token_quota.settle(reservation, tokens_used)
+    
+    # Refunds the reservation if the client leaves before the stream starts;
+    # a no-op once event_stream() has settled it
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(token_quota.settle, reservation, None)
+    )
+
+
+@router.post("/api/translate/batch", response_model=BatchTranslationResponse)
+@limiter.limit(f"{settings.rate_limit_per_min}/minute")
+async def translate_batch(request: Request, batch_request: BatchTranslationRequest):
+    """
+    Translate many texts into many target languages in one request.
+    
+    Results are returned text-major in input order, one item per
+    (text, target) pair, with per-item errors instead of failing the batch.
+    """
+    request_id = str(uuid.uuid4())
+    start_time = time.time()
+    
+    if batch_request.source in batch_request.targets:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Source and target languages cannot be the same"
+        )
+    
+    # Resolve each text's source once, then fan out over targets
+    sources = []
+    for text in batch_request.texts:
+        detected_language = None
+        source_lang = batch_request.source
+        if source_lang == "auto":
+            detected_language = await run_cpu_bound(detector.detect_language, text, size=len(text))
+            if detected_language != "auto":
+                source_lang = detected_language
+        sources.append((source_lang, detected_language))
+    
+    items = []
+    pending = []
+    for text_index, text in enumerate(batch_request.texts):
+        source_lang, detected_language = sources[text_index]
+        for target in batch_request.targets:
+            item = BatchTranslationItem(
+                index=text_index,
+                source_language=source_lang,
+                target_language=target,
+                detected_language=detected_language
+            )
+            items.append(item)
+            if source_lang == target:
+                item.error = "Source and target languages cannot be the same"
+            else:
+                pending.append((item, (text, source_lang, target)))
+    
+    # Charge the whole batch up front, then settle against what it consumed
+    reservation = await token_quota.reserve(
+        quota_key(request),
+        sum(token_estimator.estimate(*request_item).total for _, request_item in pending)
+    )
+    results = []
+    try:
+        with track_inflight("batch"):
+            results = await openrouter_service.translate_many(
+                [request_item for _, request_item in pending],
+                model=batch_request.model
+            )
+    finally:
+        await token_quota.settle(reservation, sum(result.tokens_used or 0 for result in results))
+    
+    for (item, (_, source_lang, target)), result in zip(pending, results):
+        record_translation(
+            endpoint="batch",
+            model=result.model,
+            source=source_lang,
+            target=target,
+            latency_ms=result.latency_ms,
+            tokens_used=result.tokens_used,
+            error=bool(result.error)
+        )
+        item.model = result.model
+        item.tokens_used = result.tokens_used
+        item.cached = result.cached
+        if result.error:
+            item.error = result.error
+        else:
+            item.text = result.content
+    
+    latency_ms = (time.time() - start_time) * 1000
+    log_translation(
+        request_id=request_id,
+        source_lang=batch_request.source,
+        target_lang=",".join(batch_request.targets),
+        model=batch_request.model or openrouter_service.default_model,
+        latency_ms=latency_ms,
+        tokens_used=sum(result.tokens_used or 0 for result in results),
+        cached=all(result.cached for result in results)
+    )
+    
+    return BatchTranslationResponse(results=items, latency_ms=latency_ms)
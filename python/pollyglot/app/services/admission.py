@@ -0,0 +1,289 @@
+"""Admission control bounding concurrent upstream calls, with a priority wait queue."""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from ..core.metrics import ADMISSION_REJECTED, ADMISSION_WAIT
+from ..core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY = "pollyglot:admission:inflight"
+
+# Queue length at which finished waiters are purged when max_queue is 0
+UNBOUNDED_QUEUE_COMPACT_AT = 1024
+
+# Counting semaphore over a sorted set of leases scored by expiry, so slots
+# held by a crashed worker free themselves.
+#   ARGV[1] limit, ARGV[2] lease (ms), ARGV[3] lease id
+# Returns 1 if the lease was granted
+ACQUIRE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) < tonumber(ARGV[1]) then
+    redis.call('ZADD', KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+
+class Priority(IntEnum):
+    """Admission priority classes; lower values are admitted first."""
+    INTERACTIVE = 0
+    BATCH = 1
+    BACKGROUND = 2
+
+
+class AdmissionRejected(Exception):
+    """Raised when a call is shed instead of queued or times out waiting."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Server overloaded ({reason}), retry later")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    future: "asyncio.Future[None]" = field(compare=False)
+
+
+@dataclass
+class Permit:
+    """A granted slot, to be returned with AdmissionController.release()."""
+    lease: Optional[str] = None
+    started: float = field(default_factory=time.monotonic)
+
+
+class AdmissionController:
+    """
+    Process-wide limit on concurrent upstream calls.
+
+    Up to max_inflight calls run at once; further callers wait in a queue
+    of at most max_queue entries (unbounded if 0), ordered by priority and
+    then arrival, for at most queue_timeout seconds. When the queue is full a newcomer
+    displaces the newest waiter of a lower priority class, or is rejected
+    at once if there is none. Rejections carry a Retry-After estimate
+    from recent slot hold times.
+
+    With a Redis URL and global_max_inflight set, each admitted call also
+    takes a lease from a Redis semaphore shared by all workers, waiting
+    within the same deadline. Redis errors fall back to the local limit.
+    """
+
+    def __init__(
+        self,
+        max_inflight: int,
+        max_queue: int,
+        queue_timeout: float,
+        global_max_inflight: int = 0,
+        redis_url: Optional[str] = None,
+        lease_seconds: float = 60.0,
+        redis_retry_seconds: float = 5.0
+    ):
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.global_max_inflight = global_max_inflight
+        self.redis_url = redis_url
+        self.lease_seconds = lease_seconds
+        self.redis_retry_seconds = redis_retry_seconds
+        self.inflight = 0
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._hold_seconds = 1.0
+        self._redis = None
+        self._script = None
+        self._redis_down_until = 0.0
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {}
+
+    @property
+    def queued(self) -> int:
+        """Callers currently waiting for a slot."""
+        return sum(1 for waiter in self._queue if not waiter.future.done())
+
+    def retry_after(self) -> float:
+        """Estimated seconds until a new caller would be admitted."""
+        slots = max(1, self.max_inflight)
+        return max(1.0, self._hold_seconds * (self.queued + 1) / slots)
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        ADMISSION_REJECTED.labels(reason).inc()
+        return AdmissionRejected(reason, self.retry_after())
+
+    def _evict_for(self, priority: int) -> bool:
+        """Make room by rejecting the newest waiter of a lower priority class."""
+        candidates = [w for w in self._queue if not w.future.done() and w.priority > priority]
+        if not candidates:
+            return False
+        victim = max(candidates)
+        victim.future.set_exception(self._reject("displaced"))
+        return True
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE) -> Permit:
+        """
+        Wait for a slot.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the deadline passes
+        """
+        start = time.monotonic()
+        if self.max_inflight > 0:
+            await self._acquire_local(priority)
+        try:
+            lease = await self._acquire_global(start + self.queue_timeout)
+        except BaseException:
+            self._release_local()
+            raise
+        self.admitted += 1
+        ADMISSION_WAIT.labels(priority.name.lower()).observe(time.monotonic() - start)
+        return Permit(lease=lease)
+
+    async def _acquire_local(self, priority: Priority) -> None:
+        if self.inflight < self.max_inflight and not self.queued:
+            self.inflight += 1
+            return
+        if self.max_queue > 0 and self.queued >= self.max_queue and not self._evict_for(priority):
+            raise self._reject("queue_full")
+
+        if len(self._queue) > 2 * (self.max_queue or UNBOUNDED_QUEUE_COMPACT_AT):
+            # Drop entries that timed out, were cancelled or were displaced
+            self._queue = [w for w in self._queue if not w.future.done()]
+            heapq.heapify(self._queue)
+        waiter = _Waiter(int(priority), next(self._seq), asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if _granted(waiter.future):
+                # Handed a slot just as we gave up; pass it on
+                self._release_local()
+            waiter.future.cancel()
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._reject("timeout")
+            raise
+
+    def _release_local(self) -> None:
+        if self.max_inflight <= 0:
+            return
+        while self._queue:
+            waiter = heapq.heappop(self._queue)
+            if not waiter.future.done():
+                # The slot passes straight to the waiter; inflight is unchanged
+                waiter.future.set_result(None)
+                return
+        self.inflight -= 1
+
+    def _get_script(self):
+        if (
+            self.global_max_inflight <= 0
+            or not self.redis_url
+            or time.monotonic() < self._redis_down_until
+        ):
+            return None
+        if self._script is None:
+            import redis.asyncio as redis_async
+
+            self._redis = redis_async.from_url(
+                self.redis_url,
+                socket_timeout=settings.rate_limit_redis_timeout,
+                socket_connect_timeout=settings.rate_limit_redis_timeout
+            )
+            self._script = self._redis.register_script(ACQUIRE_SCRIPT)
+        return self._script
+
+    def _redis_failed(self, e: Exception) -> None:
+        self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+        logger.warning(f"Redis admission control unavailable ({e}), using the local limit only")
+
+    async def _acquire_global(self, deadline: float) -> Optional[str]:
+        lease = uuid.uuid4().hex
+        delay = 0.01
+        while True:
+            script = self._get_script()
+            if script is None:
+                return None
+            try:
+                granted = await script(
+                    keys=[REDIS_KEY],
+                    args=[self.global_max_inflight, int(self.lease_seconds * 1000), lease]
+                )
+            except Exception as e:
+                self._redis_failed(e)
+                return None
+            if granted:
+                return lease
+            if time.monotonic() + delay > deadline:
+                raise self._reject("global_timeout")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.25)
+
+    async def release(self, permit: Permit) -> None:
+        """Return a slot taken by acquire()."""
+        held = time.monotonic() - permit.started
+        self._hold_seconds = 0.8 * self._hold_seconds + 0.2 * held
+        self._release_local()
+        if permit.lease is not None and self._redis is not None:
+            try:
+                await self._redis.zrem(REDIS_KEY, permit.lease)
+            except Exception as e:
+                self._redis_failed(e)
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority = Priority.INTERACTIVE) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block."""
+        permit = await self.acquire(priority)
+        try:
+            yield
+        finally:
+            await self.release(permit)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return occupancy and rejection counters for monitoring."""
+        return {
+            "inflight": self.inflight,
+            "max_inflight": self.max_inflight,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "global_max_inflight": self.global_max_inflight if self.redis_url else 0
+        }
+
+    async def close(self) -> None:
+        """Close the Redis connection pool if it was opened."""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+            self._script = None
+
+
+def _granted(future: "asyncio.Future[None]") -> bool:
+    """True if a waiter's future was resolved with a slot."""
+    return future.done() and not future.cancelled() and future.exception() is None
+
+
+def create_admission_controller() -> AdmissionController:
+    """Build the admission controller from application settings."""
+    return AdmissionController(
+        max_inflight=settings.admission_max_inflight,
+        max_queue=settings.admission_max_queue,
+        queue_timeout=settings.admission_queue_timeout,
+        global_max_inflight=settings.admission_global_max_inflight,
+        redis_url=settings.redis_url,
+        lease_seconds=settings.request_deadline + settings.openrouter_timeout
+    )
@@ -0,0 +1,197 @@
+"""Translation cache with an in-process LRU tier and optional Redis tier."""
+import hashlib
+import json
+import logging
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from ..core.metrics import CACHE_REQUESTS
+from ..core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "pollyglot:translation:"
+
+
+def make_cache_key(text: str, source: str, target: str, model: str) -> str:
+    """
+    Build a content-addressed cache key for a translation request.
+
+    Text is NFC-normalized and stripped so that visually identical input
+    maps to the same key.
+
+    Args:
+        text: Text to translate
+        source: Source language code
+        target: Target language code
+        model: Resolved OpenRouter model
+
+    Returns:
+        Hex SHA-256 digest identifying the request
+    """
+    normalized = unicodedata.normalize("NFC", text).strip()
+    raw = json.dumps(
+        [normalized, source, target, model],
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Size- and TTL-bounded least-recently-used cache."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the entry for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store value under key, evicting the least recently used entry."""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TranslationCache:
+    """Two-tier translation cache: local LRU first, then Redis if configured."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        redis_url: Optional[str] = None,
+        redis_timeout: Optional[float] = None,
+        redis_retry_seconds: Optional[float] = None
+    ):
+        self.ttl_seconds = ttl_seconds or settings.cache_ttl_seconds
+        self.local = LRUCache(max_entries or settings.cache_max_entries, self.ttl_seconds)
+        self.redis_url = redis_url
+        self.redis_timeout = redis_timeout or settings.cache_redis_timeout
+        self.redis_retry_seconds = redis_retry_seconds or settings.cache_redis_retry_seconds
+        self._redis = None
+        self._redis_down_until = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    def _get_redis(self):
+        """Create the async Redis client lazily; None while Redis is marked down."""
+        if not self.redis_url or time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(
+                self.redis_url,
+                socket_timeout=self.redis_timeout,
+                socket_connect_timeout=self.redis_timeout
+            )
+        return self._redis
+
+    def _mark_redis_down(self, e: Exception, operation: str) -> None:
+        """Skip Redis for redis_retry_seconds after a failure, using the local tier."""
+        self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+        logger.warning(
+            f"Redis cache {operation} failed ({e}), using local cache for {self.redis_retry_seconds:g}s"
+        )
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached translation.
+
+        Args:
+            key: Key from make_cache_key
+
+        Returns:
+            Cached result fields, or None on a miss
+        """
+        value = self.local.get(key)
+
+        if value is None:
+            client = self._get_redis()
+            if client is not None:
+                try:
+                    raw = await client.get(REDIS_KEY_PREFIX + key)
+                    if raw is not None:
+                        value = json.loads(raw)
+                        self.local.set(key, value)
+                except Exception as e:
+                    self._mark_redis_down(e, "read")
+
+        if value is None:
+            self.misses += 1
+            CACHE_REQUESTS.labels("miss").inc()
+        else:
+            self.hits += 1
+            CACHE_REQUESTS.labels("hit").inc()
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store a translation in every configured tier.
+
+        Args:
+            key: Key from make_cache_key
+            value: JSON-serializable result fields
+        """
+        self.local.set(key, value)
+
+        client = self._get_redis()
+        if client is not None:
+            try:
+                await client.set(
+                    REDIS_KEY_PREFIX + key,
+                    json.dumps(value, ensure_ascii=False),
+                    ex=self.ttl_seconds
+                )
+            except Exception as e:
+                self._mark_redis_down(e, "write")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and local tier size."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "local_entries": len(self.local),
+            "redis": self.redis_url is not None
+        }
+
+    async def close(self) -> None:
+        """Close the Redis connection pool if one was opened."""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+def create_translation_cache() -> Optional[TranslationCache]:
+    """Build the translation cache from settings, or None if disabled."""
+    if not settings.cache_enabled:
+        return None
+
+    redis_url = settings.redis_url if settings.cache_redis_enabled else None
+    return TranslationCache(redis_url=redis_url)
@@ -0,0 +1,102 @@
+"""Split long documents into bounded segments on natural boundaries."""
+import re
+from typing import List, Tuple
+
+PARAGRAPH_PATTERN = re.compile(r"(\n\s*\n)")
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?。！？؟।])(\s+)")
+WHITESPACE_PATTERN = re.compile(r"(\s+)")
+
+
+def _split_keep(pattern: "re.Pattern", text: str) -> List[Tuple[str, str]]:
+    """Split text on pattern into (piece, following separator) pairs."""
+    parts = pattern.split(text)
+    # re.split with one capture group alternates piece, separator, piece, ...
+    return [(parts[i], parts[i + 1] if i + 1 < len(parts) else "") for i in range(0, len(parts), 2)]
+
+
+def _pieces(text: str, max_chars: int) -> List[Tuple[str, str]]:
+    """Break text into pieces no longer than max_chars, coarsest boundary first."""
+    pieces: List[Tuple[str, str]] = []
+    for paragraph, paragraph_sep in _split_keep(PARAGRAPH_PATTERN, text):
+        if len(paragraph) <= max_chars:
+            pieces.append((paragraph, paragraph_sep))
+            continue
+
+        sentences = _split_keep(SENTENCE_PATTERN, paragraph)
+        for index, (sentence, sentence_sep) in enumerate(sentences):
+            sep = sentence_sep if index < len(sentences) - 1 else paragraph_sep
+            if len(sentence) <= max_chars:
+                pieces.append((sentence, sep))
+                continue
+
+            # No usable sentence boundary: fall back to words, then hard cuts
+            words = _split_keep(WHITESPACE_PATTERN, sentence)
+            for word_index, (word, word_sep) in enumerate(words):
+                word_sep = word_sep if word_index < len(words) - 1 else sep
+                while len(word) > max_chars:
+                    pieces.append((word[:max_chars], ""))
+                    word = word[max_chars:]
+                pieces.append((word, word_sep))
+
+    return pieces
+
+
+def split_text(text: str, max_chars: int) -> List[Tuple[str, str]]:
+    """
+    Split text into segments of at most max_chars characters.
+
+    Paragraph boundaries are preferred, then sentence boundaries, then
+    whitespace. Adjacent pieces are merged greedily so segments stay close
+    to the limit. Joining every segment with its separator reproduces text.
+
+    Args:
+        text: Document to split
+        max_chars: Maximum segment length
+
+    Returns:
+        List of (segment, separator that followed it) tuples
+    """
+    segments: List[Tuple[str, str]] = []
+    current = ""
+    current_sep = ""
+
+    for piece, sep in _pieces(text, max_chars):
+        if not piece:
+            # Empty piece (e.g. leading whitespace): keep its separator
+            current_sep += sep
+        elif current and len(current) + len(current_sep) + len(piece) > max_chars:
+            segments.append((current, current_sep))
+            current, current_sep = piece, sep
+        elif current:
+            current, current_sep = current + current_sep + piece, sep
+        else:
+            if current_sep:
+                segments.append(("", current_sep))
+            current, current_sep = piece, sep
+
+    if current or current_sep:
+        segments.append((current, current_sep))
+
+    return segments
+
+
+def split_sentences(text: str) -> List[Tuple[str, str]]:
+    """
+    Split text into sentences on paragraph and sentence boundaries.
+
+    Joining every sentence with its separator reproduces text.
+
+    Returns:
+        List of (sentence, separator that followed it) tuples; sentences
+        are non-empty except possibly for leading whitespace
+    """
+    sentences: List[Tuple[str, str]] = []
+    for paragraph, paragraph_sep in _split_keep(PARAGRAPH_PATTERN, text):
+        pieces = _split_keep(SENTENCE_PATTERN, paragraph)
+        for index, (sentence, sentence_sep) in enumerate(pieces):
+            sep = sentence_sep if index < len(pieces) - 1 else paragraph_sep
+            if not sentence and sentences:
+                sentences[-1] = (sentences[-1][0], sentences[-1][1] + sep)
+            else:
+                sentences.append((sentence, sep))
+    return sentences
@@ -0,0 +1,173 @@
+"""Circuit breaker for upstream calls with fast-fail and half-open probing."""
+import logging
+import time
+from collections import OrderedDict, deque
+from enum import Enum
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from ..core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Failure-rate circuit breaker over a rolling time window.
+
+    While closed, call outcomes are recorded; once at least minimum_calls
+    have been seen in the window and the failure rate reaches the
+    threshold, the circuit opens and calls fail fast. After open_seconds
+    it half-opens and admits up to half_open_max_calls probes: if they all
+    succeed the circuit closes, and any failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 10,
+        window_seconds: float = 30.0,
+        open_seconds: float = 30.0,
+        half_open_max_calls: int = 2
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window_seconds = window_seconds
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self._state = CircuitState.CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open when the timer expires."""
+        if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit will admit probe requests."""
+        if self._state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    def allow(self) -> bool:
+        """
+        Ask permission to make a call.
+
+        Every allowed call must be followed by exactly one record() call.
+
+        Returns:
+            True if the call may proceed, False to fail fast
+        """
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and self._probes_in_flight < self.half_open_max_calls:
+            self._probes_in_flight += 1
+            return True
+        return False
+
+    def record(self, success: Optional[bool]) -> None:
+        """
+        Record the outcome of an allowed call.
+
+        Args:
+            success: True for success, False for an upstream failure, None
+                for outcomes that say nothing about upstream health (client
+                errors, cancellation)
+        """
+        if self._state == CircuitState.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if success is False:
+                self._transition(CircuitState.OPEN)
+            elif success:
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_max_calls:
+                    self._transition(CircuitState.CLOSED)
+            return
+
+        if success is None or self._state == CircuitState.OPEN:
+            return
+
+        now = time.monotonic()
+        self._outcomes.append((now, success))
+        while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+            self._outcomes.popleft()
+
+        if len(self._outcomes) >= self.minimum_calls:
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if failures / len(self._outcomes) >= self.failure_rate_threshold:
+                self._transition(CircuitState.OPEN)
+
+    def _transition(self, state: CircuitState) -> None:
+        if state == self._state:
+            return
+        logger.warning(f"Circuit {self.name} {self._state.value} -> {state.value}")
+        self._state = state
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        if state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        if state == CircuitState.CLOSED:
+            self._outcomes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return state and window counters for monitoring."""
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return {
+            "state": self.state.value,
+            "calls": len(self._outcomes),
+            "failures": failures,
+            "retry_after": self.retry_after()
+        }
+
+
+class CircuitBreakerRegistry:
+    """
+    One circuit breaker per (upstream, model).
+
+    Clients may name any model, so at most max_breakers are kept; the
+    least recently used breaker is dropped first (and starts closed if
+    its model comes back).
+    """
+
+    def __init__(self, max_breakers: int = 64):
+        self.max_breakers = max_breakers
+        self._breakers: "OrderedDict[Tuple[str, str], CircuitBreaker]" = OrderedDict()
+
+    def get(self, upstream: str, model: str) -> CircuitBreaker:
+        """Return the breaker for upstream and model, creating it on first use."""
+        key = (upstream, model)
+        breaker = self._breakers.get(key)
+        if breaker is not None:
+            self._breakers.move_to_end(key)
+        else:
+            breaker = CircuitBreaker(
+                name=f"{upstream}:{model}",
+                failure_rate_threshold=settings.circuit_failure_rate,
+                minimum_calls=settings.circuit_minimum_calls,
+                window_seconds=settings.circuit_window_seconds,
+                open_seconds=settings.circuit_open_seconds,
+                half_open_max_calls=settings.circuit_half_open_max_calls
+            )
+            self._breakers[key] = breaker
+            while len(self._breakers) > self.max_breakers:
+                self._breakers.popitem(last=False)
+        return breaker
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return stats for every breaker keyed by name."""
+        return {breaker.name: breaker.stats() for breaker in self._breakers.values()}
@@ -1,74 +1,135 @@
 """Simple language detection service (fallback)."""
 import re
-from typing import Dict
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from ..core.settings import settings
+
+
+@dataclass
+class DetectionResult:
+    """Result of language detection."""
+    language: str
+    confidence: float
+    scores: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ranked(self) -> List[Tuple[str, float]]:
+        """Languages ordered by descending score."""
+        return sorted(self.scores.items(), key=lambda item: item[1], reverse=True)
 
 
 class LanguageDetector:
     """Simple rule-based language detection as fallback."""
-    
+
     # Common words in different languages
-    LANGUAGE_PATTERNS = {
+    LANGUAGE_WORDS = {
         "en": [
-            r"\b(the|and|or|but|in|on|at|to|for|of|with|by)\b",
-            r"\b(is|are|was|were|have|has|had|will|would|could|should)\b"
+            "the", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by",
+            "is", "are", "was", "were", "have", "has", "had", "will", "would", "could", "should"
         ],
         "es": [
-            r"\b(el|la|los|las|de|del|en|con|por|para|que|es|son)\b",
-            r"\b(está|están|tiene|tienen|hace|hacer|ser|estar)\b"
+            "el", "la", "los", "las", "de", "del", "en", "con", "por", "para", "que", "es", "son",
+            "está", "están", "tiene", "tienen", "hace", "hacer", "ser", "estar"
         ],
         "fr": [
-            r"\b(le|la|les|de|du|des|en|dans|avec|pour|que|est|sont)\b",
-            r"\b(être|avoir|faire|aller|pouvoir|vouloir|savoir)\b"
+            "le", "la", "les", "de", "du", "des", "en", "dans", "avec", "pour", "que", "est", "sont",
+            "être", "avoir", "faire", "aller", "pouvoir", "vouloir", "savoir"
         ],
         "de": [
-            r"\b(der|die|das|den|dem|des|ein|eine|einen|einem|einer)\b",
-            r"\b(ist|sind|war|waren|haben|hat|hatte|wird|werden)\b"
+            "der", "die", "das", "den", "dem", "des", "ein", "eine", "einen", "einem", "einer",
+            "ist", "sind", "war", "waren", "haben", "hat", "hatte", "wird", "werden"
         ],
         "it": [
-            r"\b(il|la|lo|gli|le|di|del|della|in|con|per|che|è|sono)\b",
-            r"\b(essere|avere|fare|andare|potere|volere|sapere)\b"
+            "il", "la", "lo", "gli", "le", "di", "del", "della", "in", "con", "per", "che", "è", "sono",
+            "essere", "avere", "fare", "andare", "potere", "volere", "sapere"
         ],
         "pt": [
-            r"\b(o|a|os|as|de|do|da|dos|das|em|com|por|para|que|é|são)\b",
-            r"\b(ser|estar|ter|haver|fazer|ir|poder|querer|saber)\b"
+            "o", "a", "os", "as", "de", "do", "da", "dos", "das", "em", "com", "por", "para", "que", "é", "são",
+            "ser", "estar", "ter", "haver", "fazer", "ir", "poder", "querer", "saber"
         ]
     }
-    
-    def detect_language(self, text: str) -> str:
+
+    # Word tokens; matches the \b...\b boundaries the word lists assume
+    TOKEN_PATTERN = re.compile(r"\w+")
+
+    def __init__(self):
+        # Precomputed word -> [(language, weight)] index, built once
+        self._index: Dict[str, List[Tuple[str, int]]] = {}
+        for lang, words in self.LANGUAGE_WORDS.items():
+            for word in words:
+                self._index.setdefault(word, []).append((lang, 1))
+
+    def detect(self, text: str) -> DetectionResult:
         """
-        Detect language using simple pattern matching.
-        
+        Detect language in a single pass over the text.
+
         Args:
             text: Text to analyze
-            
+
         Returns:
-            Language code (e.g., "en", "es") or "auto" if unknown
+            DetectionResult with the detected language ("auto" if unknown),
+            the winning share of all matched words as confidence, and raw
+            per-language scores
         """
         if not text or len(text.strip()) < 10:
-            return "auto"
-        
-        text = text.lower()
-        scores: Dict[str, int] = {}
-        
-        for lang, patterns in self.LANGUAGE_PATTERNS.items():
-            score = 0
-            for pattern in patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                score += len(matches)
-            scores[lang] = score
-        
-        if not scores or max(scores.values()) == 0:
-            return "auto"
-        
+            return DetectionResult(language="auto", confidence=0.0)
+
+        scores: Dict[str, float] = dict.fromkeys(self.LANGUAGE_WORDS, 0)
+        index = self._index
+
+        for token in self.TOKEN_PATTERN.findall(text.lower()):
+            entries = index.get(token)
+            if entries:
+                for lang, weight in entries:
+                    scores[lang] += weight
+
+        total = sum(scores.values())
+        if total == 0:
+            return DetectionResult(language="auto", confidence=0.0, scores=scores)
+
         # Return language with highest score
         detected_lang = max(scores, key=scores.get)
-        
+        confidence = scores[detected_lang] / total
+
         # Only return detection if confidence is reasonable
         if scores[detected_lang] >= 2:
-            return detected_lang
-        
-        return "auto"
+            return DetectionResult(language=detected_lang, confidence=confidence, scores=scores)
+
+        return DetectionResult(language="auto", confidence=confidence, scores=scores)
+
+    def detect_language(self, text: str) -> str:
+        """
+        Detect language using simple pattern matching.
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Language code (e.g., "en", "es") or "auto" if unknown
+        """
+        return self.detect(text).language
+
+
+def create_detector(backend: str = None):
+    """
+    Create the language detector backend selected in settings.
+
+    Args:
+        backend: "rules" for the stop-word detector, "ngram" for the
+            character n-gram detector (defaults to settings.language_detector)
+
+    Returns:
+        Detector exposing detect() and detect_language()
+    """
+    backend = backend or settings.language_detector
+    if backend == "ngram":
+        from .ngram import NgramLanguageDetector
+        return NgramLanguageDetector()
+    if backend != "rules":
+        raise ValueError(f"Unknown language detector: {backend}")
+    return LanguageDetector()
 
 
 # Global detector instance
-detector = LanguageDetector()
\ No newline at end of file
+detector = create_detector()
@@ -0,0 +1,65 @@
+"""Shared HTTP client factory and connection pool introspection."""
+import logging
+from typing import Any, Dict
+
+import httpx
+
+from ..core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Create the long-lived pooled HTTP client used for upstream calls.
+
+    HTTP/2 is enabled only when configured and the optional ``h2`` package
+    is installed; otherwise the client falls back to HTTP/1.1 keep-alive.
+
+    Returns:
+        httpx.AsyncClient configured with the pool limits from settings
+    """
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry
+    )
+    timeout = httpx.Timeout(settings.openrouter_timeout)
+
+    http2 = settings.http_http2
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("HTTP/2 requested but 'h2' is not installed. Using HTTP/1.1.")
+            http2 = False
+
+    return httpx.AsyncClient(timeout=timeout, limits=limits, http2=http2)
+
+
+def get_pool_stats(client: httpx.AsyncClient) -> Dict[str, Any]:
+    """
+    Collect connection pool statistics for monitoring.
+
+    httpx does not expose pool state publicly, so this reads the underlying
+    httpcore pool defensively and reports zeros if the layout changes.
+
+    Args:
+        client: Client whose pool should be inspected
+
+    Returns:
+        Dictionary with connection counts and configured limits
+    """
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+
+    return {
+        "connections": len(connections),
+        "idle": sum(1 for conn in connections if conn.is_idle()),
+        "active": sum(1 for conn in connections if not conn.is_idle() and not conn.is_closed()),
+        "http2": sum(1 for conn in connections if "HTTP/2" in conn.info()),
+        "pending_requests": len(getattr(pool, "_requests", []) or []),
+        "max_connections": settings.http_max_connections,
+        "max_keepalive_connections": settings.http_max_keepalive_connections,
+        "keepalive_expiry": settings.http_keepalive_expiry
+    }
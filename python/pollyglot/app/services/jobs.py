@@ -0,0 +1,515 @@
+"""Asynchronous translation jobs: durable queue backends and a worker pool."""
+import asyncio
+import ipaddress
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..core.executor import run_cpu_bound
+from ..core.quota import Reservation, token_quota
+from ..core.settings import settings
+from .admission import Priority
+from .detect import detector
+from .openrouter import OpenRouterService
+
+logger = logging.getLogger(__name__)
+
+# Times a worker waits out admission control shedding before failing a job
+MAX_OVERLOAD_RETRIES = 5
+
+# Webhook delivery attempts, with exponential backoff starting at one second
+WEBHOOK_ATTEMPTS = 3
+
+
+class JobStatus(str, Enum):
+    """Job lifecycle states."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """A queued translation and, once finished, its outcome."""
+    id: str
+    request: Dict[str, Any]
+    status: JobStatus = JobStatus.QUEUED
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def create(cls, request: Dict[str, Any]) -> "Job":
+        """Create a queued job for request."""
+        return cls(id=uuid.uuid4().hex, request=request)
+
+    @property
+    def finished(self) -> bool:
+        """True once the job succeeded or failed."""
+        return self.status in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+    def view(self) -> Dict[str, Any]:
+        """Public representation, without internal request fields."""
+        return {
+            "id": self.id,
+            "status": self.status.value,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "result": self.result,
+            "error": self.error
+        }
+
+    def to_json(self) -> str:
+        """Serialize for storage."""
+        return json.dumps({**asdict(self), "status": self.status.value}, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, raw: Union[str, bytes]) -> "Job":
+        """Deserialize a stored job."""
+        data = json.loads(raw)
+        data["status"] = JobStatus(data["status"])
+        return cls(**data)
+
+
+class SQLiteJobQueue:
+    """
+    Jobs in a local SQLite file, shared by the workers of one host.
+
+    A claim is a single UPDATE ... RETURNING under SQLite's write lock, so
+    each job goes to one worker, and a job whose worker died is claimed
+    again once its lease expires. Statements run in a thread so the event
+    loop never waits on the disk.
+    """
+
+    def __init__(self, path: str, lease_seconds: float, ttl_seconds: float, poll_interval: float = 0.5):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.ttl_seconds = ttl_seconds
+        self.poll_interval = poll_interval
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._wakeup = asyncio.Event()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, lease_until REAL NOT NULL DEFAULT 0, "
+                "created_at REAL NOT NULL, data TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, created_at)")
+            self._conn = conn
+        return self._conn
+
+    def _execute(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
+
+    async def _run(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        return await asyncio.to_thread(self._execute, sql, params)
+
+    async def enqueue(self, job: Job) -> None:
+        """Store a new job and wake an idle local worker."""
+        await self._run(
+            "INSERT INTO jobs (id, status, created_at, data) VALUES (?, ?, ?, ?)",
+            (job.id, job.status.value, job.created_at, job.to_json())
+        )
+        self._wakeup.set()
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Return the job, or None if unknown or expired."""
+        rows = await self._run("SELECT data FROM jobs WHERE id = ?", (job_id,))
+        return Job.from_json(rows[0][0]) if rows else None
+
+    async def save(self, job: Job) -> None:
+        """Persist a job's current state."""
+        await self._run(
+            "UPDATE jobs SET status = ?, data = ? WHERE id = ?",
+            (job.status.value, job.to_json(), job.id)
+        )
+
+    async def claim(self, consumer: str, timeout: float) -> Optional[Tuple[Job, str]]:
+        """
+        Take the oldest runnable job, waiting up to timeout for one.
+
+        Returns:
+            Tuple of (job marked running, receipt for finish()), or None
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.time()
+            rows = await self._run(
+                "UPDATE jobs SET status = ?, lease_until = ? WHERE id = ("
+                "SELECT id FROM jobs WHERE status = ? OR (status = ? AND lease_until < ?) "
+                "ORDER BY created_at LIMIT 1) RETURNING data",
+                (JobStatus.RUNNING.value, now + self.lease_seconds, JobStatus.QUEUED.value, JobStatus.RUNNING.value, now)
+            )
+            if rows:
+                job = Job.from_json(rows[0][0])
+                job.status = JobStatus.RUNNING
+                job.attempts += 1
+                job.updated_at = now
+                await self.save(job)
+                return job, job.id
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), min(self.poll_interval, remaining))
+            except asyncio.TimeoutError:
+                pass
+
+    async def finish(self, job: Job, receipt: str) -> None:
+        """Store a finished job and drop finished jobs past their TTL."""
+        await self.save(job)
+        await self._run(
+            "DELETE FROM jobs WHERE status IN (?, ?) AND created_at < ?",
+            (JobStatus.SUCCEEDED.value, JobStatus.FAILED.value, time.time() - self.ttl_seconds)
+        )
+
+    async def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class RedisJobQueue:
+    """
+    Jobs on a Redis stream, shared by every worker process and host.
+
+    Job records are JSON strings with a TTL; the stream carries job ids to
+    a consumer group, so each job is delivered to one consumer. Jobs left
+    unacknowledged for longer than the lease (a worker died mid-job) are
+    taken over with XAUTOCLAIM.
+    """
+
+    STREAM = "pollyglot:jobs"
+    GROUP = "workers"
+    KEY_PREFIX = "pollyglot:job:"
+
+    def __init__(self, redis_url: str, lease_seconds: float, ttl_seconds: float):
+        self.redis_url = redis_url
+        self.lease_seconds = lease_seconds
+        self.ttl_seconds = ttl_seconds
+        self._redis = None
+        self._group_ready = False
+
+    def _client(self):
+        if self._redis is None:
+            import redis.asyncio as redis_async
+
+            self._redis = redis_async.from_url(self.redis_url)
+        return self._redis
+
+    async def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        from redis.exceptions import ResponseError
+
+        try:
+            await self._client().xgroup_create(self.STREAM, self.GROUP, id="0", mkstream=True)
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    async def enqueue(self, job: Job) -> None:
+        """Store a new job and publish it to the stream."""
+        client = self._client()
+        await self.save(job)
+        await client.xadd(self.STREAM, {"id": job.id})
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Return the job, or None if unknown or expired."""
+        raw = await self._client().get(self.KEY_PREFIX + job_id)
+        return Job.from_json(raw) if raw is not None else None
+
+    async def save(self, job: Job) -> None:
+        """Persist a job's current state."""
+        await self._client().set(self.KEY_PREFIX + job.id, job.to_json(), ex=int(self.ttl_seconds))
+
+    async def claim(self, consumer: str, timeout: float) -> Optional[Tuple[Job, str]]:
+        """
+        Take over a stalled job, or block up to timeout for a new one.
+
+        Returns:
+            Tuple of (job marked running, stream message id), or None
+        """
+        await self._ensure_group()
+        client = self._client()
+        claimed = (await client.xautoclaim(
+            self.STREAM, self.GROUP, consumer,
+            min_idle_time=int(self.lease_seconds * 1000), start_id="0-0", count=1
+        ))[1]
+        if not claimed:
+            response = await client.xreadgroup(
+                self.GROUP, consumer, {self.STREAM: ">"}, count=1, block=int(timeout * 1000)
+            )
+            claimed = response[0][1] if response else []
+        if not claimed:
+            return None
+
+        message_id, fields = claimed[0]
+        job = await self.get(fields[b"id"].decode())
+        if job is None:
+            # The record expired while queued; nothing left to run
+            await client.xack(self.STREAM, self.GROUP, message_id)
+            await client.xdel(self.STREAM, message_id)
+            return None
+
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.updated_at = time.time()
+        await self.save(job)
+        return job, message_id
+
+    async def finish(self, job: Job, receipt: str) -> None:
+        """Store a finished job and remove its stream entry."""
+        client = self._client()
+        await self.save(job)
+        await client.xack(self.STREAM, self.GROUP, receipt)
+        await client.xdel(self.STREAM, receipt)
+
+    async def close(self) -> None:
+        """Close the Redis connection pool if it was opened."""
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+            self._group_ready = False
+
+
+JobQueue = Union[SQLiteJobQueue, RedisJobQueue]
+
+
+class JobWorkerPool:
+    """
+    Async workers draining the job queue at bounded concurrency.
+
+    Each worker claims one job at a time and translates it at background
+    admission priority, waiting out load shedding instead of failing. It
+    stores the outcome, settles the submitter's token reservation and
+    POSTs the finished job to its webhook, if one was given.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        service: OpenRouterService,
+        concurrency: int,
+        max_attempts: int = 3,
+        webhook_timeout: float = 10.0
+    ):
+        self.queue = queue
+        self.service = service
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.webhook_timeout = webhook_timeout
+        self._tasks: List[asyncio.Task] = []
+        self._webhook_client: Optional[httpx.AsyncClient] = None
+        self.completed = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        """Start the workers on the running loop."""
+        if self._tasks or self.concurrency <= 0:
+            return
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks = [
+            asyncio.create_task(self._worker(f"{prefix}:{index}"))
+            for index in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        """Cancel the workers; jobs they held are retried after their lease."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._webhook_client is not None:
+            await self._webhook_client.aclose()
+            self._webhook_client = None
+
+    async def _worker(self, consumer: str) -> None:
+        while True:
+            try:
+                claimed = await self.queue.claim(consumer, timeout=5.0)
+                if claimed is None:
+                    continue
+                job, receipt = claimed
+                await self.run_job(job)
+                await self.queue.finish(job, receipt)
+                await self._deliver(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {consumer} error: {e}")
+                await asyncio.sleep(1.0)
+
+    async def run_job(self, job: Job) -> Job:
+        """Translate a claimed job and record its outcome on it."""
+        request = job.request
+        if job.attempts > self.max_attempts:
+            await self._settle(job, None)
+            return self._fail(job, f"Abandoned after {job.attempts - 1} attempts")
+
+        text, source, target = request["text"], request["source"], request["target"]
+        detected_language = None
+        if source == "auto":
+            detected_language = await run_cpu_bound(detector.detect_language, text, size=len(text))
+            if detected_language != "auto":
+                source = detected_language
+        if source == target:
+            await self._settle(job, None)
+            return self._fail(job, "Source and target languages cannot be the same")
+
+        for _ in range(MAX_OVERLOAD_RETRIES):
+            result = await self.service.translate(
+                text, source, target, request.get("model"), Priority.BACKGROUND, segmented=request.get("segmented", False)
+            )
+            if result.status_code != 503 or not result.retry_after:
+                break
+            await asyncio.sleep(result.retry_after)
+
+        await self._settle(job, result.tokens_used)
+        if result.error:
+            return self._fail(job, result.error)
+
+        job.status = JobStatus.SUCCEEDED
+        job.result = {
+            "text": result.content,
+            "source_language": source,
+            "target_language": target,
+            "model": result.model,
+            "latency_ms": result.latency_ms,
+            "tokens_used": result.tokens_used,
+            "detected_language": detected_language,
+            "cached": result.cached
+        }
+        job.updated_at = time.time()
+        self.completed += 1
+        return job
+
+    def _fail(self, job: Job, error: str) -> Job:
+        job.status = JobStatus.FAILED
+        job.error = error
+        job.updated_at = time.time()
+        self.failed += 1
+        return job
+
+    async def _settle(self, job: Job, tokens_used: Optional[int]) -> None:
+        """Reconcile the token reservation taken when the job was submitted."""
+        reserved = job.request.get("reserved_tokens")
+        if reserved:
+            await token_quota.settle(Reservation(job.request["quota_key"], reserved), tokens_used)
+
+    async def _deliver(self, job: Job) -> None:
+        """POST the finished job to its webhook, retrying transient failures."""
+        url = job.request.get("webhook_url")
+        if not url:
+            return
+        if webhook_url_error(url) or not await _webhook_resolves_public(url):
+            logger.warning(f"Webhook for job {job.id} refused: host is not allowed or not public")
+            return
+        if self._webhook_client is None:
+            self._webhook_client = httpx.AsyncClient(timeout=self.webhook_timeout)
+
+        for attempt in range(WEBHOOK_ATTEMPTS):
+            try:
+                response = await self._webhook_client.post(url, json=job.view())
+                if response.status_code < 500:
+                    if response.status_code >= 400:
+                        logger.warning(f"Webhook for job {job.id} rejected: HTTP {response.status_code}")
+                    return
+            except httpx.HTTPError as e:
+                logger.warning(f"Webhook for job {job.id} failed: {e}")
+            if attempt < WEBHOOK_ATTEMPTS - 1:
+                await asyncio.sleep(2 ** attempt)
+        logger.error(f"Giving up on webhook for job {job.id}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return worker counters for monitoring."""
+        return {
+            "workers": len(self._tasks),
+            "completed": self.completed,
+            "failed": self.failed,
+            "backend": "redis" if isinstance(self.queue, RedisJobQueue) else "sqlite"
+        }
+
+
+def _is_public_address(address: str) -> bool:
+    """Whether an IP address is globally routable (not loopback, private, link-local...)."""
+    ip = ipaddress.ip_address(address.split("%", 1)[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def webhook_url_error(url: str) -> Optional[str]:
+    """
+    Check a webhook URL before accepting it, without DNS lookups.
+
+    With settings.jobs_webhook_allowed_hosts set, only those hosts are
+    accepted (and may be internal). Otherwise any http(s) host is accepted
+    except localhost and IP literals that are not globally routable, so
+    jobs cannot be used to reach the server's own network.
+
+    Returns:
+        Why the URL is refused, or None if it is acceptable
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https"):
+        return "Webhook URL must start with http:// or https://"
+    host = (parts.hostname or "").rstrip(".").lower()
+    if not host:
+        return "Webhook URL must include a host"
+    allowed = [allowed_host.lower() for allowed_host in settings.jobs_webhook_allowed_hosts]
+    if allowed:
+        return None if host in allowed else f"Webhook host {host} is not allowed"
+    if host == "localhost" or host.endswith(".localhost"):
+        return "Webhook host must not be local"
+    try:
+        if not _is_public_address(host):
+            return "Webhook host must be a public address"
+    except ValueError:
+        pass  # A hostname; its addresses are checked before delivery
+    return None
+
+
+async def _webhook_resolves_public(url: str) -> bool:
+    """Whether every address the webhook's host resolves to is public (or the host is allowlisted)."""
+    host = (urlsplit(url).hostname or "").rstrip(".").lower()
+    if host in (allowed_host.lower() for allowed_host in settings.jobs_webhook_allowed_hosts):
+        return True
+    try:
+        infos = await asyncio.to_thread(socket.getaddrinfo, host, None, proto=socket.IPPROTO_TCP)
+    except OSError:
+        return False
+    return bool(infos) and all(_is_public_address(info[4][0]) for info in infos)
+
+
+def create_job_queue() -> JobQueue:
+    """Build the job queue: a Redis stream when REDIS_URL is set, else SQLite."""
+    if settings.redis_url:
+        return RedisJobQueue(settings.redis_url, settings.jobs_lease_seconds, settings.jobs_ttl_seconds)
+    return SQLiteJobQueue(settings.jobs_sqlite_path, settings.jobs_lease_seconds, settings.jobs_ttl_seconds)
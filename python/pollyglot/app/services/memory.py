@@ -0,0 +1,238 @@
+"""Persistent sentence-level translation memory with number-substitution reuse."""
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from ..core.executor import run_cpu_bound
+from ..core.settings import settings
+from .chunking import split_sentences
+
+logger = logging.getLogger(__name__)
+
+NUMBER_PATTERN = re.compile(r"\d+(?:[.,:]\d+)*")
+WHITESPACE_RUN = re.compile(r"\s+")
+
+# Placeholder standing in for every number in a sentence template
+NUMBER_SLOT = "\x00"
+
+
+def normalize(sentence: str) -> str:
+    """NFC-normalize, trim and collapse whitespace, as for cache keys."""
+    return WHITESPACE_RUN.sub(" ", unicodedata.normalize("NFC", sentence)).strip()
+
+
+def make_template(sentence: str) -> str:
+    """Normalized sentence with its numbers replaced by placeholders."""
+    return NUMBER_PATTERN.sub(NUMBER_SLOT, normalize(sentence))
+
+
+def substitute_numbers(stored: str, translation: str, sentence: str) -> Optional[str]:
+    """
+    Adapt a stored translation to a sentence that differs only in numbers.
+
+    Each number of the stored source sentence maps to the number in the
+    same position of the new sentence. The translation must contain
+    exactly the stored numbers (in any order) so every one of them can be
+    replaced unambiguously.
+
+    Returns:
+        The adapted translation, or None if the numbers cannot be mapped
+    """
+    old_numbers = NUMBER_PATTERN.findall(stored)
+    new_numbers = NUMBER_PATTERN.findall(sentence)
+    if len(old_numbers) != len(new_numbers):
+        return None
+
+    mapping: Dict[str, str] = {}
+    for old, new in zip(old_numbers, new_numbers):
+        if mapping.setdefault(old, new) != new:
+            return None
+    if sorted(NUMBER_PATTERN.findall(translation)) != sorted(old_numbers):
+        return None
+    return NUMBER_PATTERN.sub(lambda match: mapping[match.group(0)], translation)
+
+
+@dataclass
+class MemoryMatch:
+    """A reusable translation for one sentence."""
+    translation: str
+    exact: bool
+
+
+class TranslationMemory:
+    """
+    Sentence-level translation memory in a local SQLite file.
+
+    Completed translations are stored per sentence, aligned by splitting
+    source and translation into sentences (texts whose sentence counts
+    differ are stored whole), once per model. Lookups reuse exact sentence
+    matches and sentences that differ only in their numbers, from any model
+    unless one is given. The database is read through a memory map, and
+    statements run in a thread.
+    """
+
+    def __init__(
+        self, path: str, mmap_bytes: int = 256 * 1024 * 1024, max_sentence_chars: int = 2000
+    ):
+        self.path = path
+        self.mmap_bytes = mmap_bytes
+        self.max_sentence_chars = max_sentence_chars
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.number_hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_bytes)}")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS segments ("
+                "source TEXT NOT NULL, target TEXT NOT NULL, text TEXT NOT NULL, "
+                "template TEXT NOT NULL, translation TEXT NOT NULL, model TEXT NOT NULL, "
+                "updated_at REAL NOT NULL, "
+                "PRIMARY KEY (source, target, model, text))"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS segments_by_template "
+                "ON segments (source, target, template)"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _lookup(
+        self, sentences: List[str], source: str, target: str, model: Optional[str]
+    ) -> List[Tuple[str, str, str]]:
+        templates = sorted({make_template(sentence) for sentence in sentences})
+        placeholders = ",".join("?" * len(templates))
+        query = (
+            f"SELECT text, template, translation FROM segments "
+            f"WHERE source = ? AND target = ? AND template IN ({placeholders})"
+        )
+        params: List[str] = [source, target, *templates]
+        if model is not None:
+            query += " AND model = ?"
+            params.append(model)
+        with self._lock:
+            return self._connect().execute(query, params).fetchall()
+
+    async def lookup(
+        self, sentences: List[str], source: str, target: str, model: Optional[str] = None
+    ) -> List[Optional[MemoryMatch]]:
+        """
+        Find reusable translations for sentences.
+
+        Args:
+            sentences: Source sentences
+            source: Source language code
+            target: Target language code
+            model: Only reuse translations by this model (any model if None)
+
+        Returns:
+            One MemoryMatch or None per sentence, in order
+        """
+        wanted = [sentence for sentence in sentences if sentence.strip()]
+        if not wanted:
+            return [None] * len(sentences)
+        rows = await asyncio.to_thread(self._lookup, wanted, source, target, model)
+
+        exact = {text: translation for text, _, translation in rows}
+        by_template: Dict[str, List[Tuple[str, str]]] = {}
+        for text, template, translation in rows:
+            by_template.setdefault(template, []).append((text, translation))
+
+        matches: List[Optional[MemoryMatch]] = []
+        for sentence in sentences:
+            match = None
+            key = normalize(sentence)
+            if key and key in exact:
+                match = MemoryMatch(exact[key], exact=True)
+                self.exact_hits += 1
+            elif key:
+                for stored, translation in by_template.get(make_template(sentence), []):
+                    adapted = substitute_numbers(stored, translation, key)
+                    if adapted is not None:
+                        match = MemoryMatch(adapted, exact=False)
+                        self.number_hits += 1
+                        break
+                else:
+                    self.misses += 1
+            matches.append(match)
+        return matches
+
+    def _store(self, rows: List[Tuple[str, str, str, str, str, str, float]]) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO segments "
+                "(source, target, text, template, translation, model, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            conn.commit()
+
+    async def record(
+        self, text: str, translation: str, source: str, target: str, model: str
+    ) -> None:
+        """Store a completed translation, sentence by sentence where they align."""
+        if source == "auto" or not translation.strip():
+            return
+        source_sentences = await run_cpu_bound(split_sentences, text, size=len(text))
+        target_sentences = await run_cpu_bound(split_sentences, translation, size=len(translation))
+        sources = [sentence for sentence, _ in source_sentences if sentence.strip()]
+        targets = [sentence for sentence, _ in target_sentences if sentence.strip()]
+        if len(sources) == len(targets):
+            pairs = list(zip(sources, targets))
+        else:
+            pairs = [(text, translation)]
+
+        now = time.time()
+        rows = [
+            (
+                source, target, normalize(original), make_template(original),
+                translated.strip(), model, now
+            )
+            for original, translated in pairs
+            if len(original) <= self.max_sentence_chars
+        ]
+        if rows:
+            try:
+                await asyncio.to_thread(self._store, rows)
+            except sqlite3.Error as e:
+                logger.warning(f"Translation memory write failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Return lookup counters for monitoring."""
+        return {
+            "exact_hits": self.exact_hits,
+            "number_hits": self.number_hits,
+            "misses": self.misses
+        }
+
+    async def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_translation_memory() -> Optional[TranslationMemory]:
+    """Build the translation memory from settings, or None if disabled."""
+    if not settings.memory_enabled:
+        return None
+    return TranslationMemory(
+        settings.memory_path, settings.memory_mmap_bytes, settings.chunk_max_chars
+    )
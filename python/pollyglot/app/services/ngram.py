@@ -0,0 +1,158 @@
+"""Character n-gram statistical language detection."""
+import json
+import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .detect import DetectionResult
+
+PROFILES_PATH = Path(__file__).parent / "data" / "ngram_profiles.json"
+
+# Script fast path: languages identified by the writing system alone
+SCRIPT_PATTERNS = {
+    "kana": re.compile(r"[\u3040-\u30ff]"),
+    "ko": re.compile(r"[\uac00-\ud7af\u1100-\u11ff\u3130-\u318f]"),
+    "han": re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff]"),
+    "ru": re.compile(r"[\u0400-\u04ff]"),
+    "ar": re.compile(r"[\u0600-\u06ff\u0750-\u077f]"),
+    "hi": re.compile(r"[\u0900-\u097f]")
+}
+
+WORD_PATTERN = re.compile(r"[^\W\d_]+")
+
+
+def extract_ngrams(text: str, max_n: int = 3) -> Counter:
+    """
+    Count character 1..max_n-grams of each word, padded with spaces.
+
+    Args:
+        text: Text to profile
+        max_n: Longest n-gram length
+
+    Returns:
+        Counter of n-gram frequencies
+    """
+    counts: Counter = Counter()
+    for word in WORD_PATTERN.findall(text.lower()):
+        padded = f" {word} "
+        for n in range(1, max_n + 1):
+            for i in range(len(padded) - n + 1):
+                counts[padded[i:i + n]] += 1
+    counts.pop(" ", None)
+    return counts
+
+
+@lru_cache(maxsize=1)
+def load_profiles() -> Tuple[int, int, Dict[str, Dict[str, int]]]:
+    """
+    Load the precomputed ranked n-gram profiles once per process.
+
+    Returns:
+        Tuple of (max n, profile size, language -> {ngram: rank})
+    """
+    with open(PROFILES_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+
+    profiles = {
+        lang: {ngram: rank for rank, ngram in enumerate(ranked)}
+        for lang, ranked in data["profiles"].items()
+    }
+    return data["max_n"], data["size"], profiles
+
+
+class NgramLanguageDetector:
+    """Language detection from character n-gram profiles and Unicode scripts."""
+
+    # Minimum relative margin between the two closest profiles
+    MIN_CONFIDENCE = 0.02
+
+    def detect(self, text: str) -> DetectionResult:
+        """
+        Detect language by writing system, then by n-gram profile distance.
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            DetectionResult with the detected language ("auto" if unknown),
+            confidence, and per-language scores
+        """
+        if not text or not text.strip():
+            return DetectionResult(language="auto", confidence=0.0)
+
+        script = self._detect_script(text)
+        if script is not None:
+            return script
+
+        if len(text.strip()) < 10:
+            return DetectionResult(language="auto", confidence=0.0)
+
+        return self._detect_ngram(text)
+
+    def detect_language(self, text: str) -> str:
+        """
+        Detect language code for text.
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Language code (e.g., "en", "ja") or "auto" if unknown
+        """
+        return self.detect(text).language
+
+    def rank(self, text: str) -> List[Tuple[str, float]]:
+        """Return candidate languages ordered by descending score."""
+        return self.detect(text).ranked
+
+    def _detect_script(self, text: str) -> Optional[DetectionResult]:
+        """Identify languages with a unique script from character counts."""
+        # Count combining marks too: Devanagari vowel signs are not alphabetic
+        letters = sum(1 for ch in text if ch.isalpha() or unicodedata.category(ch).startswith("M"))
+        if letters == 0:
+            return None
+
+        counts = {name: len(pattern.findall(text)) for name, pattern in SCRIPT_PATTERNS.items()}
+
+        # Japanese mixes kana with kanji; Han without kana is Chinese
+        if counts["kana"]:
+            counts["ja"] = counts.pop("kana") + counts["han"]
+            counts.pop("han")
+        else:
+            counts.pop("kana")
+            counts["zh"] = counts.pop("han")
+
+        lang, count = max(counts.items(), key=lambda item: item[1])
+        if count < 2 or count / letters < 0.5:
+            return None
+
+        # Script punctuation (e.g. the Devanagari danda) can push shares past 1
+        scores = {name: min(1.0, value / letters) for name, value in counts.items() if value}
+        return DetectionResult(language=lang, confidence=scores[lang], scores=scores)
+
+    def _detect_ngram(self, text: str) -> DetectionResult:
+        """Rank Latin-script languages by out-of-place profile distance."""
+        max_n, size, profiles = load_profiles()
+        document = [ngram for ngram, _ in extract_ngrams(text, max_n).most_common(size)]
+        if not document:
+            return DetectionResult(language="auto", confidence=0.0)
+
+        max_distance = len(document) * size
+        scores: Dict[str, float] = {}
+        for lang, profile in profiles.items():
+            distance = 0
+            for rank, ngram in enumerate(document):
+                profile_rank = profile.get(ngram)
+                distance += size if profile_rank is None else abs(profile_rank - rank)
+            scores[lang] = 1 - distance / max_distance
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        (best_lang, best), (_, second) = ranked[0], ranked[1]
+        confidence = (best - second) / best if best > 0 else 0.0
+
+        if confidence < self.MIN_CONFIDENCE:
+            return DetectionResult(language="auto", confidence=confidence, scores=scores)
+        return DetectionResult(language=best_lang, confidence=confidence, scores=scores)
@@ -1,12 +1,26 @@
 """OpenRouter service for handling translation requests."""
 import asyncio
+import json
 import time
-from typing import Dict, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 import httpx
 import logging
 
 from ..core.settings import settings
+from .http_client import create_http_client, get_pool_stats
+from .cache import TranslationCache, create_translation_cache, make_cache_key
+from .singleflight import SingleFlight
+from .chunking import split_sentences, split_text
+from .circuit_breaker import CircuitBreakerRegistry
+from .retry import RetryPolicy, create_retry_budget, parse_retry_after
+from .routing import ModelRouter
+from .admission import AdmissionRejected, Priority, create_admission_controller
+from .tokens import token_estimator
+from .memory import TranslationMemory, create_translation_memory
+from ..core.executor import run_cpu_bound
+from ..core.metrics import UPSTREAM_INFLIGHT, UPSTREAM_LATENCY, UPSTREAM_RETRIES, model_label
+from ..core.tracing import HttpTraceRecorder, current_trace, span
 
 logger = logging.getLogger(__name__)
 
@@ -19,91 +33,448 @@ class TranslationResult:
     model: str
     tokens_used: Optional[int] = None
     error: Optional[str] = None
+    cached: bool = False
+    status_code: Optional[int] = None
+    retry_after: Optional[float] = None
+
+
+@dataclass
+class StreamEvent:
+    """Event emitted while streaming a translation."""
+    event: str
+    data: Dict[str, Any]
 
 
 class OpenRouterService:
     """Service for interacting with OpenRouter API."""
     
-    BASE_URL = "https://openrouter.ai/api/v1"
-    
-    def __init__(self):
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[TranslationCache] = None,
+        memory: Optional[TranslationMemory] = None
+    ):
         self.api_key = settings.openrouter_api_key
         self.default_model = settings.openrouter_model
         self.app_url = settings.public_app_url
+        self.base_url = settings.openrouter_base_url.rstrip("/")
+        self._client = client
+        self.cache = cache if cache is not None else create_translation_cache()
+        self.memory = memory if memory is not None else create_translation_memory()
+        self._inflight = SingleFlight()
+        self.retry_policy = RetryPolicy.from_settings()
+        self.retry_budget = create_retry_budget()
+        self.breakers = CircuitBreakerRegistry()
+        self.router = ModelRouter()
+        self.admission = create_admission_controller()
+    
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared pooled HTTP client, created on first use if not started."""
+        if self._client is None:
+            self._client = create_http_client()
+        return self._client
+    
+    async def startup(self) -> None:
+        """Open the pooled HTTP client for this worker."""
+        if self._client is None:
+            self._client = create_http_client()
+    
+    async def shutdown(self) -> None:
+        """Close the pooled HTTP client and release its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self.cache is not None:
+            await self.cache.close()
+        if self.memory is not None:
+            await self.memory.close()
+        await self.admission.close()
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return connection pool statistics for monitoring."""
+        if self._client is None:
+            return {"connections": 0, "started": False}
+        return {**get_pool_stats(self._client), "started": True}
         
     async def translate(
         self,
         text: str,
         source: str,
         target: str,
-        model: Optional[str] = None
+        model: Optional[str] = None,
+        priority: Priority = Priority.INTERACTIVE,
+        segmented: bool = False
     ) -> TranslationResult:
         """
         Translate text using OpenRouter API.
         
+        Identical requests are served from the translation cache when it
+        is enabled, skipping the upstream call. Concurrent identical
+        requests that miss the cache share one upstream call. With the
+        translation memory enabled, previously translated sentences are
+        reused and only the rest is sent upstream. Texts longer than
+        settings.chunk_max_chars are translated as parallel segments.
+        With segmented set, the text is cached sentence by sentence, so
+        after a small edit only the changed sentences are translated.
+        Unless a model is given explicitly, the request is routed over the
+        configured fallback models with failover and optional hedging.
+        Upstream calls go through the admission controller; a call shed
+        under overload returns a 503 error result with retry_after set.
+        
         Args:
             text: Text to translate
             source: Source language (e.g., "auto", "en", "es")
             target: Target language (e.g., "en", "es", "fr")
             model: OpenRouter model to use (defaults to configured model)
+            priority: Admission priority class for the upstream call
+            segmented: Reuse and fill the per-sentence cache
             
         Returns:
-            TranslationResult with translated content and metadata
+            TranslationResult with translated content and metadata; model
+            is the model that actually produced the translation
         """
         start_time = time.time()
+        pinned = model is not None
         model = model or self.default_model
+        cache_key = make_cache_key(text, source, target, model)
+        
+        if self.cache is not None:
+            with span("cache"):
+                cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return TranslationResult(
+                    content=cached["content"],
+                    latency_ms=(time.time() - start_time) * 1000,
+                    model=cached["model"],
+                    cached=True
+                )
+        
+        return await self._inflight.do(
+            cache_key,
+            lambda: self._translate_miss(text, source, target, model, pinned, cache_key, start_time, priority, segmented)
+        )
+    
+    async def _translate_miss(
+        self,
+        text: str,
+        source: str,
+        target: str,
+        model: str,
+        pinned: bool,
+        cache_key: str,
+        start_time: float,
+        priority: Priority,
+        segmented: bool = False
+    ) -> TranslationResult:
+        """Translate a cache miss by sentence, from memory, as segments, or in one upstream call."""
+        if segmented and self.cache is not None:
+            return await self._translate_segmented(text, source, target, model, pinned, cache_key, start_time, priority)
+        
+        if self.memory is not None and source != "auto":
+            reused = await self._translate_from_memory(text, source, target, model, pinned, cache_key, start_time, priority)
+            if reused is not None:
+                return reused
+        
+        if len(text) > settings.chunk_max_chars:
+            return await self._translate_chunked(text, source, target, model, pinned, cache_key, start_time, priority)
+        
+        return await self._translate_uncached(text, source, target, model, pinned, cache_key, start_time, priority)
+    
+    async def _translate_segmented(
+        self,
+        text: str,
+        source: str,
+        target: str,
+        model: str,
+        pinned: bool,
+        cache_key: str,
+        start_time: float,
+        priority: Priority
+    ) -> TranslationResult:
+        """
+        Translate text sentence by sentence through the translation cache.
+        
+        Each sentence is looked up under its own cache key. The misses are
+        packed into as few JSON-array prompts as the batch pack limits
+        allow and cached individually; single misses, oversized sentences
+        and packs whose reply cannot be parsed are translated on their
+        own. Translations are spliced back with the original separators.
+        """
+        sentences = await run_cpu_bound(split_sentences, text, size=len(text))
+        if sum(1 for sentence, _ in sentences if sentence.strip()) < 2:
+            # One sentence shares the text's cache key and in-flight call
+            return await self._translate_miss(text, source, target, model, pinned, cache_key, start_time, priority)
+        
+        translations: Dict[str, Optional[str]] = {}
+        with span("cache"):
+            for sentence, _ in sentences:
+                sentence = sentence.strip()
+                if sentence and sentence not in translations:
+                    cached = await self.cache.get(make_cache_key(sentence, source, target, model))
+                    translations[sentence] = cached["content"] if cached is not None else None
+        
+        misses = [sentence for sentence, translation in translations.items() if translation is None]
+        semaphore = asyncio.Semaphore(settings.chunk_concurrency)
+        tokens_used = 0
+        errors: List[TranslationResult] = []
+        
+        async def translate_single(sentence: str) -> None:
+            nonlocal tokens_used
+            async with semaphore:
+                result = await self.translate(sentence, source, target, model if pinned else None, priority)
+            if result.error:
+                errors.append(result)
+                return
+            translations[sentence] = result.content
+            tokens_used += result.tokens_used or 0
+        
+        async def translate_pack(pack: List[str]) -> None:
+            nonlocal tokens_used
+            if len(pack) == 1:
+                await translate_single(pack[0])
+                return
+            
+            async with semaphore:
+                packed = await self._translate_packed(pack, source, target, model, priority)
+            if packed is None:
+                await asyncio.gather(*(translate_single(sentence) for sentence in pack))
+                return
+            
+            for sentence, result in zip(pack, packed):
+                if result.error:
+                    errors.append(result)
+                    continue
+                translations[sentence] = result.content
+                tokens_used += result.tokens_used or 0
+                await self.cache.set(make_cache_key(sentence, source, target, model), {
+                    "content": result.content,
+                    "model": model,
+                    "tokens_used": result.tokens_used
+                })
+                if self.memory is not None:
+                    await self.memory.record(sentence, result.content, source, target, model)
+        
+        await asyncio.gather(*(
+            translate_pack([misses[index] for index in pack]) for pack in _pack_texts(misses)
+        ))
+        if errors:
+            return errors[0]
+        
+        content = "".join(
+            (translations[sentence.strip()] if sentence.strip() else sentence) + separator
+            for sentence, separator in sentences
+        ).strip()
+        await self.cache.set(cache_key, {
+            "content": content,
+            "model": model,
+            "tokens_used": tokens_used or None
+        })
         
+        return TranslationResult(
+            content=content,
+            latency_ms=(time.time() - start_time) * 1000,
+            model=model,
+            tokens_used=tokens_used or None,
+            cached=not misses
+        )
+    
+    async def _translate_from_memory(
+        self,
+        text: str,
+        source: str,
+        target: str,
+        model: str,
+        pinned: bool,
+        cache_key: str,
+        start_time: float,
+        priority: Priority
+    ) -> Optional[TranslationResult]:
+        """
+        Reuse translation memory sentence by sentence.
+        
+        Sentences with an exact or number-substituted match are filled in
+        from memory; each run of consecutive unmatched sentences is
+        translated through translate() as one text, keeping its context.
+        
+        Returns:
+            The assembled result, or None if no sentence matched
+        """
+        sentences = await run_cpu_bound(split_sentences, text, size=len(text))
         try:
-            # Build the prompt based on source language
-            if source == "auto":
-                prompt = f"Translate the following text to {self._get_language_name(target)}:\n\n{text}"
+            with span("memory"):
+                matches = await self.memory.lookup(
+                    [sentence for sentence, _ in sentences], source, target, model if pinned else None
+                )
+        except Exception as e:
+            logger.warning(f"Translation memory lookup failed: {e}")
+            return None
+        if not any(matches):
+            return None
+        
+        # Group into (translation or None, run text, trailing separator) parts
+        parts: List[Tuple[Optional[str], str, str]] = []
+        for (sentence, separator), match in zip(sentences, matches):
+            if match is not None or not sentence.strip():
+                parts.append((match.translation if match else sentence, "", separator))
+            elif parts and parts[-1][0] is None:
+                _, run, run_separator = parts[-1]
+                parts[-1] = (None, run + run_separator + sentence, separator)
             else:
-                source_name = self._get_language_name(source)
-                target_name = self._get_language_name(target)
-                prompt = f"Translate the following {source_name} text to {target_name}:\n\n{text}"
-            
-            # Prepare request payload
-            payload = {
+                parts.append((None, sentence, separator))
+        
+        semaphore = asyncio.Semaphore(settings.chunk_concurrency)
+        
+        async def translate_run(run: str) -> TranslationResult:
+            async with semaphore:
+                return await self.translate(run, source, target, model if pinned else None, priority)
+        
+        runs = [run for translation, run, _ in parts if translation is None]
+        results = iter(await asyncio.gather(*(translate_run(run) for run in runs)))
+        
+        pieces = []
+        tokens_used = 0
+        for translation, _, separator in parts:
+            if translation is None:
+                result = next(results)
+                if result.error:
+                    return result
+                translation = result.content
+                tokens_used += result.tokens_used or 0
+            pieces.append(translation + separator)
+        
+        content = "".join(pieces).strip()
+        if self.cache is not None:
+            await self.cache.set(cache_key, {
+                "content": content,
                 "model": model,
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are a translation engine. Only return the translated text without any additional commentary or explanation."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.1,
-                "max_tokens": len(text) * 3  # Conservative estimate for translation
-            }
-            
-            # Prepare headers
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            if self.app_url:
-                headers["HTTP-Referer"] = self.app_url
-                headers["X-Title"] = "PollyGlot"
-            
-            # Make request with retries
-            result = await self._make_request_with_retries(payload, headers)
+                "tokens_used": tokens_used or None
+            })
+        
+        return TranslationResult(
+            content=content,
+            latency_ms=(time.time() - start_time) * 1000,
+            model=model,
+            tokens_used=tokens_used or None,
+            cached=not runs
+        )
+    
+    async def _translate_chunked(
+        self,
+        text: str,
+        source: str,
+        target: str,
+        model: str,
+        pinned: bool,
+        cache_key: str,
+        start_time: float,
+        priority: Priority
+    ) -> TranslationResult:
+        """
+        Translate a long document as concurrently translated segments.
+        
+        The text is split on paragraph and sentence boundaries into segments
+        of at most settings.chunk_max_chars, each segment goes through
+        translate() (so it is cached and coalesced individually) under
+        settings.chunk_concurrency, and results are reassembled in order
+        with the original separators.
+        """
+        segments = await run_cpu_bound(split_text, text, settings.chunk_max_chars, size=len(text))
+        semaphore = asyncio.Semaphore(settings.chunk_concurrency)
+        
+        async def translate_segment(segment: str) -> TranslationResult:
+            if not segment.strip():
+                return TranslationResult(content=segment, latency_ms=0, model=model, cached=True)
+            async with semaphore:
+                return await self.translate(segment, source, target, model if pinned else None, priority)
+        
+        results = await asyncio.gather(*(translate_segment(segment) for segment, _ in segments))
+        latency_ms = (time.time() - start_time) * 1000
+        
+        for result in results:
+            if result.error:
+                return TranslationResult(
+                    content="",
+                    latency_ms=latency_ms,
+                    model=model,
+                    error=result.error,
+                    status_code=result.status_code,
+                    retry_after=result.retry_after
+                )
+        
+        content = "".join(
+            result.content + separator
+            for result, (_, separator) in zip(results, segments)
+        ).strip()
+        tokens = [result.tokens_used for result in results if result.tokens_used]
+        tokens_used = sum(tokens) if tokens else None
+        
+        if self.cache is not None:
+            await self.cache.set(cache_key, {
+                "content": content,
+                "model": model,
+                "tokens_used": tokens_used
+            })
+        
+        return TranslationResult(
+            content=content,
+            latency_ms=latency_ms,
+            model=model,
+            tokens_used=tokens_used,
+            cached=all(result.cached for result in results)
+        )
+    
+    async def _translate_uncached(
+        self,
+        text: str,
+        source: str,
+        target: str,
+        model: str,
+        pinned: bool,
+        cache_key: str,
+        start_time: float,
+        priority: Priority
+    ) -> TranslationResult:
+        """Call the upstream API via the model router and populate the cache on success."""
+        try:
+            headers = self._build_headers()
+            
+            async def call(candidate: str) -> TranslationResult:
+                payload = self._build_payload(text, source, target, candidate)
+                return await self._make_request_with_retries(payload, headers)
+            
+            # Make request with retries, failing over or hedging across models
+            async with self.admission.slot(priority):
+                result = await self.router.run(
+                    self.router.candidates(model, pinned),
+                    call,
+                    lambda candidate_result: bool(candidate_result.error)
+                )
             
             if result.error:
                 return result
             
+            token_estimator.observe(text, source, target, result.tokens_used)
             latency_ms = (time.time() - start_time) * 1000
             
+            if self.cache is not None:
+                await self.cache.set(cache_key, {
+                    "content": result.content,
+                    "model": result.model,
+                    "tokens_used": result.tokens_used
+                })
+            if self.memory is not None:
+                await self.memory.record(text, result.content, source, target, result.model)
+            
             return TranslationResult(
                 content=result.content,
                 latency_ms=latency_ms,
-                model=model,
+                model=result.model,
                 tokens_used=result.tokens_used
             )
             
+        except AdmissionRejected as e:
+            return _overloaded_result(e, model, start_time)
         except Exception as e:
             latency_ms = (time.time() - start_time) * 1000
             logger.error(f"Translation error: {str(e)}")
@@ -115,97 +486,478 @@ class OpenRouterService:
                 error=f"Translation failed: {str(e)}"
             )
     
+    def _build_payload(
+        self,
+        text: str,
+        source: str,
+        target: str,
+        model: str,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """Build the chat completion payload for a translation."""
+        # Build the prompt based on source language
+        if source == "auto":
+            prompt = f"Translate the following text to {self._get_language_name(target)}:\n\n{text}"
+        else:
+            source_name = self._get_language_name(source)
+            target_name = self._get_language_name(target)
+            prompt = f"Translate the following {source_name} text to {target_name}:\n\n{text}"
+        
+        payload = {
+            "model": model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are a translation engine. Only return the translated text without any additional commentary or explanation."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.1,
+            "max_tokens": token_estimator.max_tokens(text, source, target)
+        }
+        
+        if stream:
+            payload["stream"] = True
+        
+        return payload
+    
+    def _build_headers(self) -> Dict[str, str]:
+        """Build request headers for the OpenRouter API."""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        if self.app_url:
+            headers["HTTP-Referer"] = self.app_url
+            headers["X-Title"] = "PollyGlot"
+        
+        return headers
+    
+    async def translate_stream(
+        self,
+        text: str,
+        source: str,
+        target: str,
+        model: Optional[str] = None
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Translate text, yielding tokens as OpenRouter streams them.
+        
+        Args:
+            text: Text to translate
+            source: Source language (e.g., "auto", "en", "es")
+            target: Target language (e.g., "en", "es", "fr")
+            model: OpenRouter model to use (defaults to configured model)
+            
+        Yields:
+            "token" events with text deltas, then one "done" event with
+            latency and token metadata, or an "error" event on failure
+        """
+        start_time = time.time()
+        model = model or self.default_model
+        cache_key = make_cache_key(text, source, target, model)
+        
+        if self.cache is not None:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                yield StreamEvent("token", {"text": cached["content"]})
+                yield StreamEvent("done", {
+                    "model": cached["model"],
+                    "latency_ms": (time.time() - start_time) * 1000,
+                    "first_token_ms": (time.time() - start_time) * 1000,
+                    "tokens_used": None,
+                    "cached": True
+                })
+                return
+        
+        payload = self._build_payload(text, source, target, model, stream=True)
+        parts = []
+        tokens_used = None
+        first_token_ms = None
+        
+        try:
+            permit = await self.admission.acquire(Priority.INTERACTIVE)
+        except AdmissionRejected as e:
+            yield StreamEvent("error", {"error": str(e), "retry_after": e.retry_after})
+            return
+        
+        breaker = self.breakers.get("openrouter", model)
+        if not breaker.allow():
+            await self.admission.release(permit)
+            yield StreamEvent("error", {
+                "error": f"Upstream temporarily unavailable for model {model}",
+                "retry_after": breaker.retry_after()
+            })
+            return
+        
+        outcome: Optional[bool] = None
+        try:
+            async with self.client.stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                headers=self._build_headers()
+            ) as response:
+                if response.status_code != 200:
+                    if response.status_code == 429 or self.retry_policy.is_retryable_status(response.status_code):
+                        outcome = False
+                    body = await response.aread()
+                    error_msg = f"HTTP {response.status_code}: {body.decode(errors='replace')}"
+                    yield StreamEvent("error", {"error": error_msg})
+                    return
+                
+                async for line in response.aiter_lines():
+                    # SSE comments (": OPENROUTER PROCESSING") keep the connection alive
+                    if not line.startswith("data:"):
+                        continue
+                    
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    
+                    chunk = json.loads(data)
+                    if "error" in chunk:
+                        outcome = False
+                        yield StreamEvent("error", {"error": str(chunk["error"])})
+                        return
+                    
+                    choices = chunk.get("choices") or []
+                    delta = choices[0].get("delta", {}).get("content") if choices else None
+                    if delta:
+                        if first_token_ms is None:
+                            first_token_ms = (time.time() - start_time) * 1000
+                        parts.append(delta)
+                        yield StreamEvent("token", {"text": delta})
+                    
+                    if chunk.get("usage"):
+                        tokens_used = chunk["usage"].get("total_tokens")
+            
+            outcome = True
+        
+        except httpx.TimeoutException:
+            outcome = False
+            yield StreamEvent("error", {"error": "Request timeout"})
+            return
+        except Exception as e:
+            outcome = False
+            logger.error(f"Streaming translation error: {str(e)}")
+            yield StreamEvent("error", {"error": f"Translation failed: {str(e)}"})
+            return
+        finally:
+            breaker.record(outcome)
+            await self.admission.release(permit)
+        
+        content = "".join(parts).strip()
+        token_estimator.observe(text, source, target, tokens_used)
+        if self.cache is not None and content:
+            await self.cache.set(cache_key, {
+                "content": content,
+                "model": model,
+                "tokens_used": tokens_used
+            })
+        if self.memory is not None and content:
+            await self.memory.record(text, content, source, target, model)
+        
+        yield StreamEvent("done", {
+            "model": model,
+            "latency_ms": (time.time() - start_time) * 1000,
+            "first_token_ms": first_token_ms,
+            "tokens_used": tokens_used,
+            "cached": False
+        })
+    
+    async def translate_many(
+        self,
+        items: List[Tuple[str, str, str]],
+        model: Optional[str] = None
+    ) -> List[TranslationResult]:
+        """
+        Translate many (text, source, target) items with few upstream calls.
+        
+        Cache hits are answered directly. Remaining short texts sharing a
+        language pair are packed into one JSON-array prompt; long texts, and
+        packs whose reply cannot be parsed, fall back to individual calls.
+        Upstream calls run concurrently under settings.batch_concurrency
+        and are admitted at batch priority, behind interactive requests.
+        
+        Args:
+            items: (text, source, target) tuples
+            model: OpenRouter model to use (defaults to configured model)
+            
+        Returns:
+            One TranslationResult per item, in input order
+        """
+        requested_model = model
+        model = model or self.default_model
+        results: List[Optional[TranslationResult]] = [None] * len(items)
+        semaphore = asyncio.Semaphore(settings.batch_concurrency)
+        
+        # Answer cache hits and group the misses by language pair
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index, (text, source, target) in enumerate(items):
+            if self.cache is not None:
+                cached = await self.cache.get(make_cache_key(text, source, target, model))
+                if cached is not None:
+                    results[index] = TranslationResult(
+                        content=cached["content"],
+                        latency_ms=0,
+                        model=cached["model"],
+                        cached=True
+                    )
+                    continue
+            groups.setdefault((source, target), []).append(index)
+        
+        # Pack short texts up to the per-prompt character and segment limits
+        packs: List[List[int]] = []
+        for indices in groups.values():
+            for pack in _pack_texts([items[index][0] for index in indices]):
+                packs.append([indices[position] for position in pack])
+        
+        async def run_single(index: int) -> None:
+            text, source, target = items[index]
+            async with semaphore:
+                results[index] = await self.translate(text, source, target, requested_model, Priority.BATCH)
+        
+        async def run_pack(pack: List[int]) -> None:
+            if len(pack) == 1:
+                await run_single(pack[0])
+                return
+            
+            _, source, target = items[pack[0]]
+            texts = [items[index][0] for index in pack]
+            async with semaphore:
+                packed = await self._translate_packed(texts, source, target, model, Priority.BATCH)
+            
+            if packed is None:
+                await asyncio.gather(*(run_single(index) for index in pack))
+                return
+            
+            for index, result in zip(pack, packed):
+                results[index] = result
+                if result.error:
+                    continue
+                text, source, target = items[index]
+                if self.cache is not None:
+                    await self.cache.set(make_cache_key(text, source, target, model), {
+                        "content": result.content,
+                        "model": model,
+                        "tokens_used": result.tokens_used
+                    })
+                if self.memory is not None:
+                    await self.memory.record(text, result.content, source, target, model)
+        
+        await asyncio.gather(*(run_pack(pack) for pack in packs))
+        return results
+    
+    async def _translate_packed(
+        self,
+        texts: List[str],
+        source: str,
+        target: str,
+        model: str,
+        priority: Priority = Priority.BATCH
+    ) -> Optional[List[TranslationResult]]:
+        """
+        Translate several texts in one prompt as a JSON array.
+        
+        Returns:
+            One result per text, or None if the request failed or the reply
+            was not a JSON array of the same length. If admission control
+            sheds the call, every text gets the same 503 error result.
+        """
+        start_time = time.time()
+        target_name = self._get_language_name(target)
+        if source == "auto":
+            instruction = f"Translate each string in the following JSON array to {target_name}."
+        else:
+            instruction = f"Translate each string in the following JSON array from {self._get_language_name(source)} to {target_name}."
+        
+        payload = {
+            "model": model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are a translation engine. Only return a JSON array of the translated strings, in the same order and with the same number of elements, without any additional commentary or explanation."
+                },
+                {
+                    "role": "user",
+                    "content": f"{instruction}\n\n{json.dumps(texts, ensure_ascii=False)}"
+                }
+            ],
+            "temperature": 0.1,
+            "max_tokens": token_estimator.packed_max_tokens(texts, source, target)
+        }
+        
+        try:
+            async with self.admission.slot(priority):
+                result = await self._make_request_with_retries(payload, self._build_headers())
+        except AdmissionRejected as e:
+            return [_overloaded_result(e, model, start_time) for _ in texts]
+        if result.error:
+            return None
+        
+        translations = _parse_json_array(result.content)
+        if translations is None or len(translations) != len(texts):
+            logger.warning(f"Packed translation reply unusable, falling back to {len(texts)} single requests")
+            return None
+        
+        latency_ms = (time.time() - start_time) * 1000
+        total_chars = sum(len(text) for text in texts) or 1
+        return [
+            TranslationResult(
+                content=translation.strip(),
+                latency_ms=latency_ms,
+                model=model,
+                tokens_used=round(result.tokens_used * len(text) / total_chars) if result.tokens_used else None
+            )
+            for text, translation in zip(texts, translations)
+        ]
+    
     async def _make_request_with_retries(
         self,
         payload: Dict[str, Any],
-        headers: Dict[str, str],
-        max_retries: int = 3
+        headers: Dict[str, str]
     ) -> TranslationResult:
-        """Make HTTP request with exponential backoff retries."""
+        """
+        Make HTTP request, retrying transient failures under the retry policy.
+        
+        Retryable statuses, timeouts and transport errors are retried with
+        decorrelated jitter, waiting at least as long as a Retry-After
+        header asks. Other 4xx responses fail immediately. Retries stop at
+        the policy's total deadline or when the process-wide retry budget
+        is exhausted.
+        """
+        policy = self.retry_policy
+        deadline = time.monotonic() + policy.deadline
+        delay = policy.base_delay
+        self.retry_budget.record_request()
+        
+        breaker = self.breakers.get("openrouter", payload["model"])
+        metric_model = model_label(payload["model"])
+        inflight = UPSTREAM_INFLIGHT.labels(metric_model)
         
-        for attempt in range(max_retries + 1):
+        attempt = 0
+        while True:
+            retry_after = None
+            remaining = deadline - time.monotonic()
+            
+            if not breaker.allow():
+                return TranslationResult(
+                    content="",
+                    latency_ms=0,
+                    model=payload["model"],
+                    error=f"Upstream temporarily unavailable for model {payload['model']}",
+                    status_code=503,
+                    retry_after=breaker.retry_after() or None
+                )
+            
+            # Outcome for the circuit breaker; None means "says nothing about upstream health"
+            outcome: Optional[bool] = None
+            upstream_status = "error"
+            attempt_start = time.perf_counter()
+            
+            # Connection, TTFB and body timings via httpcore trace events
+            trace = current_trace()
+            recorder = HttpTraceRecorder() if trace is not None else None
+            extensions = {"trace": recorder} if recorder is not None else None
+            
+            inflight.inc()
             try:
-                timeout = httpx.Timeout(30.0)
-                async with httpx.AsyncClient(timeout=timeout) as client:
-                    response = await client.post(
-                        f"{self.BASE_URL}/chat/completions",
-                        json=payload,
-                        headers=headers
-                    )
+                response = await self.client.post(
+                    f"{self.base_url}/chat/completions",
+                    json=payload,
+                    headers=headers,
+                    timeout=min(settings.openrouter_timeout, remaining),
+                    extensions=extensions
+                )
+                upstream_status = str(response.status_code)
+                
+                if response.status_code == 200:
+                    data = response.json()
                     
-                    if response.status_code == 200:
-                        data = response.json()
+                    if "choices" in data and len(data["choices"]) > 0:
+                        content = data["choices"][0]["message"]["content"]
+                        tokens_used = data.get("usage", {}).get("total_tokens")
                         
-                        if "choices" in data and len(data["choices"]) > 0:
-                            content = data["choices"][0]["message"]["content"]
-                            tokens_used = data.get("usage", {}).get("total_tokens")
-                            
-                            return TranslationResult(
-                                content=content.strip(),
-                                latency_ms=0,  # Will be set by caller
-                                model=payload["model"],
-                                tokens_used=tokens_used
-                            )
-                        else:
-                            raise Exception("No translation content in response")
-                    
-                    elif response.status_code == 429:
-                        # Rate limited, wait and retry
-                        if attempt < max_retries:
-                            wait_time = (2 ** attempt) + 1
-                            logger.warning(f"Rate limited, waiting {wait_time}s before retry {attempt + 1}")
-                            await asyncio.sleep(wait_time)
-                            continue
-                        else:
-                            return TranslationResult(
-                                content="",
-                                latency_ms=0,
-                                model=payload["model"],
-                                error="Rate limit exceeded"
-                            )
+                        outcome = True
+                        return TranslationResult(
+                            content=content.strip(),
+                            latency_ms=0,  # Will be set by caller
+                            model=payload["model"],
+                            tokens_used=tokens_used
+                        )
                     
-                    else:
-                        error_msg = f"HTTP {response.status_code}: {response.text}"
-                        if attempt < max_retries:
-                            wait_time = (2 ** attempt) + 1
-                            logger.warning(f"Request failed ({error_msg}), retrying in {wait_time}s")
-                            await asyncio.sleep(wait_time)
-                            continue
-                        else:
-                            return TranslationResult(
-                                content="",
-                                latency_ms=0,
-                                model=payload["model"],
-                                error=error_msg
-                            )
-                            
-            except httpx.TimeoutException:
-                if attempt < max_retries:
-                    wait_time = (2 ** attempt) + 1
-                    logger.warning(f"Request timeout, retrying in {wait_time}s")
-                    await asyncio.sleep(wait_time)
-                    continue
+                    outcome = False
+                    error_msg = "No translation content in response"
+                
+                elif response.status_code == 429:
+                    outcome = False
+                    error_msg = "Rate limit exceeded"
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                
+                elif policy.is_retryable_status(response.status_code):
+                    outcome = False
+                    error_msg = f"HTTP {response.status_code}: {response.text}"
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                
                 else:
+                    # Client errors will fail the same way on every attempt
                     return TranslationResult(
                         content="",
                         latency_ms=0,
                         model=payload["model"],
-                        error="Request timeout"
+                        error=f"HTTP {response.status_code}: {response.text}"
                     )
             
+            except asyncio.CancelledError:
+                # Hedged request lost the race or the caller went away
+                upstream_status = "cancelled"
+                raise
+            
+            except httpx.TimeoutException:
+                outcome = False
+                upstream_status = "timeout"
+                error_msg = "Request timeout"
+            
             except Exception as e:
-                if attempt < max_retries:
-                    wait_time = (2 ** attempt) + 1
-                    logger.warning(f"Request error ({str(e)}), retrying in {wait_time}s")
-                    await asyncio.sleep(wait_time)
-                    continue
-                else:
-                    return TranslationResult(
-                        content="",
-                        latency_ms=0,
-                        model=payload["model"],
-                        error=str(e)
+                outcome = False
+                error_msg = str(e)
+            
+            finally:
+                breaker.record(outcome)
+                inflight.dec()
+                UPSTREAM_LATENCY.labels(metric_model, upstream_status).observe(time.perf_counter() - attempt_start)
+                if trace is not None:
+                    upstream_span = trace.add_span(
+                        "upstream", attempt_start, time.perf_counter(),
+                        model=payload["model"], attempt=attempt, status=upstream_status
                     )
+                    recorder.record(trace, parent_id=upstream_span.span_id)
+            
+            # Decide whether another attempt is allowed
+            if attempt >= policy.max_retries:
+                return TranslationResult(content="", latency_ms=0, model=payload["model"], error=error_msg)
+            
+            delay = policy.next_delay(delay)
+            wait_time = max(delay, retry_after or 0.0)
+            
+            if time.monotonic() + wait_time >= deadline:
+                logger.warning(f"Request failed ({error_msg}), retry would exceed the deadline")
+                return TranslationResult(content="", latency_ms=0, model=payload["model"], error=error_msg)
+            
+            if not self.retry_budget.try_spend():
+                logger.warning(f"Request failed ({error_msg}), retry budget exhausted")
+                return TranslationResult(content="", latency_ms=0, model=payload["model"], error=error_msg)
+            
+            attempt += 1
+            UPSTREAM_RETRIES.labels(metric_model).inc()
+            logger.warning(f"Request failed ({error_msg}), retry {attempt} in {wait_time:.2f}s")
+            with span("retry_wait", attempt=attempt):
+                await asyncio.sleep(wait_time)
     
     def _get_language_name(self, code: str) -> str:
         """Convert language code to human-readable name."""
@@ -231,4 +983,64 @@ class OpenRouterService:
             "pl": "Polish",
             "tr": "Turkish"
         }
-        return language_map.get(code, code)
\ No newline at end of file
+        return language_map.get(code, code)
+
+
+def _pack_texts(texts: List[str]) -> List[List[int]]:
+    """
+    Group text positions into packs within the batch pack limits.
+    
+    Texts longer than settings.batch_pack_max_chars get a pack of their
+    own; the rest are packed greedily in order up to
+    settings.batch_pack_max_chars characters and
+    settings.batch_pack_max_segments texts per pack.
+    """
+    packs: List[List[int]] = []
+    pack: List[int] = []
+    pack_chars = 0
+    for position, text in enumerate(texts):
+        length = len(text)
+        if length > settings.batch_pack_max_chars:
+            packs.append([position])
+            continue
+        if pack and (
+            pack_chars + length > settings.batch_pack_max_chars
+            or len(pack) >= settings.batch_pack_max_segments
+        ):
+            packs.append(pack)
+            pack, pack_chars = [], 0
+        pack.append(position)
+        pack_chars += length
+    if pack:
+        packs.append(pack)
+    return packs
+
+
+def _parse_json_array(content: str) -> Optional[List[str]]:
+    """Parse a model reply as a JSON array of strings, tolerating code fences."""
+    content = content.strip()
+    if content.startswith("```"):
+        content = content.strip("`").strip()
+        if content.startswith("json"):
+            content = content[len("json"):]
+    
+    try:
+        parsed = json.loads(content)
+    except ValueError:
+        return None
+    
+    if not isinstance(parsed, list) or not all(isinstance(item, str) for item in parsed):
+        return None
+    return parsed
+
+
+def _overloaded_result(rejection: AdmissionRejected, model: str, start_time: float) -> TranslationResult:
+    """Error result for a call shed by admission control."""
+    return TranslationResult(
+        content="",
+        latency_ms=(time.time() - start_time) * 1000,
+        model=model,
+        error=str(rejection),
+        status_code=503,
+        retry_after=rejection.retry_after
+    )
@@ -0,0 +1,133 @@
+"""Retry policy with decorrelated jitter, Retry-After support and a retry budget."""
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from ..core.settings import settings
+
+# Upstream statuses worth retrying; other 4xx responses are client errors
+RETRYABLE_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+@dataclass
+class RetryPolicy:
+    """How often, how long and for which failures a request is retried."""
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 10.0
+    deadline: float = 45.0
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        """Build the policy from application settings."""
+        return cls(
+            max_retries=settings.retry_max_retries,
+            base_delay=settings.retry_base_delay,
+            max_delay=settings.retry_max_delay,
+            deadline=settings.request_deadline
+        )
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        """Return True if a response with this status should be retried."""
+        return status_code in RETRYABLE_STATUS_CODES
+
+    def next_delay(self, previous_delay: float) -> float:
+        """
+        Compute the next backoff using decorrelated jitter.
+
+        Args:
+            previous_delay: Delay used before the previous retry
+                (base_delay for the first retry)
+
+        Returns:
+            Seconds to wait, between base_delay and max_delay
+        """
+        upper = max(self.base_delay, previous_delay * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given as seconds or an HTTP date.
+
+    Args:
+        value: Raw header value
+
+    Returns:
+        Seconds to wait, or None if absent or malformed
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """
+    Process-wide cap on retries relative to request volume.
+
+    Every request deposits `ratio` tokens and every retry spends one, so
+    retries stay at most roughly `ratio` of traffic. A small time-based
+    allowance of `min_per_second` keeps low-traffic workers able to retry.
+    When the upstream is degraded the balance drains and retries stop
+    instead of multiplying load.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, window: float = 10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_balance = max(1.0, min_per_second * window)
+        self._balance = self.max_balance
+        self._updated = time.monotonic()
+        self.exhausted = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._balance = min(
+            self.max_balance,
+            self._balance + (now - self._updated) * self.min_per_second
+        )
+        self._updated = now
+
+    def record_request(self) -> None:
+        """Deposit tokens for a new (non-retry) request."""
+        self._refill()
+        self._balance = min(self.max_balance, self._balance + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Withdraw one token for a retry; False if the budget is exhausted."""
+        self._refill()
+        if self._balance >= 1.0:
+            self._balance -= 1.0
+            return True
+        self.exhausted += 1
+        return False
+
+    @property
+    def balance(self) -> float:
+        """Currently available retry tokens."""
+        self._refill()
+        return self._balance
+
+
+def create_retry_budget() -> RetryBudget:
+    """Build the retry budget from application settings."""
+    return RetryBudget(
+        ratio=settings.retry_budget_ratio,
+        min_per_second=settings.retry_budget_min_per_second
+    )
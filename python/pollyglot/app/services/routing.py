@@ -0,0 +1,194 @@
+"""Multi-model routing with failover and hedged requests."""
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, TypeVar
+
+from ..core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """
+    Rolling window of recent successful latencies per model.
+
+    Clients may name any model, so at most max_models are tracked; the
+    least recently recorded model is dropped first.
+    """
+
+    def __init__(self, window: int = 200, max_models: int = 64):
+        self.window = window
+        self.max_models = max_models
+        self._samples: "OrderedDict[str, Deque[float]]" = OrderedDict()
+
+    def record(self, model: str, latency: float) -> None:
+        """Record a successful call latency in seconds."""
+        samples = self._samples.get(model)
+        if samples is None:
+            samples = self._samples[model] = deque(maxlen=self.window)
+            while len(self._samples) > self.max_models:
+                self._samples.popitem(last=False)
+        else:
+            self._samples.move_to_end(model)
+        samples.append(latency)
+
+    def percentile(self, model: str, q: float) -> Optional[float]:
+        """Return the q-quantile latency for model, or None without samples."""
+        samples = self._samples.get(model)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def count(self, model: str) -> int:
+        """Number of samples held for model."""
+        return len(self._samples.get(model, ()))
+
+
+class ModelRouter:
+    """
+    Route a request across a primary model and ordered fallbacks.
+
+    The primary is tried first. If it returns an error the next model is
+    started immediately (failover). With hedging enabled, if the primary
+    has not answered within its observed latency percentile, one backup
+    request is issued to the next model and whichever succeeds first wins;
+    the other is cancelled.
+    """
+
+    # Samples required before the observed percentile replaces the default delay
+    MIN_SAMPLES = 20
+
+    def __init__(
+        self,
+        fallback_models: Optional[List[str]] = None,
+        hedge_enabled: Optional[bool] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_default_delay: Optional[float] = None,
+        hedge_min_delay: Optional[float] = None
+    ):
+        self.fallback_models = list(
+            settings.openrouter_fallback_models if fallback_models is None else fallback_models
+        )
+        self.hedge_enabled = settings.hedge_enabled if hedge_enabled is None else hedge_enabled
+        self.hedge_percentile = hedge_percentile or settings.hedge_percentile
+        self.hedge_default_delay = hedge_default_delay or settings.hedge_default_delay
+        self.hedge_min_delay = hedge_min_delay or settings.hedge_min_delay
+        self.latency = LatencyTracker()
+        self.failovers = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def candidates(self, model: str, pinned: bool = False) -> List[str]:
+        """
+        Return models to try in order.
+
+        Args:
+            model: Primary model
+            pinned: True if the caller asked for this model explicitly, in
+                which case no fallbacks are used
+        """
+        if pinned:
+            return [model]
+        return [model] + [fallback for fallback in self.fallback_models if fallback != model]
+
+    def hedge_delay(self, model: str) -> float:
+        """Seconds to wait on model before sending a hedged request."""
+        if self.latency.count(model) < self.MIN_SAMPLES:
+            return self.hedge_default_delay
+        observed = self.latency.percentile(model, self.hedge_percentile)
+        return max(self.hedge_min_delay, observed)
+
+    async def run(
+        self,
+        models: List[str],
+        call: Callable[[str], Awaitable[T]],
+        is_error: Callable[[T], bool]
+    ) -> T:
+        """
+        Run call against models with failover and optional hedging.
+
+        Args:
+            models: Candidate models in preference order
+            call: Coroutine factory performing the request for one model
+            is_error: Predicate telling whether a result is a failure
+
+        Returns:
+            The first successful result, or the last failure if all failed
+        """
+        remaining = list(models)
+        pending: Set[asyncio.Task] = set()
+        task_models: Dict[asyncio.Task, str] = {}
+        task_started: Dict[asyncio.Task, float] = {}
+        hedged = False
+        last_result = None
+
+        def start_next() -> None:
+            model = remaining.pop(0)
+            task = asyncio.ensure_future(call(model))
+            task_models[task] = model
+            task_started[task] = time.monotonic()
+            pending.add(task)
+
+        start_next()
+        primary = models[0]
+
+        try:
+            while pending:
+                timeout = None
+                if self.hedge_enabled and not hedged and remaining:
+                    timeout = self.hedge_delay(primary)
+
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # Primary is slower than its usual percentile: hedge once
+                    hedged = True
+                    self.hedges += 1
+                    logger.info(f"Hedging {primary} with {remaining[0]}")
+                    start_next()
+                    continue
+
+                for task in done:
+                    pending.discard(task)
+                    result = task.result()
+                    if not is_error(result):
+                        self.latency.record(task_models[task], time.monotonic() - task_started[task])
+                        if hedged and task_models[task] != primary:
+                            self.hedge_wins += 1
+                        return result
+                    last_result = result
+
+                # Fail over only when nothing else is still in flight
+                if not pending and remaining:
+                    self.failovers += 1
+                    logger.warning(f"Model {task_models[task]} failed, failing over to {remaining[0]}")
+                    start_next()
+
+            return last_result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return routing counters and per-model latency percentiles."""
+        models = {}
+        for model in list(self.latency._samples):
+            models[model] = {
+                "samples": self.latency.count(model),
+                "p50_ms": (self.latency.percentile(model, 0.5) or 0) * 1000,
+                "p95_ms": (self.latency.percentile(model, 0.95) or 0) * 1000,
+                "hedge_delay_ms": self.hedge_delay(model) * 1000
+            }
+        return {
+            "fallback_models": self.fallback_models,
+            "hedge_enabled": self.hedge_enabled,
+            "failovers": self.failovers,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "models": models
+        }
@@ -0,0 +1,63 @@
+"""In-flight request coalescing for duplicate concurrent calls."""
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """A shared in-progress call and the number of callers awaiting it."""
+
+    def __init__(self, task: "asyncio.Task[T]"):
+        self.task = task
+        self.waiters = 0
+        self.abandoned = False
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one in-progress task.
+
+    The first caller starts the work as a separate task; later callers with
+    the same key await that task instead of starting their own. Results and
+    exceptions fan out to every caller. A caller that is cancelled (e.g. the
+    client disconnected) only detaches itself; the shared task is cancelled
+    once no callers remain.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, _Call] = {}
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run func for key, or join the call already in flight for key.
+
+        Args:
+            key: Identity of the call; equal keys are coalesced
+            func: Zero-argument coroutine factory performing the work
+
+        Returns:
+            The shared result of func
+        """
+        call = self._calls.get(key)
+        if call is None or call.abandoned:
+            call = _Call(asyncio.ensure_future(func()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _, key=key, call=call: self._forget(key, call))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.abandoned = True
+                call.task.cancel()
+
+    def _forget(self, key: str, call: _Call) -> None:
+        """Drop a finished call unless a newer one already replaced it."""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def __len__(self) -> int:
+        return len(self._calls)
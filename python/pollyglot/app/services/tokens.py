@@ -0,0 +1,190 @@
+"""Fast local token estimates for sizing max_tokens and charging quotas."""
+import logging
+import math
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# System prompt, instruction line and chat framing sent with every request
+PROMPT_OVERHEAD_TOKENS = 40
+
+# Extra output tokens per element of a packed JSON array (quotes, commas)
+PACKED_ELEMENT_TOKENS = 4
+
+# Characters per token by script for typical BPE vocabularies; text outside
+# these ranges (Latin, digits, punctuation, whitespace) uses DEFAULT_CHARS_PER_TOKEN
+SCRIPT_CHARS_PER_TOKEN = {
+    "han": (re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff]+"), 1.0),
+    "kana": (re.compile(r"[\u3040-\u30ff]+"), 1.0),
+    "hangul": (re.compile(r"[\uac00-\ud7af\u1100-\u11ff\u3130-\u318f]+"), 1.2),
+    "cyrillic": (re.compile(r"[\u0400-\u04ff]+"), 2.5),
+    "arabic": (re.compile(r"[\u0600-\u06ff\u0750-\u077f]+"), 2.0),
+    "devanagari": (re.compile(r"[\u0900-\u097f]+"), 1.2)
+}
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+# All scripts in one pass; the matching group's index identifies the script
+SCRIPT_NAMES = list(SCRIPT_CHARS_PER_TOKEN)
+SCRIPT_RUNS = re.compile("|".join(f"({pattern.pattern})" for pattern, _ in SCRIPT_CHARS_PER_TOKEN.values()))
+
+# Language assumed for "auto" sources by dominant script
+SCRIPT_LANGUAGE = {
+    "han": "zh", "kana": "ja", "hangul": "ko", "cyrillic": "ru", "arabic": "ar", "devanagari": "hi"
+}
+
+# Tokens needed to say the same thing as one English token
+LANGUAGE_TOKEN_FACTOR = {
+    "en": 1.0, "es": 1.15, "fr": 1.2, "de": 1.2, "it": 1.15, "pt": 1.15,
+    "nl": 1.15, "sv": 1.15, "da": 1.15, "no": 1.15, "fi": 1.4, "pl": 1.35,
+    "tr": 1.35, "ru": 1.6, "ja": 1.6, "zh": 1.3, "ko": 1.7, "ar": 1.7, "hi": 2.2
+}
+
+# Bounds on the learned correction so a few odd replies cannot derail it
+MIN_CALIBRATION = 0.5
+MAX_CALIBRATION = 3.0
+
+
+@dataclass
+class TokenEstimate:
+    """Predicted token usage of one translation."""
+    input_tokens: int
+    output_tokens: int
+
+    @property
+    def total(self) -> int:
+        """Prompt plus completion, comparable to the API's total_tokens."""
+        return PROMPT_OVERHEAD_TOKENS + self.input_tokens + self.output_tokens
+
+
+class TokenEstimator:
+    """
+    Estimate prompt and completion tokens per language pair.
+
+    Input tokens come from per-script characters-per-token ratios, or from
+    a tiktoken encoding when configured and installed (loaded on first
+    use). Output tokens are the input's English-equivalent length scaled
+    by the target language's token factor, then multiplied by a per-pair
+    correction learned as an EWMA of observed usage.
+    """
+
+    def __init__(
+        self,
+        backend: str = "ratio",
+        headroom: float = 1.5,
+        floor: int = 64,
+        calibration_alpha: float = 0.1
+    ):
+        self.backend = backend
+        self.headroom = headroom
+        self.floor = floor
+        self.calibration_alpha = calibration_alpha
+        self._calibration: Dict[Tuple[str, str], float] = {}
+        self._encode: Optional[Callable[[str], List[int]]] = None
+        self._encoder_loaded = False
+
+    def _encoder(self) -> Optional[Callable[[str], List[int]]]:
+        """Load the tiktoken encoding once, or None to use ratio tables."""
+        if self.backend != "tiktoken" or self._encoder_loaded:
+            return self._encode
+        self._encoder_loaded = True
+        try:
+            import tiktoken
+
+            self._encode = tiktoken.get_encoding("cl100k_base").encode
+        except Exception as e:
+            logger.warning(f"tiktoken unavailable ({e}), using ratio token estimates")
+        return self._encode
+
+    def count(self, text: str) -> Tuple[int, Optional[str]]:
+        """
+        Estimate the tokens in text.
+
+        Returns:
+            Tuple of (token count, dominant non-Latin script or None)
+        """
+        script_chars = dict.fromkeys(SCRIPT_NAMES, 0)
+        if not text.isascii():
+            for match in SCRIPT_RUNS.finditer(text):
+                script_chars[SCRIPT_NAMES[match.lastindex - 1]] += match.end() - match.start()
+        other_chars = len(text) - sum(script_chars.values())
+        dominant = max(script_chars, key=script_chars.get)
+        if script_chars[dominant] <= other_chars:
+            dominant = None
+
+        encode = self._encoder()
+        if encode is not None:
+            return len(encode(text)), dominant
+
+        tokens = other_chars / DEFAULT_CHARS_PER_TOKEN + sum(
+            chars / SCRIPT_CHARS_PER_TOKEN[name][1] for name, chars in script_chars.items()
+        )
+        return math.ceil(tokens), dominant
+
+    def estimate(self, text: str, source: str, target: str) -> TokenEstimate:
+        """Predict the prompt and completion tokens for translating text."""
+        input_tokens, dominant = self.count(text)
+        return self._estimate(input_tokens, _resolve_source(source, dominant), target)
+
+    def _estimate(self, input_tokens: int, source: str, target: str) -> TokenEstimate:
+        english_tokens = input_tokens / LANGUAGE_TOKEN_FACTOR.get(source, 1.0)
+        output = english_tokens * LANGUAGE_TOKEN_FACTOR.get(target, 1.0)
+        output *= self._calibration.get((source, target), 1.0)
+        return TokenEstimate(input_tokens=input_tokens, output_tokens=math.ceil(output))
+
+    def max_tokens(self, text: str, source: str, target: str) -> int:
+        """Completion budget for one translation, with headroom against truncation."""
+        return self._budget(self.estimate(text, source, target).output_tokens)
+
+    def packed_max_tokens(self, texts: List[str], source: str, target: str) -> int:
+        """Completion budget for several texts returned as one JSON array."""
+        output = sum(self.estimate(text, source, target).output_tokens for text in texts)
+        return self._budget(output + PACKED_ELEMENT_TOKENS * len(texts))
+
+    def _budget(self, output_tokens: int) -> int:
+        return max(self.floor, math.ceil(output_tokens * self.headroom))
+
+    def observe(self, text: str, source: str, target: str, tokens_used: Optional[int]) -> None:
+        """
+        Calibrate the pair's output estimate from an observed total_tokens.
+
+        The completion share is taken as the observed total minus the
+        estimated prompt; replies shorter than the prompt are ignored.
+        """
+        if not tokens_used:
+            return
+        input_tokens, dominant = self.count(text)
+        source = _resolve_source(source, dominant)
+        estimate = self._estimate(input_tokens, source, target)
+        observed_output = tokens_used - PROMPT_OVERHEAD_TOKENS - estimate.input_tokens
+        if observed_output <= 0 or estimate.output_tokens <= 0:
+            return
+
+        key = (source, target)
+        current = self._calibration.get(key, 1.0)
+        # estimate.output_tokens already includes the current correction
+        ratio = current * observed_output / estimate.output_tokens
+        updated = current + self.calibration_alpha * (ratio - current)
+        self._calibration[key] = min(MAX_CALIBRATION, max(MIN_CALIBRATION, updated))
+
+    def stats(self) -> Dict[str, float]:
+        """Return the learned correction per language pair."""
+        return {f"{source}->{target}": round(value, 3) for (source, target), value in self._calibration.items()}
+
+
+def _resolve_source(source: str, dominant_script: Optional[str]) -> str:
+    """Assume a language for "auto" sources from the text's dominant script."""
+    if source != "auto":
+        return source
+    return SCRIPT_LANGUAGE.get(dominant_script, "en")
+
+
+# Global estimator shared by payload sizing and quota charges
+token_estimator = TokenEstimator(
+    backend=settings.token_estimator,
+    headroom=settings.max_tokens_headroom,
+    floor=settings.max_tokens_floor
+)
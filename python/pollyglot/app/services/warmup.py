@@ -0,0 +1,248 @@
+"""Precompute translations for known string catalogs before traffic arrives."""
+import asyncio
+import csv
+import json
+import logging
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+from ..core.settings import settings
+from .cache import make_cache_key
+from .detect import detector
+from .openrouter import OpenRouterService, TranslationResult
+
+logger = logging.getLogger(__name__)
+
+# Times a batch item shed by admission control is retried after Retry-After
+MAX_OVERLOAD_RETRIES = 5
+
+PO_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", '"': '"', "\\": "\\"}
+PO_ESCAPE_PATTERN = re.compile(r"\\(.)")
+PO_LINE_PATTERN = re.compile(r'^(msgctxt|msgid|msgid_plural|msgstr(?:\[\d+\])?)\s+"(.*)"\s*$')
+
+
+def _unescape_po(value: str) -> str:
+    return PO_ESCAPE_PATTERN.sub(
+        lambda match: PO_ESCAPES.get(match.group(1), match.group(1)), value
+    )
+
+
+def _read_po(path: Path) -> List[str]:
+    """Source strings (msgid and msgid_plural) of a gettext PO file."""
+    texts: List[str] = []
+    keyword = None
+    parts: List[str] = []
+
+    def flush() -> None:
+        if keyword in ("msgid", "msgid_plural"):
+            texts.append("".join(parts))
+
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        match = PO_LINE_PATTERN.match(line)
+        if match:
+            flush()
+            keyword, parts = match.group(1), [_unescape_po(match.group(2))]
+        elif line.startswith('"') and line.endswith('"') and keyword is not None:
+            # Continuation of a multi-line string
+            parts.append(_unescape_po(line[1:-1]))
+    flush()
+    return texts
+
+
+def _json_strings(value: Any) -> Iterable[str]:
+    """String leaves of a JSON document, in document order."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from _json_strings(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _json_strings(item)
+
+
+def _read_csv(path: Path, column: str) -> List[str]:
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        if column not in (reader.fieldnames or []):
+            raise ValueError(f"CSV catalog has no {column!r} column (columns: {reader.fieldnames})")
+        return [row[column] or "" for row in reader]
+
+
+def read_catalog(path: str, column: str = "text") -> List[str]:
+    """
+    Read the source strings of a catalog file.
+
+    The format follows the extension: .json (a list of strings or nested
+    objects such as i18n resource files; every string value is taken),
+    .csv (the given column, with a header row) or .po (msgid entries).
+    Strings are stripped and de-duplicated in order; empty strings and
+    strings longer than settings.max_input_chars are dropped.
+
+    Args:
+        path: Catalog file
+        column: CSV column holding the source text
+
+    Returns:
+        Unique source strings in catalog order
+    """
+    catalog = Path(path)
+    suffix = catalog.suffix.lower()
+    if suffix == ".json":
+        texts = list(_json_strings(json.loads(catalog.read_text(encoding="utf-8"))))
+    elif suffix == ".csv":
+        texts = _read_csv(catalog, column)
+    elif suffix in (".po", ".pot"):
+        texts = _read_po(catalog)
+    else:
+        raise ValueError(f"Unsupported catalog format: {catalog.suffix or path}")
+
+    unique = dict.fromkeys(text.strip() for text in texts)
+    return [text for text in unique if text and len(text) <= settings.max_input_chars]
+
+
+class WarmupProgress:
+    """
+    Append-only record of finished translations for resuming a warm-up.
+
+    Each line is the cache key of one translation that succeeded or was
+    already cached, so a rerun with the same catalog, languages and model
+    skips them; changing any of those starts that part over.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.done: Set[str] = set()
+        if path and Path(path).exists():
+            with open(path, encoding="utf-8") as f:
+                self.done = {line.strip() for line in f if line.strip()}
+
+    def mark(self, keys: List[str]) -> None:
+        """Record finished keys and flush them to disk."""
+        keys = [key for key in keys if key not in self.done]
+        self.done.update(keys)
+        if self.path and keys:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("".join(f"{key}\n" for key in keys))
+
+
+async def _alias_detected_source(
+    service: OpenRouterService,
+    text: str,
+    source: str,
+    target: str,
+    model: str,
+    result: TranslationResult
+) -> None:
+    """
+    Also cache a warmed translation under the key a source=auto request uses.
+
+    Live requests with source "auto" are keyed on the detected language,
+    which stays "auto" for short or ambiguous strings (and can differ from
+    the catalog's source); store the same translation under that key too.
+    """
+    detected = detector.detect_language(text)
+    if service.cache is None or detected in (source, target):
+        return
+    await service.cache.set(make_cache_key(text, detected, target, model), {
+        "content": result.content,
+        "model": result.model,
+        "tokens_used": result.tokens_used
+    })
+
+
+@dataclass
+class WarmupReport:
+    """Outcome of a warm-up run."""
+    translated: int = 0
+    cached: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+async def warm_cache(
+    service: OpenRouterService,
+    texts: List[str],
+    source: str,
+    targets: List[str],
+    model: Optional[str] = None,
+    concurrency: int = 2,
+    batch_size: int = 50,
+    progress: Optional[WarmupProgress] = None
+) -> WarmupReport:
+    """
+    Translate a catalog into every target language through the service.
+
+    Strings go through translate_many in batches, so short strings are
+    packed into shared prompts and every result lands in the translation
+    cache (and translation memory, when enabled) exactly as live requests
+    would. Each translation is also cached under the source language a
+    source=auto request for the string resolves to, "auto" included for
+    strings too short to detect. At most `concurrency` batches run at once; strings already in
+    the progress file are skipped, and finished ones are appended to it
+    after each batch.
+
+    Args:
+        service: Translation service whose cache is being warmed
+        texts: Source strings
+        source: Source language code of the catalog (not "auto")
+        targets: Target language codes
+        model: Model to translate with (defaults to the configured model)
+        concurrency: Batches in flight at once
+        batch_size: Strings per translate_many call
+        progress: Record of finished translations to skip and extend
+
+    Returns:
+        Counts of translated, already cached, skipped and failed strings
+    """
+    progress = progress or WarmupProgress(None)
+    resolved_model = model or service.default_model
+    report = WarmupReport()
+
+    batches: List[List[Tuple[str, str, str]]] = []
+    for target in targets:
+        pending = []
+        for text in texts:
+            if make_cache_key(text, source, target, resolved_model) in progress.done:
+                report.skipped += 1
+            else:
+                pending.append((text, source, target))
+        batches.extend(pending[i:i + batch_size] for i in range(0, len(pending), batch_size))
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_batch(items: List[Tuple[str, str, str]]) -> None:
+        async with semaphore:
+            for attempt in range(MAX_OVERLOAD_RETRIES + 1):
+                results = await service.translate_many(items, model)
+                finished = []
+                retry = []
+                for item, result in zip(items, results):
+                    if not result.error:
+                        finished.append(make_cache_key(*item, resolved_model))
+                        await _alias_detected_source(service, *item, resolved_model, result)
+                        if result.cached:
+                            report.cached += 1
+                        else:
+                            report.translated += 1
+                    elif (
+                        result.status_code == 503 and result.retry_after
+                        and attempt < MAX_OVERLOAD_RETRIES
+                    ):
+                        retry.append((item, result.retry_after))
+                    else:
+                        report.failed += 1
+                        logger.warning(f"Warm-up failed for {item[2]}: {result.error}")
+                progress.mark(finished)
+                if not retry:
+                    return
+                items = [item for item, _ in retry]
+                await asyncio.sleep(max(retry_after for _, retry_after in retry))
+
+    await asyncio.gather(*(run_batch(batch) for batch in batches))
+    return report
@@ -35,6 +35,7 @@ class TranslatorApp {
         // Control elements
         this.swapBtn = document.getElementById('swap-languages');
         this.modelSelect = document.getElementById('model-select');
+        this.editMode = document.getElementById('edit-mode');
         this.themeToggle = document.getElementById('theme-toggle');
         
         // Status elements
@@ -100,9 +101,10 @@ class TranslatorApp {
         this.charCount.textContent = count;
         
         // Update style based on character count
-        if (count > 4500) {
+        const maxLength = this.inputText.maxLength;
+        if (count > maxLength * 0.9) {
             this.charCount.style.color = 'var(--color-error)';
-        } else if (count > 4000) {
+        } else if (count > maxLength * 0.8) {
             this.charCount.style.color = 'var(--color-warning)';
         } else {
             this.charCount.style.color = '';
@@ -138,7 +140,10 @@ class TranslatorApp {
             text: this.inputText.value.trim(),
             source: this.sourceLanguage.value,
             target: this.targetLanguage.value,
-            model: this.modelSelect.value
+            model: this.modelSelect.value,
+            // Edit mode caches per sentence so re-translating after an edit
+            // only sends the changed sentences upstream
+            segmented: this.editMode.checked
         };
         
         try {
@@ -0,0 +1,71 @@
+"""
+Measure event-loop blocking from language detection, inline vs. offloaded.
+
+Runs bursts of concurrent detections on 5000-character inputs while a
+LoopLagMonitor samples the loop, once with everything inline and once per
+executor type.
+
+Usage:
+    python -m benchmarks.bench_loop_lag [--concurrency 50] [--chars 5000] [--output lag.json]
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict
+
+from app.core import executor
+from app.core.settings import settings
+from app.services.detect import create_detector
+from benchmarks.report import build_report, emit_report
+
+SAMPLE = "The quick brown fox jumps over the lazy dog and runs to the river with the others. "
+
+
+async def run_mode(mode: str, concurrency: int, chars: int) -> Dict[str, float]:
+    """Run one burst with the given executor mode and report loop lag."""
+    settings.cpu_executor = mode
+    settings.cpu_offload_threshold_chars = 0 if mode != "none" else chars + 1
+    executor.shutdown_executor()
+
+    detector = create_detector()
+    text = (SAMPLE * (chars // len(SAMPLE) + 1))[:chars]
+    monitor = executor.LoopLagMonitor(interval=0.001)
+    monitor.start()
+    await asyncio.sleep(0.01)  # let the monitor arm its first timer
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*[
+        executor.run_cpu_bound(detector.detect_language, text, size=len(text))
+        for _ in range(concurrency)
+    ])
+    elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+    await asyncio.sleep(0.01)  # let a late timer record its lag
+    await monitor.stop()
+    executor.shutdown_executor()
+    stats = monitor.stats()
+    return {
+        "wall_ms": round(elapsed_ms, 1),
+        "lag_max_ms": round(stats["lag_max_ms"], 1),
+        "lag_avg_ms": round(stats["lag_avg_ms"], 2)
+    }
+
+
+async def main_async(concurrency: int, chars: int) -> Dict[str, Dict[str, float]]:
+    return {mode: await run_mode(mode, concurrency, chars) for mode in ("none", "thread", "process")}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--chars", type=int, default=5000)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args.concurrency, args.chars))
+    config = {"concurrency": args.concurrency, "chars": args.chars}
+    emit_report(build_report("loop_lag", config, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Micro-benchmarks for per-request CPU work on the event loop.
+
+Times language detection (each detector backend), token estimation and
+request model validation at several input sizes.
+
+Usage:
+    python -m benchmarks.bench_micro [--sizes 100,2000,20000] [--repeat 200] [--output micro.json]
+"""
+import argparse
+import timeit
+from typing import Any, Callable, Dict, List
+
+from benchmarks.report import build_report, emit_report
+
+SAMPLE = "The quick brown fox jumps over the lazy dog and runs to the river with the others. "
+
+
+def _time_us(func: Callable[[], Any], repeat: int) -> float:
+    """Best-of-three mean time per call in microseconds."""
+    return round(min(timeit.repeat(func, number=repeat, repeat=3)) / repeat * 1e6, 2)
+
+
+def run(sizes: List[int], repeat: int) -> Dict[str, Dict[str, float]]:
+    """Time each benchmark at each input size."""
+    from app.routers.translate import BatchTranslationRequest, TranslationRequest
+    from app.services.detect import create_detector
+    from app.services.tokens import TokenEstimator
+
+    detectors = {backend: create_detector(backend) for backend in ("rules", "ngram")}
+    estimator = TokenEstimator()
+    results: Dict[str, Dict[str, float]] = {}
+
+    for size in sizes:
+        text = (SAMPLE * (size // len(SAMPLE) + 1))[:size]
+        batch_texts = [SAMPLE] * max(1, min(100, size // len(SAMPLE)))
+        timings = {}
+
+        for backend, detector in detectors.items():
+            timings[f"detect_{backend}_us"] = _time_us(lambda: detector.detect_language(text), repeat)
+
+        timings["estimate_tokens_us"] = _time_us(lambda: estimator.estimate(text, "auto", "ja"), repeat)
+        timings["validate_translate_us"] = _time_us(
+            lambda: TranslationRequest(text=text, source="auto", target="es"), repeat
+        )
+        timings["validate_batch_us"] = _time_us(
+            lambda: BatchTranslationRequest(texts=batch_texts, source="en", targets=["es", "fr"]), repeat
+        )
+        results[f"chars_{size}"] = timings
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="100,2000,20000", help="Comma-separated input sizes in characters")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    report = build_report("micro", {"sizes": sizes, "repeat": args.repeat}, run(sizes, args.repeat))
+    emit_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
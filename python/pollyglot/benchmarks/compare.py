@@ -0,0 +1,85 @@
+"""
+Compare two benchmark reports and flag regressions.
+
+Latency and time metrics (keys ending in _ms or _us) regress when they
+grow, throughput (_rps) when it shrinks, and error rates when they rise,
+by more than the threshold. Exits with status 1 if anything regressed.
+
+Usage:
+    python -m benchmarks.compare baseline.json current.json [--threshold 0.10]
+"""
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+
+def flatten(results: Dict[str, Any], prefix: str = "") -> Dict[str, float]:
+    """Flatten nested numeric results into dotted keys."""
+    flat: Dict[str, float] = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def _direction(key: str) -> Optional[int]:
+    """+1 if higher is worse, -1 if lower is worse, None if not compared."""
+    leaf = key.rsplit(".", 1)[-1]
+    if leaf.endswith(("_ms", "_us")) or leaf == "error_rate":
+        return 1
+    if leaf.endswith("_rps") or leaf == "speedup":
+        return -1
+    return None
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Return one row per compared metric with its relative change."""
+    before = flatten(baseline["results"])
+    after = flatten(current["results"])
+    rows = []
+    for key in sorted(before.keys() & after.keys()):
+        direction = _direction(key)
+        if direction is None:
+            continue
+        old, new = before[key], after[key]
+        change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+        rows.append({
+            "metric": key,
+            "baseline": old,
+            "current": new,
+            "change": round(change, 4),
+            "regressed": change * direction > threshold
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed relative change (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.threshold)
+    regressions = [row for row in rows if row["regressed"]]
+    print(json.dumps({
+        "baseline": baseline.get("git_commit"),
+        "current": current.get("git_commit"),
+        "threshold": args.threshold,
+        "regressions": regressions,
+        "metrics": rows
+    }, indent=2))
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
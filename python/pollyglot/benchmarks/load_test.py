@@ -0,0 +1,194 @@
+"""
+Load test /api/translate against a local fake OpenRouter.
+
+Starts benchmarks.mock_openrouter and the app (uvicorn, rate limiting off,
+upstream pointed at the mock) as subprocesses, drives the translate or
+stream endpoint at a fixed concurrency and reports throughput, latency
+percentiles and error rates as JSON. Use --target to drive an already
+running server instead.
+
+Usage:
+    python -m benchmarks.load_test [--concurrency 50] [--requests 2000]
+        [--endpoint translate|stream] [--workers 1] [--output run.json]
+        [--latency-median 0.3] [--latency-sigma 0.5] [--error-rate 0.01]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+import httpx
+
+from benchmarks import mock_openrouter
+from benchmarks.report import build_report, emit_report, latency_summary
+
+SAMPLE_TEXT = "Good morning! The meeting has been moved to Thursday afternoon, please bring the quarterly report"
+
+
+def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"Server at {url} did not become ready")
+
+
+@contextmanager
+def _process(args: List[str], env: Dict[str, str], ready_url: str) -> Iterator[None]:
+    # stdout carries the app's logs; stderr is inherited so startup errors show
+    process = subprocess.Popen(args, env=env, stdout=subprocess.DEVNULL)
+    try:
+        _wait_ready(ready_url)
+        yield
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+@contextmanager
+def local_servers(args: argparse.Namespace) -> Iterator[str]:
+    """Run the mock upstream and the app; yield the app base URL."""
+    env = dict(os.environ)
+    mock_url = f"http://127.0.0.1:{args.mock_port}"
+    mock_args = [
+        sys.executable, "-m", "benchmarks.mock_openrouter",
+        "--port", str(args.mock_port),
+        "--latency-median", str(args.latency_median),
+        "--latency-sigma", str(args.latency_sigma),
+        "--error-rate", str(args.error_rate),
+        "--rate-limit-rate", str(args.rate_limit_rate),
+        "--retry-after", str(args.retry_after),
+        "--token-interval", str(args.token_interval)
+    ]
+
+    app_url = f"http://127.0.0.1:{args.app_port}"
+    app_env = {
+        **env,
+        "OPENROUTER_API_KEY": env.get("OPENROUTER_API_KEY", "benchmark"),
+        "OPENROUTER_BASE_URL": f"{mock_url}/api/v1",
+        "RATE_LIMIT_ENABLED": "false",
+        "CACHE_ENABLED": "true" if args.cache else "false",
+        "REDIS_URL": ""
+    }
+    app_args = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(args.app_port),
+        "--workers", str(args.workers), "--log-level", "warning"
+    ]
+
+    with _process(mock_args, env, f"{mock_url}/stats"):
+        with _process(app_args, app_env, f"{app_url}/healthz"):
+            yield app_url
+
+
+async def _one_request(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    body: Dict[str, Any],
+    latencies: List[float],
+    first_tokens: List[float],
+    statuses: Dict[str, int]
+) -> None:
+    start = time.perf_counter()
+    status = "error"
+    try:
+        if endpoint == "stream":
+            first_token_seen = False
+            async with client.stream("POST", "/api/translate/stream", json=body) as response:
+                status = str(response.status_code)
+                async for line in response.aiter_lines():
+                    if line == "event: token" and not first_token_seen:
+                        first_token_seen = True
+                        first_tokens.append((time.perf_counter() - start) * 1000)
+                    elif line == "event: error":
+                        status = "stream_error"
+        else:
+            response = await client.post("/api/translate", json=body)
+            status = str(response.status_code)
+    except httpx.TimeoutException:
+        status = "timeout"
+    except httpx.HTTPError:
+        status = "connection_error"
+    latencies.append((time.perf_counter() - start) * 1000)
+    statuses[status] = statuses.get(status, 0) + 1
+
+
+async def drive(base_url: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Send args.requests requests at args.concurrency and summarize them."""
+    latencies: List[float] = []
+    first_tokens: List[float] = []
+    statuses: Dict[str, int] = {}
+    next_index = 0
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        # Warm up connections and lazy initialization outside the measurement
+        await client.post("/api/translate", json={"text": SAMPLE_TEXT, "source": args.source, "target": "es"})
+
+        async def worker() -> None:
+            nonlocal next_index
+            while next_index < args.requests:
+                index = next_index
+                next_index += 1
+                text = SAMPLE_TEXT if args.cache else f"{SAMPLE_TEXT} #{index}"
+                body = {"text": text, "source": args.source, "target": "es"}
+                await _one_request(client, args.endpoint, body, latencies, first_tokens, statuses)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        duration = time.perf_counter() - start
+
+    ok = statuses.get("200", 0) - (statuses.get("stream_error", 0) if args.endpoint == "stream" else 0)
+    results: Dict[str, Any] = {
+        "requests": len(latencies),
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(len(latencies) / duration, 2) if duration else 0.0,
+        "latency": latency_summary(latencies),
+        "status_counts": statuses,
+        "error_rate": round(1 - ok / len(latencies), 4) if latencies else 0.0
+    }
+    if args.endpoint == "stream":
+        results["first_token"] = latency_summary(first_tokens)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--target", help="Base URL of a running server (skips starting local servers)")
+    parser.add_argument("--endpoint", choices=["translate", "stream"], default="translate")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--source", default="en", help="Source language; 'auto' exercises detection")
+    parser.add_argument("--cache", action="store_true", help="Repeat one text with the cache enabled")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the local app")
+    parser.add_argument("--app-port", type=int, default=8901)
+    parser.add_argument("--mock-port", type=int, default=8900)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    mock_openrouter.add_arguments(parser)
+    args = parser.parse_args()
+
+    config = {key: value for key, value in vars(args).items() if key != "output"}
+    if args.target:
+        results = asyncio.run(drive(args.target, args))
+    else:
+        with local_servers(args) as base_url:
+            results = asyncio.run(drive(base_url, args))
+            results["upstream"] = httpx.get(f"http://127.0.0.1:{args.mock_port}/stats").json()
+
+    emit_report(build_report(f"load_{args.endpoint}", config, results), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Local fake OpenRouter chat completions API for load testing.
+
+Latency is drawn from a log-normal distribution, and a configurable share
+of requests fail with 500 or 429 (with Retry-After). Streaming requests
+are answered as server-sent events. Replies echo the prompt text, or a
+JSON array of the same length for packed batch prompts.
+
+Usage:
+    python -m benchmarks.mock_openrouter [--port 8900] [--latency-median 0.3]
+        [--latency-sigma 0.5] [--error-rate 0.0] [--rate-limit-rate 0.0]
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+
+@dataclass
+class MockConfig:
+    """Behaviour of the fake upstream."""
+    latency_median: float = 0.3
+    latency_sigma: float = 0.5
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    token_interval: float = 0.01
+
+    def sample_latency(self) -> float:
+        """Draw one response latency in seconds."""
+        if self.latency_median <= 0:
+            return 0.0
+        return random.lognormvariate(math.log(self.latency_median), self.latency_sigma)
+
+
+def _reply_for(prompt: str) -> str:
+    """Build a deterministic fake translation for a prompt."""
+    text = prompt.split("\n\n", 1)[-1]
+    if text.startswith("["):
+        try:
+            items = json.loads(text)
+            return json.dumps([f"~{item}" for item in items], ensure_ascii=False)
+        except ValueError:
+            pass
+    return f"~{text}"
+
+
+def _tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def create_app(config: MockConfig) -> Starlette:
+    """Create the mock API application."""
+    stats: Dict[str, int] = {"requests": 0, "errors": 0, "rate_limited": 0}
+
+    async def chat_completions(request: Request) -> Response:
+        stats["requests"] += 1
+        payload = await request.json()
+        await asyncio.sleep(config.sample_latency())
+
+        roll = random.random()
+        if roll < config.rate_limit_rate:
+            stats["rate_limited"] += 1
+            return JSONResponse(
+                {"error": {"message": "Rate limit exceeded"}},
+                status_code=429,
+                headers={"Retry-After": str(config.retry_after)}
+            )
+        if roll < config.rate_limit_rate + config.error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"error": {"message": "Upstream error"}}, status_code=500)
+
+        prompt = payload["messages"][-1]["content"]
+        content = _reply_for(prompt)
+        usage = {
+            "prompt_tokens": _tokens(prompt),
+            "completion_tokens": _tokens(content),
+            "total_tokens": _tokens(prompt) + _tokens(content)
+        }
+
+        if payload.get("stream"):
+            return StreamingResponse(
+                _stream(content, usage, payload["model"], config.token_interval),
+                media_type="text/event-stream"
+            )
+
+        return JSONResponse({
+            "id": "mock",
+            "model": payload["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+            "usage": usage
+        })
+
+    async def mock_stats(request: Request) -> Response:
+        return JSONResponse(stats)
+
+    return Starlette(routes=[
+        Route("/api/v1/chat/completions", chat_completions, methods=["POST"]),
+        Route("/stats", mock_stats)
+    ])
+
+
+async def _stream(content: str, usage: Dict[str, int], model: str, interval: float) -> AsyncIterator[str]:
+    words: List[str] = content.split(" ")
+    yield ": OPENROUTER PROCESSING\n\n"
+    for index, word in enumerate(words):
+        delta = word if index == 0 else f" {word}"
+        chunk = {"model": model, "choices": [{"index": 0, "delta": {"content": delta}}]}
+        yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+        await asyncio.sleep(interval)
+    yield f"data: {json.dumps({'model': model, 'choices': [], 'usage': usage})}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add mock behaviour options to a parser."""
+    parser.add_argument("--latency-median", type=float, default=0.3, help="Median upstream latency (s)")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Log-normal sigma; higher means a longer tail")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After sent with 429s (s)")
+    parser.add_argument("--token-interval", type=float, default=0.01, help="Delay between streamed tokens (s)")
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    """Build a MockConfig from parsed arguments."""
+    return MockConfig(
+        latency_median=args.latency_median,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        token_interval=args.token_interval
+    )
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(config_from_args(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
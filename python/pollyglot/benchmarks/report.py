@@ -0,0 +1,59 @@
+"""Shared helpers for machine-readable benchmark reports."""
+import json
+import platform
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Return the q-quantile (0..1) of values using nearest rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def latency_summary(latencies_ms: List[float]) -> Dict[str, float]:
+    """Summarize latencies as p50/p95/p99/max in milliseconds."""
+    return {
+        "p50_ms": round(percentile(latencies_ms, 0.50), 2),
+        "p95_ms": round(percentile(latencies_ms, 0.95), 2),
+        "p99_ms": round(percentile(latencies_ms, 0.99), 2),
+        "max_ms": round(max(latencies_ms), 2) if latencies_ms else 0.0,
+        "mean_ms": round(sum(latencies_ms) / len(latencies_ms), 2) if latencies_ms else 0.0
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(name: str, config: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
+    """Wrap results with the metadata needed to compare runs."""
+    return {
+        "benchmark": name,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": config,
+        "results": results
+    }
+
+
+def emit_report(report: Dict[str, Any], output: Optional[str] = None) -> None:
+    """Print the report as JSON and optionally write it to a file."""
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    sys.stdout.write(text + "\n")
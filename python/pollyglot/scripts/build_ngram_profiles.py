@@ -0,0 +1,49 @@
+"""
+Build ranked character n-gram profiles for NgramLanguageDetector.
+
+Reads one plain-text sample per language from data/language_samples/<code>.txt
+and writes app/services/data/ngram_profiles.json.
+
+Usage:
+    python scripts/build_ngram_profiles.py [--size 300] [--max-n 3]
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.ngram import PROFILES_PATH, extract_ngrams  # noqa: E402
+
+SAMPLES_DIR = Path(__file__).resolve().parent.parent / "data" / "language_samples"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build n-gram language profiles")
+    parser.add_argument("--size", type=int, default=300, help="N-grams kept per language")
+    parser.add_argument("--max-n", type=int, default=3, help="Longest n-gram length")
+    args = parser.parse_args()
+
+    profiles = {}
+    for sample in sorted(SAMPLES_DIR.glob("*.txt")):
+        counts = extract_ngrams(sample.read_text(encoding="utf-8"), args.max_n)
+        # Sort by frequency, then lexically, so rebuilds are reproducible
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        profiles[sample.stem] = [ngram for ngram, _ in ranked[:args.size]]
+
+    PROFILES_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(PROFILES_PATH, "w", encoding="utf-8") as f:
+        json.dump(
+            {"max_n": args.max_n, "size": args.size, "profiles": profiles},
+            f,
+            ensure_ascii=False,
+            separators=(",", ":")
+        )
+
+    print(f"Wrote {len(profiles)} profiles to {PROFILES_PATH}")
+
+
+if __name__ == "__main__":
+    main()
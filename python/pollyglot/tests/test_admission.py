@@ -0,0 +1,225 @@
+"""Tests for upstream admission control."""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, patch
+
+from app.main import app
+from app.services.admission import AdmissionController, AdmissionRejected, Priority
+from app.services.openrouter import OpenRouterService, TranslationResult
+
+client = TestClient(app)
+
+
+class TestLocalAdmission:
+    """Test the in-process slot limit and wait queue."""
+    
+    @pytest.mark.asyncio
+    async def test_limits_concurrency(self):
+        """Test no more than max_inflight calls hold a slot at once."""
+        admission = AdmissionController(max_inflight=2, max_queue=10, queue_timeout=5)
+        running = 0
+        peak = 0
+        
+        async def call():
+            nonlocal running, peak
+            async with admission.slot():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+        
+        await asyncio.gather(*(call() for _ in range(8)))
+        
+        assert peak == 2
+        assert admission.inflight == 0
+        assert admission.admitted == 8
+    
+    @pytest.mark.asyncio
+    async def test_priority_order(self):
+        """Test queued interactive calls are admitted before batch calls."""
+        admission = AdmissionController(max_inflight=1, max_queue=10, queue_timeout=5)
+        order = []
+        holder = await admission.acquire()
+        
+        async def call(name, priority):
+            async with admission.slot(priority):
+                order.append(name)
+        
+        tasks = [
+            asyncio.ensure_future(call("batch", Priority.BATCH)),
+            asyncio.ensure_future(call("background", Priority.BACKGROUND)),
+            asyncio.ensure_future(call("interactive", Priority.INTERACTIVE))
+        ]
+        await asyncio.sleep(0)
+        await admission.release(holder)
+        await asyncio.gather(*tasks)
+        
+        assert order == ["interactive", "batch", "background"]
+    
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """Test callers beyond the queue bound are shed at once."""
+        admission = AdmissionController(max_inflight=1, max_queue=1, queue_timeout=5)
+        holder = await admission.acquire()
+        waiter = asyncio.ensure_future(admission.acquire())
+        await asyncio.sleep(0)
+        
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await admission.acquire()
+        
+        assert exc_info.value.reason == "queue_full"
+        assert exc_info.value.retry_after >= 1
+        await admission.release(holder)
+        await admission.release(await waiter)
+        assert admission.inflight == 0
+    
+    @pytest.mark.asyncio
+    async def test_zero_max_queue_is_unbounded(self):
+        """Test max_queue=0 lets any number of callers wait instead of shedding them."""
+        admission = AdmissionController(max_inflight=1, max_queue=0, queue_timeout=5)
+        holder = await admission.acquire()
+        waiters = [asyncio.ensure_future(admission.acquire()) for _ in range(5)]
+        await asyncio.sleep(0)
+        
+        assert admission.queued == 5
+        assert not admission.rejected
+        await admission.release(holder)
+        for waiter in waiters:
+            await admission.release(await waiter)
+        assert admission.inflight == 0
+    
+    @pytest.mark.asyncio
+    async def test_higher_priority_displaces_lower(self):
+        """Test a full queue makes room for interactive calls by shedding batch ones."""
+        admission = AdmissionController(max_inflight=1, max_queue=1, queue_timeout=5)
+        holder = await admission.acquire()
+        batch = asyncio.ensure_future(admission.acquire(Priority.BATCH))
+        await asyncio.sleep(0)
+        interactive = asyncio.ensure_future(admission.acquire(Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+        
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await batch
+        assert exc_info.value.reason == "displaced"
+        
+        await admission.release(holder)
+        await admission.release(await interactive)
+        assert admission.inflight == 0
+    
+    @pytest.mark.asyncio
+    async def test_queue_timeout(self):
+        """Test waiters give up at the deadline without leaking slots."""
+        admission = AdmissionController(max_inflight=1, max_queue=10, queue_timeout=0.01)
+        holder = await admission.acquire()
+        
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await admission.acquire()
+        
+        assert exc_info.value.reason == "timeout"
+        assert admission.queued == 0
+        await admission.release(holder)
+        assert admission.inflight == 0
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_its_place(self):
+        """Test a cancelled waiter does not consume the next free slot."""
+        admission = AdmissionController(max_inflight=1, max_queue=10, queue_timeout=5)
+        holder = await admission.acquire()
+        waiter = asyncio.ensure_future(admission.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        
+        await admission.release(holder)
+        
+        assert admission.inflight == 0
+        await admission.release(await admission.acquire())
+
+
+class TestGlobalAdmission:
+    """Test the Redis-coordinated limit with a stubbed script."""
+    
+    @pytest.mark.asyncio
+    async def test_waits_for_global_lease(self):
+        """Test a refused lease is retried until granted, then released."""
+        admission = AdmissionController(
+            max_inflight=4, max_queue=10, queue_timeout=5,
+            global_max_inflight=2, redis_url="redis://localhost:1/0"
+        )
+        admission._script = AsyncMock(side_effect=[0, 1])
+        admission._redis = AsyncMock()
+        
+        permit = await admission.acquire()
+        await admission.release(permit)
+        
+        assert admission._script.await_count == 2
+        admission._redis.zrem.assert_awaited_once_with("pollyglot:admission:inflight", permit.lease)
+    
+    @pytest.mark.asyncio
+    async def test_global_timeout_returns_local_slot(self):
+        """Test giving up on the global lease releases the local slot."""
+        admission = AdmissionController(
+            max_inflight=4, max_queue=10, queue_timeout=0.05,
+            global_max_inflight=2, redis_url="redis://localhost:1/0"
+        )
+        admission._script = AsyncMock(return_value=0)
+        
+        with pytest.raises(AdmissionRejected) as exc_info:
+            await admission.acquire()
+        
+        assert exc_info.value.reason == "global_timeout"
+        assert admission.inflight == 0
+    
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_local(self):
+        """Test Redis errors admit on the local limit alone."""
+        admission = AdmissionController(
+            max_inflight=4, max_queue=10, queue_timeout=5,
+            global_max_inflight=2, redis_url="redis://localhost:1/0"
+        )
+        admission._script = AsyncMock(side_effect=ConnectionError("refused"))
+        
+        permit = await admission.acquire()
+        
+        assert permit.lease is None
+        assert admission.inflight == 1
+
+
+class TestServiceIntegration:
+    """Test shed calls surface as 503 responses."""
+    
+    @pytest.mark.asyncio
+    async def test_translate_returns_overloaded_result(self):
+        """Test a rejected upstream call becomes a 503 result with retry_after."""
+        service = OpenRouterService(cache=None)
+        service.cache = None
+        service.admission = AdmissionController(max_inflight=1, max_queue=1, queue_timeout=0.01)
+        holder = await service.admission.acquire()
+        
+        with patch.object(service, "_make_request_with_retries", AsyncMock()) as mock_request:
+            result = await service.translate("Hello", "en", "es")
+        
+        assert result.status_code == 503
+        assert result.retry_after >= 1
+        mock_request.assert_not_awaited()
+        await service.admission.release(holder)
+    
+    @patch("app.routers.translate.openrouter_service.translate")
+    def test_endpoint_returns_503(self, mock_translate):
+        """Test the API maps an overloaded result to 503 with Retry-After."""
+        mock_translate.return_value = TranslationResult(
+            content="",
+            latency_ms=1.0,
+            model="test-model",
+            error="Server overloaded (queue_full), retry later",
+            status_code=503,
+            retry_after=2.5
+        )
+        
+        response = client.post("/api/translate", json={"text": "Hello", "source": "en", "target": "es"})
+        
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "3"
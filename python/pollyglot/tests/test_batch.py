@@ -0,0 +1,149 @@
+"""Tests for batch translation."""
+import json
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch, AsyncMock
+
+from app.main import app
+from app.services.openrouter import OpenRouterService, TranslationResult
+
+client = TestClient(app)
+
+
+class MockResponse:
+    """Minimal successful chat completion response."""
+    
+    def __init__(self, content, total_tokens=None):
+        self.status_code = 200
+        self._content = content
+        self._total_tokens = total_tokens
+    
+    def json(self):
+        data = {"choices": [{"message": {"content": self._content}}]}
+        if self._total_tokens:
+            data["usage"] = {"total_tokens": self._total_tokens}
+        return data
+
+
+class TestTranslateMany:
+    """Test packing in OpenRouterService.translate_many."""
+    
+    @pytest.mark.asyncio
+    async def test_short_texts_are_packed_into_one_prompt(self):
+        """Test texts sharing a language pair use one upstream call."""
+        mock_client = AsyncMock()
+        mock_client.post.return_value = MockResponse(
+            json.dumps(["Hola", "Adiós", "Gracias"]), total_tokens=30
+        )
+        
+        service = OpenRouterService(client=mock_client)
+        results = await service.translate_many([
+            ("Hello", "en", "es"),
+            ("Goodbye", "en", "es"),
+            ("Thanks", "en", "es")
+        ])
+        
+        assert [r.content for r in results] == ["Hola", "Adiós", "Gracias"]
+        assert mock_client.post.call_count == 1
+        
+        payload = mock_client.post.call_args.kwargs["json"]
+        assert json.loads(payload["messages"][1]["content"].split("\n\n", 1)[1]) == ["Hello", "Goodbye", "Thanks"]
+    
+    @pytest.mark.asyncio
+    async def test_unparseable_pack_falls_back_to_single_requests(self):
+        """Test a malformed packed reply is retried per text."""
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = [
+            MockResponse("Hola\nAdiós"),
+            MockResponse("Hola"),
+            MockResponse("Adiós")
+        ]
+        
+        service = OpenRouterService(client=mock_client)
+        results = await service.translate_many([
+            ("Hello", "en", "es"),
+            ("Goodbye", "en", "es")
+        ])
+        
+        assert sorted(r.content for r in results) == ["Adiós", "Hola"]
+        assert mock_client.post.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_language_pairs_are_packed_separately(self):
+        """Test different targets never share a prompt."""
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = [MockResponse("Hola"), MockResponse("Bonjour")]
+        
+        service = OpenRouterService(client=mock_client)
+        results = await service.translate_many([
+            ("Hello", "en", "es"),
+            ("Hello", "en", "fr")
+        ])
+        
+        assert [r.content for r in results] == ["Hola", "Bonjour"]
+        assert mock_client.post.call_count == 2
+
+
+class TestBatchEndpoint:
+    """Test /api/translate/batch."""
+    
+    @patch('app.routers.translate.openrouter_service.translate_many')
+    def test_results_in_order_with_per_item_errors(self, mock_translate_many):
+        """Test results are text-major and errors stay per item."""
+        mock_translate_many.return_value = [
+            TranslationResult(content="Hola", latency_ms=0, model="m"),
+            TranslationResult(content="Bonjour", latency_ms=0, model="m"),
+            TranslationResult(content="", latency_ms=0, model="m", error="Request timeout"),
+            TranslationResult(content="Merci", latency_ms=0, model="m", cached=True)
+        ]
+        
+        response = client.post("/api/translate/batch", json={
+            "texts": ["Hello", "Thanks"],
+            "source": "en",
+            "targets": ["es", "fr"]
+        })
+        
+        assert response.status_code == 200
+        
+        results = response.json()["results"]
+        assert [(r["index"], r["target_language"]) for r in results] == [
+            (0, "es"), (0, "fr"), (1, "es"), (1, "fr")
+        ]
+        assert results[0]["text"] == "Hola"
+        assert results[2]["error"] == "Request timeout"
+        assert results[2]["text"] is None
+        assert results[3]["cached"] is True
+    
+    def test_batch_validation(self):
+        """Test batch request validation."""
+        response = client.post("/api/translate/batch", json={
+            "texts": [],
+            "targets": ["es"]
+        })
+        assert response.status_code == 422
+        
+        response = client.post("/api/translate/batch", json={
+            "texts": ["Hello"],
+            "targets": ["auto"]
+        })
+        assert response.status_code == 422
+        
+        response = client.post("/api/translate/batch", json={
+            "texts": ["Hello"],
+            "source": "en",
+            "targets": ["en", "es"]
+        })
+        assert response.status_code == 400
+    
+    def test_text_limit_follows_max_input_chars(self, monkeypatch):
+        """Test batch texts share the single-request length limit."""
+        from app.core.settings import settings
+        
+        monkeypatch.setattr(settings, "max_input_chars", 10)
+        response = client.post("/api/translate/batch", json={
+            "texts": ["Hello", "x" * 11],
+            "source": "en",
+            "targets": ["es"]
+        })
+        assert response.status_code == 422
+        assert "10 characters" in response.text
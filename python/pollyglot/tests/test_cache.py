@@ -0,0 +1,177 @@
+"""Tests for the translation cache."""
+import json as jsonlib
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from app.services.cache import LRUCache, TranslationCache, make_cache_key
+
+
+class TestCacheKey:
+    """Test cache key normalization."""
+    
+    def test_key_ignores_surrounding_whitespace(self):
+        """Test keys are stable under stripping."""
+        assert make_cache_key("Hello", "en", "es", "m") == make_cache_key("  Hello\n", "en", "es", "m")
+    
+    def test_key_depends_on_all_fields(self):
+        """Test every field participates in the key."""
+        base = make_cache_key("Hello", "en", "es", "m")
+        assert base != make_cache_key("Hello", "auto", "es", "m")
+        assert base != make_cache_key("Hello", "en", "fr", "m")
+        assert base != make_cache_key("Hello", "en", "es", "other")
+
+
+class TestLRUCache:
+    """Test the in-process LRU tier."""
+    
+    def test_evicts_least_recently_used(self):
+        """Test size bound evicts the oldest untouched entry."""
+        cache = LRUCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", {"v": 1})
+        cache.set("b", {"v": 2})
+        cache.get("a")
+        cache.set("c", {"v": 3})
+        
+        assert cache.get("a") == {"v": 1}
+        assert cache.get("b") is None
+        assert cache.get("c") == {"v": 3}
+    
+    def test_expired_entries_are_dropped(self):
+        """Test TTL bound."""
+        cache = LRUCache(max_entries=2, ttl_seconds=0)
+        cache.set("a", {"v": 1})
+        assert cache.get("a") is None
+
+
+class TestRedisTier:
+    """Test Redis failure handling."""
+    
+    @pytest.mark.asyncio
+    async def test_redis_failure_backs_off(self):
+        """Test a failed Redis read skips Redis until the retry window passes."""
+        cache = TranslationCache(max_entries=10, ttl_seconds=60, redis_url="redis://unreachable:6379/0")
+        cache._redis = AsyncMock()
+        cache._redis.get.side_effect = ConnectionError("timed out")
+        
+        assert await cache.get("a") is None
+        assert await cache.get("b") is None
+        await cache.set("c", {"content": "x"})
+        
+        assert cache._redis.get.await_count == 1
+        cache._redis.set.assert_not_awaited()
+        assert await cache.get("c") == {"content": "x"}
+        
+        cache._redis_down_until = 0.0
+        assert await cache.get("d") is None
+        assert cache._redis.get.await_count == 2
+
+
+class TestServiceCaching:
+    """Test the cache in front of OpenRouterService.translate."""
+    
+    @patch('app.services.openrouter.httpx.AsyncClient')
+    @pytest.mark.asyncio
+    async def test_cache_hit_skips_upstream(self, mock_client_class):
+        """Test a repeated request is served from cache."""
+        from app.services.openrouter import OpenRouterService
+        
+        class MockResponse:
+            status_code = 200
+            
+            def json(self):
+                return {"choices": [{"message": {"content": "Hola mundo"}}]}
+        
+        mock_client = AsyncMock()
+        mock_client.post.return_value = MockResponse()
+        mock_client_class.return_value = mock_client
+        
+        service = OpenRouterService(cache=TranslationCache(max_entries=10, ttl_seconds=60))
+        first = await service.translate("Hello world", "en", "es")
+        second = await service.translate("Hello world", "en", "es")
+        
+        assert first.cached is False
+        assert second.cached is True
+        assert second.content == "Hola mundo"
+        assert mock_client.post.call_count == 1
+        assert service.cache.stats()["hits"] == 1
+
+
+class TestSegmentedTranslation:
+    """Test sentence-level caching in OpenRouterService.translate."""
+    
+    @pytest.mark.asyncio
+    async def test_only_changed_sentences_translated(self):
+        """Test an edit re-translates just the new sentences, packed in one prompt."""
+        from app.services.openrouter import OpenRouterService
+        
+        class MockResponse:
+            status_code = 200
+            
+            def __init__(self, content):
+                self._content = content
+            
+            def json(self):
+                return {"choices": [{"message": {"content": self._content}}], "usage": {"total_tokens": 10}}
+        
+        async def fake_post(url, json, **kwargs):
+            prompt = json["messages"][1]["content"].split("\n\n", 1)[1]
+            if prompt.startswith("["):
+                return MockResponse(jsonlib.dumps([text.upper() for text in jsonlib.loads(prompt)]))
+            return MockResponse(prompt.upper())
+        
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = fake_post
+        service = OpenRouterService(client=mock_client, cache=TranslationCache(max_entries=100, ttl_seconds=60))
+        
+        first = await service.translate("One. Two.\n\nThree.", "en", "es", segmented=True)
+        assert first.content == "ONE. TWO.\n\nTHREE."
+        assert mock_client.post.call_count == 1
+        
+        edited = await service.translate("One. Changed.\n\nThree. Four.", "en", "es", segmented=True)
+        assert edited.content == "ONE. CHANGED.\n\nTHREE. FOUR."
+        assert edited.cached is False
+        assert mock_client.post.call_count == 2
+        packed = jsonlib.loads(mock_client.post.call_args.kwargs["json"]["messages"][1]["content"].split("\n\n", 1)[1])
+        assert packed == ["Changed.", "Four."]
+        
+        reordered = await service.translate("Three. One.", "en", "es", segmented=True)
+        assert reordered.content == "THREE. ONE."
+        assert reordered.cached is True
+        assert mock_client.post.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_sentence_error_fails_request(self):
+        """Test an upstream error for any sentence is returned, not spliced in."""
+        from app.services.openrouter import OpenRouterService
+        
+        class MockResponse:
+            def __init__(self, status_code, content=""):
+                self.status_code = status_code
+                self.text = content
+                self._content = content
+            
+            def json(self):
+                if self.status_code != 200:
+                    return {"error": {"message": "bad request"}}
+                return {"choices": [{"message": {"content": self._content}}], "usage": {"total_tokens": 5}}
+        
+        async def fake_post(url, json, **kwargs):
+            prompt = json["messages"][1]["content"].split("\n\n", 1)[1]
+            # Packed prompts and the bad sentence fail; single good sentences succeed
+            if prompt.startswith("[") or prompt == "Bad one.":
+                return MockResponse(400, "bad request")
+            return MockResponse(200, prompt.upper())
+        
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = fake_post
+        service = OpenRouterService(client=mock_client, cache=TranslationCache(max_entries=100, ttl_seconds=60))
+        
+        text = "Good one. Bad one. Fine one."
+        result = await service.translate(text, "en", "es", segmented=True)
+        model = service.default_model
+        
+        assert result.error is not None
+        assert await service.cache.get(make_cache_key(text, "en", "es", model)) is None
+        assert await service.cache.get(make_cache_key("Bad one.", "en", "es", model)) is None
+        assert (await service.cache.get(make_cache_key("Good one.", "en", "es", model)))["content"] == "GOOD ONE."
+        assert (await service.cache.get(make_cache_key("Fine one.", "en", "es", model)))["content"] == "FINE ONE."
@@ -0,0 +1,80 @@
+"""Tests for long-text chunking."""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from app.core.settings import settings
+from app.services.chunking import split_text
+from app.services.openrouter import OpenRouterService
+
+
+class TestSplitText:
+    """Test segment boundaries."""
+    
+    def test_round_trip_and_bound(self):
+        """Test segments respect the limit and rejoin to the input."""
+        text = "First sentence. Second sentence!\n\nNew paragraph here? Yes.\n" + "word " * 50
+        segments = split_text(text, 40)
+        
+        assert "".join(segment + sep for segment, sep in segments) == text
+        assert all(len(segment) <= 40 for segment, _ in segments)
+    
+    def test_prefers_sentence_boundaries(self):
+        """Test sentences are not cut when they fit."""
+        segments = split_text("One two three. Four five six. Seven eight nine.", 30)
+        assert [segment for segment, _ in segments] == [
+            "One two three. Four five six.",
+            "Seven eight nine."
+        ]
+    
+    def test_hard_cut_without_boundaries(self):
+        """Test unbroken text is cut at the limit."""
+        segments = split_text("x" * 25, 10)
+        assert [segment for segment, _ in segments] == ["x" * 10, "x" * 10, "x" * 5]
+    
+    def test_short_text_is_one_segment(self):
+        """Test text under the limit is untouched."""
+        assert split_text("Hello world.", 100) == [("Hello world.", "")]
+
+
+class TestChunkedTranslation:
+    """Test segmented translation in OpenRouterService."""
+    
+    @pytest.mark.asyncio
+    async def test_segments_translated_concurrently_and_reassembled(self, monkeypatch):
+        """Test long text is split, translated in parallel and rejoined in order."""
+        monkeypatch.setattr(settings, "chunk_max_chars", 30)
+        monkeypatch.setattr(settings, "chunk_concurrency", 3)
+        
+        in_flight = 0
+        peak = 0
+        
+        class MockResponse:
+            status_code = 200
+            
+            def __init__(self, content):
+                self._content = content
+            
+            def json(self):
+                return {"choices": [{"message": {"content": self._content}}], "usage": {"total_tokens": 5}}
+        
+        async def fake_post(url, json, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return MockResponse(json["messages"][1]["content"].split("\n\n", 1)[1].upper())
+        
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = fake_post
+        
+        text = "Alpha beta gamma. Delta epsilon.\n\nZeta eta theta. Iota kappa lambda. Mu nu xi omicron."
+        service = OpenRouterService(client=mock_client)
+        result = await service.translate(text, "en", "es")
+        
+        assert result.error is None
+        assert result.content == text.upper()
+        assert mock_client.post.call_count == len(split_text(text, 30))
+        assert result.tokens_used == 5 * mock_client.post.call_count
+        assert 1 < peak <= 3
@@ -0,0 +1,154 @@
+"""Tests for the upstream circuit breaker."""
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch, AsyncMock
+
+from app.main import app
+from app.services import circuit_breaker
+from app.services.circuit_breaker import CircuitBreaker, CircuitBreakerRegistry, CircuitState
+from app.services.openrouter import OpenRouterService, TranslationResult
+
+client = TestClient(app)
+
+
+class FakeClock:
+    """Controllable replacement for time.monotonic."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Patch the breaker's clock."""
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", fake)
+    return fake
+
+
+def make_breaker():
+    return CircuitBreaker(
+        "test",
+        failure_rate_threshold=0.5,
+        minimum_calls=4,
+        window_seconds=30,
+        open_seconds=10,
+        half_open_max_calls=2
+    )
+
+
+class TestCircuitBreaker:
+    """Test state transitions."""
+    
+    def test_opens_at_failure_rate(self, clock):
+        """Test the circuit opens once the failure rate is reached."""
+        breaker = make_breaker()
+        for success in (True, False, True):
+            assert breaker.allow()
+            breaker.record(success)
+        assert breaker.state == CircuitState.CLOSED
+        
+        assert breaker.allow()
+        breaker.record(False)
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.allow() is False
+        assert breaker.retry_after() == 10
+    
+    def test_half_open_probes_close_circuit(self, clock):
+        """Test successful probes close the circuit."""
+        breaker = make_breaker()
+        for _ in range(4):
+            breaker.allow()
+            breaker.record(False)
+        
+        clock.now += 10
+        assert breaker.state == CircuitState.HALF_OPEN
+        assert breaker.allow() and breaker.allow()
+        assert breaker.allow() is False
+        
+        breaker.record(True)
+        breaker.record(True)
+        assert breaker.state == CircuitState.CLOSED
+    
+    def test_failed_probe_reopens_circuit(self, clock):
+        """Test a failed probe opens the circuit again."""
+        breaker = make_breaker()
+        for _ in range(4):
+            breaker.allow()
+            breaker.record(False)
+        
+        clock.now += 10
+        assert breaker.allow()
+        breaker.record(False)
+        assert breaker.state == CircuitState.OPEN
+    
+    def test_neutral_outcomes_release_probe_slots(self, clock):
+        """Test cancelled probes do not leak half-open slots."""
+        breaker = make_breaker()
+        for _ in range(4):
+            breaker.allow()
+            breaker.record(False)
+        
+        clock.now += 10
+        assert breaker.allow() and breaker.allow()
+        breaker.record(None)
+        assert breaker.allow()
+
+
+class TestCircuitBreakerRegistry:
+    """Test the per-model breaker registry."""
+    
+    def test_bounded_by_least_recent_use(self):
+        """Test client-chosen model names cannot grow the registry without limit."""
+        registry = CircuitBreakerRegistry(max_breakers=3)
+        primary = registry.get("openrouter", "primary")
+        for index in range(10):
+            registry.get("openrouter", f"random-{index}")
+            assert registry.get("openrouter", "primary") is primary
+        
+        assert len(registry.stats()) == 3
+        assert "openrouter:primary" in registry.stats()
+
+
+class TestServiceFastFail:
+    """Test fast-failing in OpenRouterService and the router."""
+    
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_upstream(self):
+        """Test an open circuit returns 503 without calling upstream."""
+        mock_client = AsyncMock()
+        service = OpenRouterService(client=mock_client)
+        breaker = service.breakers.get("openrouter", service.default_model)
+        while breaker.state == CircuitState.CLOSED:
+            breaker.allow()
+            breaker.record(False)
+        
+        result = await service.translate("Hello world", "en", "es")
+        
+        assert result.status_code == 503
+        assert result.retry_after > 0
+        mock_client.post.assert_not_called()
+    
+    @patch('app.routers.translate.openrouter_service.translate')
+    def test_router_returns_503_with_retry_after(self, mock_translate):
+        """Test the endpoint surfaces the circuit state."""
+        mock_translate.return_value = TranslationResult(
+            content="",
+            latency_ms=0.1,
+            model="anthropic/claude-3.5-sonnet",
+            error="Upstream temporarily unavailable",
+            status_code=503,
+            retry_after=12.2
+        )
+        
+        response = client.post("/api/translate", json={
+            "text": "Hello world",
+            "source": "en",
+            "target": "es"
+        })
+        
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "13"
@@ -0,0 +1,63 @@
+"""Tests for CPU-bound work offloading."""
+import asyncio
+import threading
+import time
+import pytest
+
+from app.core import executor
+from app.core.settings import settings
+
+
+@pytest.fixture
+def thread_executor(monkeypatch):
+    """Use a thread pool with a small offload threshold."""
+    monkeypatch.setattr(settings, "cpu_executor", "thread")
+    monkeypatch.setattr(settings, "cpu_offload_threshold_chars", 100)
+    executor.shutdown_executor()
+    yield
+    executor.shutdown_executor()
+
+
+class TestRunCpuBound:
+    """Test inline vs. offloaded execution."""
+    
+    @pytest.mark.asyncio
+    async def test_small_inputs_run_inline(self, thread_executor):
+        """Test work below the threshold stays on the loop thread."""
+        thread = await executor.run_cpu_bound(threading.current_thread, size=10)
+        assert thread is threading.current_thread()
+    
+    @pytest.mark.asyncio
+    async def test_large_inputs_are_offloaded(self, thread_executor):
+        """Test work above the threshold runs in the pool."""
+        thread = await executor.run_cpu_bound(threading.current_thread, size=1000)
+        assert thread is not threading.current_thread()
+        assert thread.name.startswith("pollyglot-cpu")
+    
+    @pytest.mark.asyncio
+    async def test_disabled_executor_runs_inline(self, monkeypatch):
+        """Test cpu_executor='none' never offloads."""
+        monkeypatch.setattr(settings, "cpu_executor", "none")
+        executor.shutdown_executor()
+        
+        thread = await executor.run_cpu_bound(threading.current_thread, size=10 ** 6)
+        assert thread is threading.current_thread()
+
+
+class TestLoopLagMonitor:
+    """Test event-loop lag sampling."""
+    
+    @pytest.mark.asyncio
+    async def test_blocking_call_is_recorded(self):
+        """Test a blocking call shows up as loop lag."""
+        monitor = executor.LoopLagMonitor(interval=0.005)
+        monitor.start()
+        await asyncio.sleep(0.01)
+        
+        time.sleep(0.05)
+        await asyncio.sleep(0.01)
+        await monitor.stop()
+        
+        stats = monitor.stats()
+        assert stats["lag_samples"] > 0
+        assert stats["lag_max_ms"] >= 30
@@ -0,0 +1,109 @@
+"""Tests for HTTP caching headers and conditional requests."""
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.main import app
+from app.services.openrouter import TranslationResult
+
+client = TestClient(app)
+
+
+class TestCacheableTranslation:
+    """Test GET /api/translate."""
+    
+    @patch('app.routers.translate.openrouter_service.translate')
+    def test_etag_and_not_modified(self, mock_translate):
+        """Test responses carry ETag/Cache-Control and revalidate with 304."""
+        mock_translate.return_value = TranslationResult(
+            content="Hola mundo",
+            latency_ms=12.0,
+            model="anthropic/claude-3.5-sonnet",
+            tokens_used=15
+        )
+        params = {"text": "Hello world", "source": "en", "target": "es"}
+        
+        response = client.get("/api/translate", params=params)
+        assert response.status_code == 200
+        assert response.json()["text"] == "Hola mundo"
+        etag = response.headers["etag"]
+        assert etag.startswith('W/"')
+        assert response.headers["cache-control"].startswith("public, max-age=")
+        
+        # A different latency does not change the ETag
+        mock_translate.return_value = TranslationResult(
+            content="Hola mundo",
+            latency_ms=1.0,
+            model="anthropic/claude-3.5-sonnet",
+            cached=True
+        )
+        revalidated = client.get("/api/translate", params=params, headers={"If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["etag"] == etag
+        assert revalidated.content == b""
+        
+        mock_translate.return_value = TranslationResult(
+            content="Hola, mundo",
+            latency_ms=1.0,
+            model="anthropic/claude-3.5-sonnet"
+        )
+        changed = client.get("/api/translate", params=params, headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert changed.headers["etag"] != etag
+    
+    @patch('app.routers.translate.token_quota')
+    @patch('app.routers.translate.openrouter_service.translate')
+    def test_not_modified_from_cache_is_not_charged(self, mock_translate, mock_quota):
+        """Test a 304 answered from the translation cache skips quota and translation."""
+        from app.routers.translate import _translation_etag, openrouter_service
+        
+        cache = MagicMock()
+        cache.get = AsyncMock(return_value={"content": "Hola mundo", "model": "m"})
+        etag = _translation_etag("Hola mundo", "en", "es", "m", None)
+        
+        with patch.object(openrouter_service, "cache", cache):
+            response = client.get(
+                "/api/translate",
+                params={"text": "Hello world", "source": "en", "target": "es"},
+                headers={"If-None-Match": etag}
+            )
+        
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        mock_quota.reserve.assert_not_called()
+        mock_translate.assert_not_called()
+    
+    def test_invalid_query_rejected(self):
+        """Test query parameters are validated like the POST body."""
+        response = client.get("/api/translate", params={"text": "Hello", "target": "xx"})
+        assert response.status_code == 422
+        
+        response = client.get("/api/translate", params={"text": "   ", "target": "es"})
+        assert response.status_code == 422
+
+
+class TestPageAndAssetCaching:
+    """Test cache headers on the index page and static files."""
+    
+    def test_index_revalidates_by_etag(self):
+        """Test the page is served with no-cache and an ETag honoring If-None-Match."""
+        response = client.get("/")
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == "no-cache"
+        assert "/static/js/app.js?v=" in response.text
+        
+        revalidated = client.get("/", headers={"If-None-Match": response.headers["etag"]})
+        assert revalidated.status_code == 304
+    
+    def test_static_cache_control(self):
+        """Test versioned assets are immutable and unversioned ones short-lived."""
+        versioned = client.get("/static/css/styles.css?v=abc")
+        assert versioned.status_code == 200
+        assert "immutable" in versioned.headers["cache-control"]
+        
+        plain = client.get("/static/css/styles.css")
+        assert plain.headers["cache-control"].startswith("public, max-age=")
+        assert "immutable" not in plain.headers["cache-control"]
+        
+        revalidated = client.get("/static/css/styles.css", headers={"If-None-Match": plain.headers["etag"]})
+        assert revalidated.status_code == 304
+        assert "cache-control" in revalidated.headers
@@ -0,0 +1,287 @@
+"""Tests for asynchronous translation jobs."""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.main import app
+from app.services.jobs import Job, JobStatus, JobWorkerPool, RedisJobQueue, SQLiteJobQueue
+from app.services.openrouter import TranslationResult
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """A SQLite job queue in a temporary file."""
+    return SQLiteJobQueue(str(tmp_path / "jobs.db"), lease_seconds=60, ttl_seconds=3600, poll_interval=0.01)
+
+
+def make_job(text="Hello", source="en", target="es", **extra):
+    return Job.create({"text": text, "source": source, "target": target, "model": None, **extra})
+
+
+class TestSQLiteQueue:
+    """Test the local SQLite backend."""
+    
+    @pytest.mark.asyncio
+    async def test_claims_in_order_once(self, queue):
+        """Test jobs are claimed oldest first and only once."""
+        first, second = make_job("one"), make_job("two")
+        await queue.enqueue(first)
+        await queue.enqueue(second)
+        
+        claimed, receipt = await queue.claim("w1", timeout=0)
+        assert claimed.id == first.id
+        assert claimed.status == JobStatus.RUNNING
+        assert claimed.attempts == 1
+        assert (await queue.claim("w2", timeout=0))[0].id == second.id
+        assert await queue.claim("w3", timeout=0) is None
+        
+        claimed.status = JobStatus.SUCCEEDED
+        await queue.finish(claimed, receipt)
+        assert (await queue.get(first.id)).status == JobStatus.SUCCEEDED
+    
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed(self, tmp_path):
+        """Test a job held by a dead worker runs again after its lease."""
+        queue = SQLiteJobQueue(str(tmp_path / "jobs.db"), lease_seconds=0, ttl_seconds=3600)
+        await queue.enqueue(make_job())
+        
+        await queue.claim("dead", timeout=0)
+        reclaimed, _ = await queue.claim("alive", timeout=0)
+        
+        assert reclaimed.attempts == 2
+    
+    @pytest.mark.asyncio
+    async def test_claim_wakes_on_enqueue(self, queue):
+        """Test an idle claim returns as soon as a job arrives."""
+        waiting = asyncio.ensure_future(queue.claim("w1", timeout=5))
+        await asyncio.sleep(0.02)
+        job = make_job()
+        await queue.enqueue(job)
+        
+        claimed, _ = await asyncio.wait_for(waiting, 1)
+        assert claimed.id == job.id
+    
+    @pytest.mark.asyncio
+    async def test_unknown_job(self, queue):
+        """Test unknown ids return None."""
+        assert await queue.get("missing") is None
+
+
+class TestRedisQueue:
+    """Test the Redis stream backend with a stubbed client."""
+    
+    @pytest.mark.asyncio
+    async def test_claim_reads_stream_and_acks_on_finish(self):
+        """Test a delivered message is loaded, marked running and acknowledged."""
+        queue = RedisJobQueue("redis://localhost:1/0", lease_seconds=60, ttl_seconds=3600)
+        job = make_job()
+        redis = MagicMock()
+        redis.xgroup_create = AsyncMock()
+        redis.xautoclaim = AsyncMock(return_value=[b"0-0", [], []])
+        redis.xreadgroup = AsyncMock(return_value=[[b"pollyglot:jobs", [(b"1-0", {b"id": job.id.encode()})]]])
+        redis.get = AsyncMock(return_value=job.to_json())
+        redis.set = AsyncMock()
+        redis.xack = AsyncMock()
+        redis.xdel = AsyncMock()
+        queue._redis = redis
+        
+        claimed, receipt = await queue.claim("w1", timeout=1)
+        claimed.status = JobStatus.SUCCEEDED
+        await queue.finish(claimed, receipt)
+        
+        assert receipt == b"1-0"
+        assert claimed.attempts == 1
+        redis.xack.assert_awaited_once_with("pollyglot:jobs", "workers", b"1-0")
+        assert JobStatus.SUCCEEDED.value in redis.set.await_args.args[1]
+
+
+class TestWorkerPool:
+    """Test job execution."""
+    
+    def make_pool(self, queue, translate):
+        service = MagicMock()
+        service.translate = translate
+        return JobWorkerPool(queue, service, concurrency=1)
+    
+    @pytest.mark.asyncio
+    async def test_success(self, queue):
+        """Test a successful translation is recorded on the job."""
+        pool = self.make_pool(queue, AsyncMock(return_value=TranslationResult(
+            content="Hola", latency_ms=10.0, model="test-model", tokens_used=12
+        )))
+        job = make_job()
+        job.attempts = 1
+        
+        await pool.run_job(job)
+        
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.result["text"] == "Hola"
+        assert job.result["tokens_used"] == 12
+    
+    @pytest.mark.asyncio
+    async def test_waits_out_overload(self, queue):
+        """Test shed calls are retried after Retry-After instead of failing."""
+        overloaded = TranslationResult(content="", latency_ms=0, model="m", error="overloaded", status_code=503, retry_after=0.01)
+        ok = TranslationResult(content="Hola", latency_ms=1.0, model="m")
+        translate = AsyncMock(side_effect=[overloaded, ok])
+        pool = self.make_pool(queue, translate)
+        job = make_job()
+        
+        await pool.run_job(job)
+        
+        assert job.status == JobStatus.SUCCEEDED
+        assert translate.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_failure(self, queue):
+        """Test upstream errors fail the job and refund the reservation."""
+        pool = self.make_pool(queue, AsyncMock(return_value=TranslationResult(
+            content="", latency_ms=1.0, model="m", error="HTTP 400: bad request"
+        )))
+        job = make_job(quota_key="1.2.3.4", reserved_tokens=100)
+        
+        with patch("app.services.jobs.token_quota") as mock_quota:
+            mock_quota.settle = AsyncMock()
+            await pool.run_job(job)
+        
+        assert job.status == JobStatus.FAILED
+        assert job.error == "HTTP 400: bad request"
+        reservation, tokens_used = mock_quota.settle.await_args.args
+        assert (reservation.key, reservation.reserved, tokens_used) == ("1.2.3.4", 100, None)
+    
+    @pytest.mark.asyncio
+    async def test_abandons_after_max_attempts(self, queue):
+        """Test a job that keeps crashing its worker is eventually failed and refunded."""
+        translate = AsyncMock()
+        pool = self.make_pool(queue, translate)
+        job = make_job(quota_key="1.2.3.4", reserved_tokens=100)
+        job.attempts = 4
+        
+        with patch("app.services.jobs.token_quota") as mock_quota:
+            mock_quota.settle = AsyncMock()
+            await pool.run_job(job)
+        
+        assert job.status == JobStatus.FAILED
+        translate.assert_not_awaited()
+        reservation, tokens_used = mock_quota.settle.await_args.args
+        assert (reservation.key, reservation.reserved, tokens_used) == ("1.2.3.4", 100, None)
+    
+    @pytest.mark.asyncio
+    @patch("app.services.jobs.socket.getaddrinfo", return_value=[(2, 1, 6, "", ("93.184.215.14", 0))])
+    async def test_worker_drains_queue_and_calls_webhook(self, mock_getaddrinfo, queue):
+        """Test running workers finish queued jobs and deliver webhooks."""
+        pool = self.make_pool(queue, AsyncMock(return_value=TranslationResult(
+            content="Hola", latency_ms=1.0, model="m"
+        )))
+        webhook = MagicMock()
+        webhook.post = AsyncMock(return_value=MagicMock(status_code=200))
+        webhook.aclose = AsyncMock()
+        pool._webhook_client = webhook
+        job = make_job(webhook_url="http://example.com/hook")
+        await queue.enqueue(job)
+        
+        pool.start()
+        for _ in range(100):
+            if webhook.post.await_count:
+                break
+            await asyncio.sleep(0.01)
+        await pool.stop()
+        
+        assert (await queue.get(job.id)).status == JobStatus.SUCCEEDED
+        assert webhook.post.await_args.args == ("http://example.com/hook",)
+        assert webhook.post.await_args.kwargs["json"]["result"]["text"] == "Hola"
+    
+    @pytest.mark.asyncio
+    @patch("app.services.jobs.socket.getaddrinfo", return_value=[(2, 1, 6, "", ("10.0.0.5", 0))])
+    async def test_webhook_resolving_to_private_address_not_called(self, mock_getaddrinfo, queue):
+        """Test a public-looking hostname that resolves internally is never POSTed to."""
+        pool = self.make_pool(queue, AsyncMock())
+        webhook = MagicMock()
+        webhook.post = AsyncMock()
+        pool._webhook_client = webhook
+        
+        await pool._deliver(make_job(webhook_url="http://internal.example.com/hook"))
+        
+        webhook.post.assert_not_awaited()
+
+
+class TestEndpoints:
+    """Test the jobs API."""
+    
+    @pytest.fixture(autouse=True)
+    def local_queue(self, queue):
+        with patch("app.routers.jobs.job_queue", queue):
+            yield
+    
+    def test_create_and_poll(self):
+        """Test a job is accepted with a Location and can be polled."""
+        response = client.post("/api/jobs", json={"text": "Hello", "source": "en", "target": "es"})
+        
+        assert response.status_code == 202
+        job = response.json()
+        assert job["status"] == "queued"
+        assert response.headers["Location"] == f"/api/jobs/{job['id']}"
+        
+        polled = client.get(f"/api/jobs/{job['id']}")
+        assert polled.status_code == 200
+        assert polled.json()["id"] == job["id"]
+    
+    def test_unknown_job_is_404(self):
+        """Test unknown jobs return a JSON 404 rather than the SPA page."""
+        response = client.get("/api/jobs/missing")
+        assert response.status_code == 404
+        assert response.json() == {"detail": "Job not found"}
+    
+    def test_rejects_bad_webhook(self):
+        """Test non-HTTP webhook URLs are rejected."""
+        response = client.post(
+            "/api/jobs",
+            json={"text": "Hello", "source": "en", "target": "es", "webhook_url": "file:///etc/passwd"}
+        )
+        assert response.status_code == 422
+    
+    @pytest.mark.parametrize("url", [
+        "http://127.0.0.1:8000/admin",
+        "http://localhost/hook",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://10.1.2.3/hook",
+        "http://[::1]/hook",
+        "http://[::ffff:192.168.0.1]/hook"
+    ])
+    def test_rejects_internal_webhook(self, url):
+        """Test webhooks pointing into the server's network are rejected."""
+        response = client.post(
+            "/api/jobs",
+            json={"text": "Hello", "source": "en", "target": "es", "webhook_url": url}
+        )
+        assert response.status_code == 422
+    
+    def test_webhook_allowlist(self, monkeypatch):
+        """Test an allowlist admits only its hosts, internal ones included."""
+        from app.core.settings import settings
+        from app.services.jobs import webhook_url_error
+        
+        monkeypatch.setattr(settings, "jobs_webhook_allowed_hosts", ["hooks.internal"])
+        assert webhook_url_error("http://hooks.internal/done") is None
+        assert webhook_url_error("https://example.com/hook") is not None
+    
+    @patch("app.routers.jobs.token_quota")
+    def test_disabled_queue_is_503(self, mock_quota, monkeypatch):
+        """Test jobs are refused without charging quota when no workers run."""
+        from app.core.settings import settings
+        
+        monkeypatch.setattr(settings, "jobs_enabled", False)
+        response = client.post("/api/jobs", json={"text": "Hello", "source": "en", "target": "es"})
+        
+        assert response.status_code == 503
+        assert response.json() == {"detail": "Job queue disabled"}
+        mock_quota.reserve.assert_not_called()
+    
+    def test_same_language_rejected(self):
+        """Test source equal to target is rejected up front."""
+        response = client.post("/api/jobs", json={"text": "Hello", "source": "en", "target": "en"})
+        assert response.status_code == 400
@@ -0,0 +1,94 @@
+"""Tests for structured and queued logging."""
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+
+from app.core.logging import (
+    DeferredQueueHandler,
+    JsonFormatter,
+    SamplingFilter,
+    TextFormatter,
+    log_translation,
+)
+
+
+class ListHandler(logging.Handler):
+    """Collect formatted records."""
+    
+    def __init__(self, formatter):
+        super().__init__()
+        self.setFormatter(formatter)
+        self.lines = []
+    
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+def capture(handler):
+    logger = logging.getLogger("pollyglot.translation")
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    return logger
+
+
+class TestFormatters:
+    """Test record formatting."""
+    
+    def test_json_fields(self):
+        """Test structured fields become top-level JSON keys."""
+        handler = ListHandler(JsonFormatter())
+        logger = capture(handler)
+        try:
+            log_translation("req-1", "en", "es", "m", 12.5, tokens_used=30, cached=False)
+        finally:
+            logger.removeHandler(handler)
+        
+        record = json.loads(handler.lines[-1])
+        assert record["message"] == "Translation completed"
+        assert record["request_id"] == "req-1"
+        assert record["latency_ms"] == 12.5
+        assert record["tokens_used"] == 30
+        assert record["cached"] is False
+    
+    def test_text_keeps_legacy_shape(self):
+        """Test text mode still renders the field dict after the message."""
+        handler = ListHandler(TextFormatter("%(message)s"))
+        logger = capture(handler)
+        try:
+            log_translation("req-2", "en", "es", "m", 1.0)
+        finally:
+            logger.removeHandler(handler)
+        
+        assert handler.lines[-1].startswith("Translation completed: {'request_id': 'req-2'")
+
+
+class TestQueueAndSampling:
+    """Test off-loop handling and sampling."""
+    
+    def test_queue_handler_defers_formatting(self):
+        """Test records reach the listener's handler unformatted."""
+        log_queue = queue.Queue(-1)
+        target = ListHandler(JsonFormatter())
+        listener = QueueListener(log_queue, target)
+        listener.start()
+        
+        handler = DeferredQueueHandler(log_queue)
+        logger = capture(handler)
+        try:
+            log_translation("req-3", "en", "fr", "m", 5.0)
+        finally:
+            logger.removeHandler(handler)
+            listener.stop()
+        
+        assert json.loads(target.lines[-1])["request_id"] == "req-3"
+    
+    def test_sampling_keeps_warnings(self):
+        """Test sampled-out info records are dropped but warnings pass."""
+        sampler = SamplingFilter(0.0)
+        info = logging.LogRecord("x", logging.INFO, "", 0, "msg", None, None)
+        warning = logging.LogRecord("x", logging.WARNING, "", 0, "msg", None, None)
+        
+        assert sampler.filter(info) is False
+        assert sampler.filter(warning) is True
+        assert SamplingFilter(1.0).filter(info) is True
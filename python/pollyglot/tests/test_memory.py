@@ -0,0 +1,134 @@
+"""Tests for the sentence-level translation memory."""
+import pytest
+from unittest.mock import AsyncMock
+
+from app.services.chunking import split_sentences
+from app.services.memory import TranslationMemory, substitute_numbers
+from app.services.openrouter import OpenRouterService
+
+
+class TestSplitSentences:
+    """Test sentence boundaries."""
+    
+    def test_round_trip(self):
+        """Test sentences rejoin to the input."""
+        text = "  First one. Second one!\n\nThird? Yes."
+        sentences = split_sentences(text)
+        
+        assert "".join(sentence + sep for sentence, sep in sentences) == text
+        assert [sentence.strip() for sentence, _ in sentences] == ["First one.", "Second one!", "Third?", "Yes."]
+
+
+class TestSubstituteNumbers:
+    """Test number substitution."""
+    
+    def test_numbers_mapped_by_position(self):
+        """Test each stored number is replaced by its counterpart."""
+        adapted = substitute_numbers("Pay 10 by day 3.", "Paga 10 antes del día 3.", "Pay 25 by day 7.")
+        assert adapted == "Paga 25 antes del día 7."
+    
+    def test_unmappable_numbers_rejected(self):
+        """Test translations that drop or change numbers are not reused."""
+        assert substitute_numbers("Pay 10.", "Paga diez.", "Pay 25.") is None
+        assert substitute_numbers("Pay 10 or 10.", "Paga 10 o 10.", "Pay 1 or 2.") is None
+
+
+class TestTranslationMemory:
+    """Test storage and lookup."""
+    
+    @pytest.mark.asyncio
+    async def test_exact_and_number_matches(self, tmp_path):
+        """Test aligned sentences are stored and reused."""
+        memory = TranslationMemory(str(tmp_path / "tm.db"))
+        await memory.record("Hello there. It costs 5 euros.", "Hola. Cuesta 5 euros.", "en", "es", "m")
+        
+        matches = await memory.lookup(["Hello   there.", "It costs 12 euros.", "Goodbye."], "en", "es")
+        
+        assert matches[0].translation == "Hola." and matches[0].exact
+        assert matches[1].translation == "Cuesta 12 euros." and not matches[1].exact
+        assert matches[2] is None
+        assert memory.stats() == {"exact_hits": 1, "number_hits": 1, "misses": 1}
+        assert await memory.lookup(["Hello there."], "en", "fr") == [None]
+        await memory.close()
+    
+    @pytest.mark.asyncio
+    async def test_misaligned_text_stored_whole(self, tmp_path):
+        """Test texts with differing sentence counts are stored as one unit."""
+        memory = TranslationMemory(str(tmp_path / "tm.db"))
+        await memory.record("One. Two.", "Uno y dos.", "en", "es", "m")
+        
+        assert await memory.lookup(["One."], "en", "es") == [None]
+        matches = await memory.lookup(["One. Two."], "en", "es")
+        assert matches[0].translation == "Uno y dos."
+        await memory.close()
+    
+    @pytest.mark.asyncio
+    async def test_entries_kept_per_model(self, tmp_path):
+        """Test a model-specific lookup only reuses that model's translations."""
+        memory = TranslationMemory(str(tmp_path / "tm.db"))
+        await memory.record("Hello there.", "Hola.", "en", "es", "model-a")
+        await memory.record("Hello there.", "Buenas.", "en", "es", "model-b")
+        
+        assert (await memory.lookup(["Hello there."], "en", "es", "model-a"))[0].translation == "Hola."
+        assert (await memory.lookup(["Hello there."], "en", "es", "model-b"))[0].translation == "Buenas."
+        assert await memory.lookup(["Hello there."], "en", "es", "model-c") == [None]
+        assert (await memory.lookup(["Hello there."], "en", "es"))[0] is not None
+        await memory.close()
+
+
+class TestMemoryReuse:
+    """Test translation memory in OpenRouterService."""
+    
+    @pytest.mark.asyncio
+    async def test_only_unmatched_sentences_sent_upstream(self, tmp_path):
+        """Test matched sentences are filled in and the rest translated."""
+        memory = TranslationMemory(str(tmp_path / "tm.db"))
+        await memory.record("The price is 10 euros.", "El precio es 10 euros.", "en", "es", "m")
+        
+        class MockResponse:
+            status_code = 200
+            
+            def json(self):
+                return {"choices": [{"message": {"content": "Gracias."}}], "usage": {"total_tokens": 7}}
+        
+        mock_client = AsyncMock()
+        mock_client.post.return_value = MockResponse()
+        
+        service = OpenRouterService(client=mock_client, memory=memory)
+        result = await service.translate("The price is 25 euros. Thank you.", "en", "es")
+        
+        assert result.error is None
+        assert result.content == "El precio es 25 euros. Gracias."
+        assert result.tokens_used == 7
+        assert mock_client.post.call_count == 1
+        prompt = mock_client.post.call_args.kwargs["json"]["messages"][1]["content"]
+        assert "Thank you." in prompt and "price" not in prompt
+        
+        # The new sentence was recorded, so the next request needs no upstream call
+        again = await service.translate("Thank you. The price is 3 euros.", "en", "es")
+        assert again.content == "Gracias. El precio es 3 euros."
+        assert again.cached
+        assert mock_client.post.call_count == 1
+        await memory.close()
+    
+    @pytest.mark.asyncio
+    async def test_auto_source_skips_memory(self, tmp_path):
+        """Test memory is not consulted when the source language is unknown."""
+        memory = TranslationMemory(str(tmp_path / "tm.db"))
+        memory.lookup = AsyncMock()
+        
+        class MockResponse:
+            status_code = 200
+            
+            def json(self):
+                return {"choices": [{"message": {"content": "Hola."}}], "usage": {"total_tokens": 3}}
+        
+        mock_client = AsyncMock()
+        mock_client.post.return_value = MockResponse()
+        
+        service = OpenRouterService(client=mock_client, memory=memory)
+        result = await service.translate("Hello.", "auto", "es")
+        
+        assert result.content == "Hola."
+        memory.lookup.assert_not_called()
+        await memory.close()
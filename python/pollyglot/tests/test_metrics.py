@@ -0,0 +1,92 @@
+"""Tests for Prometheus metrics."""
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from unittest.mock import MagicMock
+
+from app.main import app
+from app.core.metrics import model_label, record_translation, track_inflight
+from app.core.settings import settings
+from app.services.openrouter import OpenRouterService
+from app.services.retry import RetryPolicy
+
+client = TestClient(app)
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestMetricsHelpers:
+    """Test recording helpers."""
+    
+    def test_model_label_bounds_cardinality(self):
+        """Test unknown models are grouped."""
+        assert model_label(settings.openrouter_model) == settings.openrouter_model
+        assert model_label("someone/arbitrary-model") == "other"
+        assert model_label(None) == "other"
+    
+    def test_record_translation(self):
+        """Test counters, histogram and tokens are updated."""
+        labels = {"endpoint": "translate", "model": "other", "source": "en", "target": "fi"}
+        before = sample("pollyglot_translation_requests_total", status="ok", **labels)
+        before_tokens = sample("pollyglot_translation_tokens_total", model="other", source="en", target="fi")
+        
+        record_translation("translate", "x/y", "en", "fi", latency_ms=120, tokens_used=7)
+        
+        assert sample("pollyglot_translation_requests_total", status="ok", **labels) == before + 1
+        assert sample("pollyglot_translation_tokens_total", model="other", source="en", target="fi") == before_tokens + 7
+        assert sample("pollyglot_translation_latency_seconds_bucket", le="0.25", **labels) >= 1
+    
+    def test_track_inflight(self):
+        """Test the in-flight gauge is restored after the block."""
+        with track_inflight("test"):
+            assert sample("pollyglot_inflight_requests", endpoint="test") == 1
+        assert sample("pollyglot_inflight_requests", endpoint="test") == 0
+
+
+class TestUpstreamMetrics:
+    """Test upstream attempt metrics."""
+    
+    @pytest.mark.asyncio
+    async def test_retry_and_attempt_metrics(self):
+        """Test every attempt is timed and retries are counted."""
+        responses = iter([(503, {}), (200, {"choices": [{"message": {"content": "Hei"}}]})])
+        
+        async def post(url, **kwargs):
+            status_code, body = next(responses)
+            response = MagicMock()
+            response.status_code = status_code
+            response.text = "unavailable"
+            response.headers = {}
+            response.json.return_value = body
+            return response
+        
+        http_client = MagicMock()
+        http_client.post = post
+        service = OpenRouterService(client=http_client)
+        service.cache = None
+        service.retry_policy = RetryPolicy(max_retries=2, base_delay=0.001, max_delay=0.001)
+        model = settings.openrouter_model
+        retries = sample("pollyglot_upstream_retries_total", model=model)
+        failed = sample("pollyglot_upstream_request_duration_seconds_count", model=model, status="503")
+        
+        result = await service.translate("Hello", "en", "fi")
+        
+        assert result.content == "Hei"
+        assert sample("pollyglot_upstream_retries_total", model=model) == retries + 1
+        assert sample("pollyglot_upstream_request_duration_seconds_count", model=model, status="503") == failed + 1
+        assert sample("pollyglot_upstream_inflight_requests", model=model) == 0
+
+
+class TestMetricsEndpoint:
+    """Test the scrape endpoint."""
+    
+    def test_metrics_endpoint(self):
+        """Test metrics are exposed in the Prometheus text format."""
+        response = client.get("/metrics")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "pollyglot_translation_requests_total" in response.text
+        assert "pollyglot_upstream_request_duration_seconds" in response.text
@@ -0,0 +1,69 @@
+"""Tests for the n-gram language detector."""
+import pytest
+
+from app.services.detect import LanguageDetector, create_detector
+from app.services.ngram import NgramLanguageDetector
+
+
+@pytest.fixture
+def ngram_detector():
+    """N-gram detector instance."""
+    return NgramLanguageDetector()
+
+
+class TestNgramDetector:
+    """Test n-gram and script-based detection."""
+    
+    @pytest.mark.parametrize("text,expected", [
+        ("The quick brown fox jumps over the lazy dog. This is a test.", "en"),
+        ("El rápido zorro marrón salta sobre el perro perezoso. Esta es una prueba.", "es"),
+        ("Bonjour, je voudrais réserver une table pour deux personnes ce soir.", "fr"),
+        ("Ich möchte heute Abend einen Tisch für zwei Personen reservieren.", "de"),
+        ("Ik wil graag een tafel reserveren voor twee personen vanavond.", "nl"),
+        ("Chciałbym zarezerwować stolik dla dwóch osób na dzisiejszy wieczór.", "pl"),
+        ("Bu akşam için iki kişilik bir masa ayırtmak istiyorum.", "tr"),
+        ("Haluaisin varata pöydän kahdelle hengelle tälle illalle.", "fi")
+    ])
+    def test_latin_languages(self, ngram_detector, text, expected):
+        """Test n-gram profiles identify Latin-script languages."""
+        assert ngram_detector.detect_language(text) == expected
+    
+    @pytest.mark.parametrize("text,expected", [
+        ("Я хотел бы заказать столик на двоих.", "ru"),
+        ("今晩二人用のテーブルを予約したいです。", "ja"),
+        ("我想预订今晚两个人的桌子。", "zh"),
+        ("오늘 저녁 두 명 테이블을 예약하고 싶습니다.", "ko"),
+        ("أود حجز طاولة لشخصين هذا المساء.", "ar"),
+        ("मैं आज रात दो लोगों के लिए एक टेबल बुक करना चाहूंगा।", "hi"),
+        ("你好", "zh")
+    ])
+    def test_script_fast_path(self, ngram_detector, text, expected):
+        """Test unique scripts are detected without n-gram scoring."""
+        result = ngram_detector.detect(text)
+        assert result.language == expected
+        assert 0 < result.confidence <= 1.0
+    
+    def test_unknown_text_falls_back_to_auto(self, ngram_detector):
+        """Test ambiguous input is not guessed."""
+        assert ngram_detector.detect_language("xyz abc def ghi jkl mno pqr stu vwx") == "auto"
+        assert ngram_detector.detect_language("Hi") == "auto"
+    
+    def test_rank_returns_sorted_scores(self, ngram_detector):
+        """Test rank lists every profiled language by score."""
+        ranked = ngram_detector.rank("Ich möchte heute Abend einen Tisch reservieren.")
+        
+        assert ranked[0][0] == "de"
+        assert len(ranked) >= 13
+        assert [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+
+
+class TestDetectorFactory:
+    """Test detector backend selection."""
+    
+    def test_backends(self):
+        """Test each configured backend name."""
+        assert isinstance(create_detector("rules"), LanguageDetector)
+        assert isinstance(create_detector("ngram"), NgramLanguageDetector)
+        
+        with pytest.raises(ValueError):
+            create_detector("unknown")
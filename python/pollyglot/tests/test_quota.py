@@ -0,0 +1,154 @@
+"""Tests for token quotas."""
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, patch
+
+from app.core.quota import TokenQuota
+from app.core.rate_limit import RateLimitExceeded
+from app.main import app
+
+client = TestClient(app)
+
+
+class TestLocalQuota:
+    """Test the in-memory quota fallback."""
+    
+    @pytest.mark.asyncio
+    async def test_reserve_until_exhausted(self):
+        """Test reservations draw down the burst and then raise."""
+        quota = TokenQuota(tokens_per_minute=600, burst_tokens=1000)
+        await quota.reserve("k", 600)
+        await quota.reserve("k", 400)
+        
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            await quota.reserve("k", 100)
+        
+        assert exc_info.value.limit == "600 tokens/minute"
+        assert 9 < exc_info.value.retry_after <= 10
+    
+    @pytest.mark.asyncio
+    async def test_settle_refunds_unused_tokens(self):
+        """Test overestimates are returned to the bucket."""
+        quota = TokenQuota(tokens_per_minute=600, burst_tokens=1000)
+        reservation = await quota.reserve("k", 1000)
+        await quota.settle(reservation, 200)
+        await quota.settle(reservation, 200)
+        
+        await quota.reserve("k", 790)
+        with pytest.raises(RateLimitExceeded):
+            await quota.reserve("k", 100)
+    
+    @pytest.mark.asyncio
+    async def test_oversized_request_admitted_from_full_bucket(self):
+        """Test a request larger than the burst is slowed, not refused forever."""
+        quota = TokenQuota(tokens_per_minute=600, burst_tokens=1000)
+        await quota.reserve("k", 5000)
+        
+        with pytest.raises(RateLimitExceeded):
+            await quota.reserve("k", 1)
+    
+    @pytest.mark.asyncio
+    async def test_disabled_quota(self):
+        """Test a disabled quota never refuses."""
+        quota = TokenQuota(tokens_per_minute=1, burst_tokens=1, enabled=False)
+        for _ in range(3):
+            reservation = await quota.reserve("k", 1000)
+            await quota.settle(reservation, 1000)
+
+
+class TestRedisBackend:
+    """Test the Redis token bucket path with a stubbed script."""
+    
+    @pytest.mark.asyncio
+    async def test_reserve_and_settle(self):
+        """Test reserve and settle each run the script once."""
+        quota = TokenQuota(tokens_per_minute=60000, burst_tokens=1000, redis_url="redis://localhost:1/0")
+        quota._script = AsyncMock(return_value=[1, 0, 500])
+        
+        reservation = await quota.reserve("k", 500)
+        await quota.settle(reservation, 300)
+        
+        assert quota._script.await_args_list[0].kwargs == {
+            "keys": ["pollyglot:quota:k"], "args": [1000, 1.0, 500, "reserve"]
+        }
+        assert quota._script.await_args_list[1].kwargs["args"] == [1000, 1.0, 200, "adjust"]
+    
+    @pytest.mark.asyncio
+    async def test_denied_by_script(self):
+        """Test the script's verdict and retry delay are used."""
+        quota = TokenQuota(tokens_per_minute=60000, burst_tokens=1000, redis_url="redis://localhost:1/0")
+        quota._script = AsyncMock(return_value=[0, 2500, 0])
+        
+        with pytest.raises(RateLimitExceeded) as exc_info:
+            await quota.reserve("k", 500)
+        
+        assert exc_info.value.retry_after == 2.5
+    
+    @pytest.mark.asyncio
+    async def test_falls_back_when_redis_fails(self):
+        """Test Redis errors switch to local buckets."""
+        quota = TokenQuota(tokens_per_minute=600, burst_tokens=1000, redis_url="redis://localhost:1/0")
+        quota._script = AsyncMock(side_effect=ConnectionError("refused"))
+        
+        await quota.reserve("k", 1000)
+        with pytest.raises(RateLimitExceeded):
+            await quota.reserve("k", 1000)
+        assert quota._script.await_count == 1
+
+
+class TestEndpoints:
+    """Test quotas applied by the translation endpoints."""
+    
+    @patch("app.routers.translate.token_quota")
+    def test_quota_exceeded_returns_429(self, mock_quota):
+        """Test an exhausted quota is reported as a rate limit."""
+        mock_quota.reserve = AsyncMock(side_effect=RateLimitExceeded("20000 tokens/minute", 3.2))
+        
+        response = client.post("/api/translate", json={"text": "Hello", "source": "en", "target": "es"})
+        
+        assert response.status_code == 429
+        assert response.json()["detail"] == "Rate limit exceeded: 20000 tokens/minute"
+        assert response.headers["Retry-After"] == "4"
+    
+    @patch("app.routers.translate.openrouter_service.translate")
+    @patch("app.routers.translate.token_quota")
+    def test_settles_actual_usage(self, mock_quota, mock_translate):
+        """Test the reservation is settled with the tokens the call used."""
+        from app.services.openrouter import TranslationResult
+        
+        mock_quota.reserve = AsyncMock(return_value="reservation")
+        mock_quota.settle = AsyncMock()
+        mock_translate.return_value = TranslationResult(
+            content="Hola", model="test-model", latency_ms=10.0, tokens_used=12
+        )
+        
+        response = client.post("/api/translate", json={"text": "Hello", "source": "en", "target": "es"})
+        
+        assert response.status_code == 200
+        mock_quota.settle.assert_awaited_once_with("reservation", 12)
+    
+    @patch("app.routers.translate.openrouter_service.translate")
+    @patch("app.routers.translate.token_quota")
+    def test_failed_call_refunds(self, mock_quota, mock_translate):
+        """Test a failed translation settles with no usage."""
+        mock_quota.reserve = AsyncMock(return_value="reservation")
+        mock_quota.settle = AsyncMock()
+        mock_translate.side_effect = Exception("upstream down")
+        
+        response = client.post("/api/translate", json={"text": "Hello", "source": "en", "target": "es"})
+        
+        assert response.status_code == 500
+        mock_quota.settle.assert_awaited_once_with("reservation", None)
+    
+    @patch("app.routers.translate.detector.detect_language")
+    @patch("app.routers.translate.token_quota")
+    def test_stream_rejected_before_reserving(self, mock_quota, mock_detect):
+        """Test a stream refused for its detected language charges nothing."""
+        mock_quota.reserve = AsyncMock(return_value="reservation")
+        mock_quota.settle = AsyncMock()
+        mock_detect.return_value = "es"
+        
+        response = client.post("/api/translate/stream", json={"text": "Hola mundo", "source": "auto", "target": "es"})
+        
+        assert response.status_code == 400
+        mock_quota.reserve.assert_not_awaited()
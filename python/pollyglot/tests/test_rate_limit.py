@@ -0,0 +1,120 @@
+"""Tests for the rate limiter."""
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock
+
+from app.core.rate_limit import (
+    Limiter,
+    RateLimitExceeded,
+    TokenBucket,
+    custom_rate_limit_exceeded_handler,
+    parse_rate,
+)
+
+
+class TestParseRate:
+    """Test rate strings."""
+    
+    def test_parse_rate(self):
+        """Test supported units and multipliers."""
+        assert parse_rate("10/minute") == (10, 60)
+        assert parse_rate("100 / hour") == (100, 3600)
+        assert parse_rate("5/30 seconds") == (5, 30)
+    
+    def test_invalid_rate(self):
+        """Test malformed rates are rejected."""
+        with pytest.raises(ValueError):
+            parse_rate("ten per minute")
+
+
+class TestLocalLimits:
+    """Test the in-memory token bucket fallback."""
+    
+    def test_token_bucket(self):
+        """Test the bucket allows a burst then reports the wait."""
+        bucket = TokenBucket(capacity=2, period=60)
+        assert bucket.acquire() == (True, 0.0)
+        assert bucket.acquire() == (True, 0.0)
+        allowed, retry_after = bucket.acquire()
+        assert allowed is False
+        assert 29 < retry_after <= 30
+    
+    @pytest.mark.asyncio
+    async def test_keys_are_independent(self):
+        """Test each key has its own bucket."""
+        limiter = Limiter()
+        assert (await limiter.check("a", 1, 60))[0] is True
+        assert (await limiter.check("a", 1, 60))[0] is False
+        assert (await limiter.check("b", 1, 60))[0] is True
+
+
+class TestRedisBackend:
+    """Test the Redis GCRA path with a stubbed script."""
+    
+    def test_no_connection_at_construction(self):
+        """Test nothing connects until the first check."""
+        limiter = Limiter(redis_url="redis://localhost:1/0")
+        assert limiter._redis is None
+    
+    @pytest.mark.asyncio
+    async def test_uses_script_result(self):
+        """Test the script's verdict and retry delay are used."""
+        limiter = Limiter(redis_url="redis://localhost:1/0")
+        limiter._script = AsyncMock(return_value=[0, 1500, 0])
+        
+        allowed, retry_after = await limiter.check("k", 10, 60)
+        
+        assert allowed is False
+        assert retry_after == 1.5
+        limiter._script.assert_awaited_once_with(keys=["pollyglot:ratelimit:k"], args=[6000.0, 60000])
+    
+    @pytest.mark.asyncio
+    async def test_falls_back_when_redis_fails(self):
+        """Test Redis errors switch to local buckets for a while."""
+        limiter = Limiter(redis_url="redis://localhost:1/0", redis_retry_seconds=60)
+        limiter._script = AsyncMock(side_effect=ConnectionError("refused"))
+        
+        assert (await limiter.check("k", 1, 60))[0] is True
+        assert (await limiter.check("k", 1, 60))[0] is False
+        assert limiter._script.await_count == 1
+        assert limiter.redis_errors == 1
+
+
+class TestDecorator:
+    """Test the endpoint decorator."""
+    
+    def make_client(self, limiter):
+        app = FastAPI()
+        app.add_exception_handler(RateLimitExceeded, custom_rate_limit_exceeded_handler)
+        
+        @app.get("/limited")
+        @limiter.limit("2/minute")
+        async def limited(request: Request, name: str = "x"):
+            return {"name": name}
+        
+        return TestClient(app)
+    
+    def test_limit_returns_429(self):
+        """Test the third request in a minute is rejected with Retry-After."""
+        client = self.make_client(Limiter())
+        
+        assert client.get("/limited?name=a").json() == {"name": "a"}
+        assert client.get("/limited").status_code == 200
+        response = client.get("/limited")
+        
+        assert response.status_code == 429
+        assert response.json()["detail"] == "Rate limit exceeded: 2/minute"
+        assert 1 <= int(response.headers["Retry-After"]) <= 30
+    
+    def test_disabled_limiter(self):
+        """Test a disabled limiter lets everything through."""
+        client = self.make_client(Limiter(enabled=False))
+        assert all(client.get("/limited").status_code == 200 for _ in range(5))
+    
+    def test_requires_request_parameter(self):
+        """Test endpoints without a request parameter are rejected."""
+        with pytest.raises(TypeError):
+            @Limiter().limit("1/minute")
+            async def endpoint():
+                return None
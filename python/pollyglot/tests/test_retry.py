@@ -0,0 +1,107 @@
+"""Tests for the upstream retry policy."""
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from app.services.openrouter import OpenRouterService
+from app.services.retry import RetryBudget, RetryPolicy, parse_retry_after
+
+
+class MockResponse:
+    """Minimal httpx-like response."""
+    
+    def __init__(self, status_code, json_data=None, headers=None):
+        self.status_code = status_code
+        self._json_data = json_data or {}
+        self.headers = headers or {}
+        self.text = str(self._json_data)
+    
+    def json(self):
+        return self._json_data
+
+
+SUCCESS = MockResponse(200, {"choices": [{"message": {"content": "Hola"}}]})
+
+
+class TestRetryPolicy:
+    """Test policy primitives."""
+    
+    def test_decorrelated_jitter_bounds(self):
+        """Test delays stay between base and max delay."""
+        policy = RetryPolicy(base_delay=0.5, max_delay=4.0)
+        delay = policy.base_delay
+        for _ in range(50):
+            delay = policy.next_delay(delay)
+            assert 0.5 <= delay <= 4.0
+    
+    def test_parse_retry_after(self):
+        """Test seconds, HTTP dates and garbage."""
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+    
+    def test_retry_budget_exhausts(self):
+        """Test retries stop once the budget is spent."""
+        budget = RetryBudget(ratio=0.0, min_per_second=0.0, window=10.0)
+        assert budget.try_spend() is True
+        assert budget.try_spend() is False
+        assert budget.exhausted == 1
+
+
+class TestServiceRetries:
+    """Test retry behaviour of OpenRouterService."""
+    
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        """Test a 400 fails without retrying."""
+        mock_client = AsyncMock()
+        mock_client.post.return_value = MockResponse(400, {"error": "bad request"})
+        
+        service = OpenRouterService(client=mock_client)
+        result = await service.translate("Hello world", "en", "es")
+        
+        assert result.error.startswith("HTTP 400")
+        assert mock_client.post.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_retry_after_is_honored(self):
+        """Test a 429 waits at least as long as Retry-After asks."""
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = [MockResponse(429, headers={"Retry-After": "3"}), SUCCESS]
+        
+        service = OpenRouterService(client=mock_client)
+        with patch('asyncio.sleep') as mock_sleep:
+            result = await service.translate("Hello world", "en", "es")
+        
+        assert result.content == "Hola"
+        assert mock_sleep.call_args.args[0] >= 3
+    
+    @pytest.mark.asyncio
+    async def test_retry_after_beyond_deadline_fails_fast(self):
+        """Test no retry is attempted if waiting would pass the deadline."""
+        mock_client = AsyncMock()
+        mock_client.post.return_value = MockResponse(503, headers={"Retry-After": "120"})
+        
+        service = OpenRouterService(client=mock_client)
+        service.retry_policy = RetryPolicy(deadline=10.0)
+        with patch('asyncio.sleep') as mock_sleep:
+            result = await service.translate("Hello world", "en", "es")
+        
+        assert result.error.startswith("HTTP 503")
+        assert mock_client.post.call_count == 1
+        mock_sleep.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_stops_retries(self):
+        """Test the retry budget caps retry storms."""
+        mock_client = AsyncMock()
+        mock_client.post.return_value = MockResponse(502)
+        
+        service = OpenRouterService(client=mock_client)
+        # One token of reserve and no refill: exactly one retry allowed
+        service.retry_budget = RetryBudget(ratio=0.0, min_per_second=0.1, window=10.0)
+        with patch('asyncio.sleep'):
+            result = await service.translate("Hello world", "en", "es")
+        
+        assert result.error.startswith("HTTP 502")
+        assert mock_client.post.call_count == 2
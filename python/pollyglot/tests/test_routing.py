@@ -0,0 +1,164 @@
+"""Tests for multi-model routing, failover and hedging."""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.openrouter import OpenRouterService, TranslationResult
+from app.services.routing import LatencyTracker, ModelRouter
+
+
+def make_result(model, error=None):
+    return TranslationResult(content="" if error else f"from {model}", latency_ms=0, model=model, error=error)
+
+
+class TestLatencyTracker:
+    """Test latency percentiles."""
+
+    def test_percentile(self):
+        """Test percentiles over recorded samples."""
+        tracker = LatencyTracker()
+        assert tracker.percentile("m", 0.95) is None
+        for value in range(1, 101):
+            tracker.record("m", value / 100)
+        assert tracker.percentile("m", 0.5) == pytest.approx(0.51)
+        assert tracker.percentile("m", 0.95) == pytest.approx(0.96)
+        assert tracker.count("m") == 100
+
+    def test_bounded_models(self):
+        """Test the least recently recorded model is dropped past max_models."""
+        tracker = LatencyTracker(max_models=2)
+        tracker.record("a", 0.1)
+        tracker.record("b", 0.1)
+        tracker.record("a", 0.2)
+        tracker.record("c", 0.1)
+        assert tracker.count("a") == 2
+        assert tracker.count("b") == 0
+        assert tracker.count("c") == 1
+
+
+class TestModelRouter:
+    """Test routing decisions."""
+
+    def test_candidates(self):
+        """Test fallbacks are appended unless the model is pinned."""
+        router = ModelRouter(fallback_models=["b", "a", "c"], hedge_enabled=False)
+        assert router.candidates("a") == ["a", "b", "c"]
+        assert router.candidates("a", pinned=True) == ["a"]
+
+    def test_hedge_delay_uses_observed_percentile(self):
+        """Test the hedge delay switches from the default to the p95."""
+        router = ModelRouter(fallback_models=[], hedge_default_delay=3.0, hedge_min_delay=0.01)
+        assert router.hedge_delay("a") == 3.0
+        for _ in range(ModelRouter.MIN_SAMPLES):
+            router.latency.record("a", 0.2)
+        assert router.hedge_delay("a") == pytest.approx(0.2)
+
+    @pytest.mark.asyncio
+    async def test_failover_on_error(self):
+        """Test the next model is tried when the primary fails."""
+        router = ModelRouter(fallback_models=["b"], hedge_enabled=False)
+        calls = []
+
+        async def call(model):
+            calls.append(model)
+            return make_result(model, error="boom" if model == "a" else None)
+
+        result = await router.run(router.candidates("a"), call, lambda r: bool(r.error))
+
+        assert result.model == "b"
+        assert calls == ["a", "b"]
+        assert router.failovers == 1
+
+    @pytest.mark.asyncio
+    async def test_all_models_fail(self):
+        """Test the last failure is returned when every model fails."""
+        router = ModelRouter(fallback_models=["b"], hedge_enabled=False)
+
+        async def call(model):
+            return make_result(model, error=f"{model} failed")
+
+        result = await router.run(router.candidates("a"), call, lambda r: bool(r.error))
+        assert result.error == "b failed"
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_and_cancels_primary(self):
+        """Test a slow primary is hedged and cancelled when the backup wins."""
+        router = ModelRouter(fallback_models=["b"], hedge_enabled=True, hedge_default_delay=0.01)
+        cancelled = asyncio.Event()
+
+        async def call(model):
+            if model == "a":
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            return make_result(model)
+
+        result = await asyncio.wait_for(
+            router.run(router.candidates("a"), call, lambda r: bool(r.error)),
+            timeout=2
+        )
+        await asyncio.sleep(0)
+
+        assert result.model == "b"
+        assert cancelled.is_set()
+        assert router.hedges == 1
+        assert router.hedge_wins == 1
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        """Test no hedge is sent when the primary answers in time."""
+        router = ModelRouter(fallback_models=["b"], hedge_enabled=True, hedge_default_delay=1.0)
+        call = AsyncMock(side_effect=lambda model: make_result(model))
+
+        result = await router.run(router.candidates("a"), call, lambda r: bool(r.error))
+
+        assert result.model == "a"
+        assert call.await_count == 1
+        assert router.hedges == 0
+        assert router.latency.count("a") == 1
+
+
+class TestServiceRouting:
+    """Test routing through OpenRouterService.translate."""
+
+    def make_service(self, responses):
+        client = MagicMock()
+
+        async def post(url, json=None, **kwargs):
+            response = MagicMock()
+            status, content = responses[json["model"]]
+            response.status_code = status
+            response.text = content
+            response.headers = {}
+            response.json.return_value = {"choices": [{"message": {"content": content}}]}
+            return response
+
+        client.post = post
+        service = OpenRouterService(client=client)
+        service.cache = None
+        service.router = ModelRouter(fallback_models=["backup"], hedge_enabled=False)
+        service.default_model = "primary"
+        return service
+
+    @pytest.mark.asyncio
+    async def test_unpinned_request_fails_over(self):
+        """Test the reported model is the fallback that answered."""
+        service = self.make_service({"primary": (400, "bad model"), "backup": (200, "Hola")})
+
+        result = await service.translate("Hello", "en", "es")
+
+        assert result.error is None
+        assert result.content == "Hola"
+        assert result.model == "backup"
+
+    @pytest.mark.asyncio
+    async def test_pinned_request_does_not_fail_over(self):
+        """Test an explicitly requested model is never substituted."""
+        service = self.make_service({"primary": (400, "bad model"), "backup": (200, "Hola")})
+
+        result = await service.translate("Hello", "en", "es", model="primary")
+
+        assert result.error == "HTTP 400: bad model"
+        assert result.model == "primary"
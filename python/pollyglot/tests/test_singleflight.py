@@ -0,0 +1,117 @@
+"""Tests for in-flight request coalescing."""
+import asyncio
+import pytest
+from unittest.mock import patch, AsyncMock
+
+from app.services.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    """Test SingleFlight semantics."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_execution(self):
+        """Test identical concurrent calls run the work once."""
+        flight = SingleFlight()
+        calls = 0
+        
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+        
+        results = await asyncio.gather(*[flight.do("key", work) for _ in range(5)])
+        
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert len(flight) == 0
+    
+    @pytest.mark.asyncio
+    async def test_errors_fan_out_to_all_callers(self):
+        """Test an exception reaches every waiting caller."""
+        flight = SingleFlight()
+        
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream failed")
+        
+        results = await asyncio.gather(
+            flight.do("key", work),
+            flight.do("key", work),
+            return_exceptions=True
+        )
+        
+        assert all(isinstance(r, ValueError) for r in results)
+    
+    @pytest.mark.asyncio
+    async def test_leader_cancellation_keeps_work_for_followers(self):
+        """Test cancelling the first caller does not cancel shared work."""
+        flight = SingleFlight()
+        
+        async def work():
+            await asyncio.sleep(0.02)
+            return "result"
+        
+        leader = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+        
+        assert await follower == "result"
+        assert leader.cancelled()
+    
+    @pytest.mark.asyncio
+    async def test_work_cancelled_when_all_callers_leave(self):
+        """Test shared work is cancelled once no caller awaits it."""
+        flight = SingleFlight()
+        started = asyncio.Event()
+        finished = False
+        
+        async def work():
+            nonlocal finished
+            started.set()
+            await asyncio.sleep(1)
+            finished = True
+        
+        caller = asyncio.ensure_future(flight.do("key", work))
+        await started.wait()
+        caller.cancel()
+        await asyncio.sleep(0.01)
+        
+        assert finished is False
+        assert len(flight) == 0
+
+
+class TestServiceCoalescing:
+    """Test coalescing in OpenRouterService.translate."""
+    
+    @patch('app.services.openrouter.httpx.AsyncClient')
+    @pytest.mark.asyncio
+    async def test_duplicate_translations_share_upstream_call(self, mock_client_class):
+        """Test concurrent identical translations make one upstream call."""
+        from app.services.openrouter import OpenRouterService
+        
+        class MockResponse:
+            status_code = 200
+            
+            def json(self):
+                return {"choices": [{"message": {"content": "Hola mundo"}}]}
+        
+        async def slow_post(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return MockResponse()
+        
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = slow_post
+        mock_client_class.return_value = mock_client
+        
+        service = OpenRouterService()
+        results = await asyncio.gather(*[
+            service.translate("Hello world", "en", "es") for _ in range(10)
+        ])
+        
+        assert all(r.content == "Hola mundo" for r in results)
+        assert results[0] is results[-1]
+        assert mock_client.post.call_count == 1
@@ -0,0 +1,117 @@
+"""Tests for token estimation."""
+from unittest.mock import patch
+
+from app.services.openrouter import OpenRouterService
+from app.services.tokens import PROMPT_OVERHEAD_TOKENS, TokenEstimator
+
+
+class TestCount:
+    """Test input token counts."""
+    
+    def test_latin_text(self):
+        """Test Latin text counts about four characters per token."""
+        estimator = TokenEstimator()
+        assert estimator.count("a" * 400) == (100, None)
+    
+    def test_cjk_text(self):
+        """Test CJK characters count about one token each."""
+        estimator = TokenEstimator()
+        tokens, script = estimator.count("ありがとうございます")
+        assert tokens == 10
+        assert script == "kana"
+    
+    def test_mixed_text_uses_dominant_script(self):
+        """Test a few foreign characters do not change the dominant script."""
+        estimator = TokenEstimator()
+        assert estimator.count("Tokyo (東京) is a big city")[1] is None
+    
+    def test_missing_tokenizer_falls_back(self):
+        """Test the tiktoken backend degrades to ratio tables if unavailable."""
+        estimator = TokenEstimator(backend="tiktoken")
+        with patch.dict("sys.modules", {"tiktoken": None}):
+            assert estimator.count("a" * 400) == (100, None)
+
+
+class TestEstimate:
+    """Test output predictions and budgets."""
+    
+    def test_target_expansion(self):
+        """Test dense targets are predicted to need more tokens."""
+        estimator = TokenEstimator()
+        text = "The meeting has been moved to Thursday afternoon. " * 4
+        
+        assert estimator.estimate(text, "en", "hi").output_tokens > estimator.estimate(text, "en", "es").output_tokens
+        assert estimator.estimate(text, "en", "es").total == (
+            PROMPT_OVERHEAD_TOKENS + estimator.count(text)[0] + estimator.estimate(text, "en", "es").output_tokens
+        )
+    
+    def test_auto_source_from_script(self):
+        """Test auto sources are treated as the script's language."""
+        estimator = TokenEstimator()
+        text = "Привет, как у тебя дела сегодня?"
+        assert estimator.estimate(text, "auto", "en") == estimator.estimate(text, "ru", "en")
+    
+    def test_max_tokens_well_below_character_heuristic(self):
+        """Test Latin budgets are far tighter than three tokens per character."""
+        estimator = TokenEstimator(headroom=1.5, floor=64)
+        text = "Good morning, the quarterly report is attached. " * 20
+        
+        assert 64 < estimator.max_tokens(text, "en", "fr") < len(text)
+    
+    def test_floor_for_short_texts(self):
+        """Test tiny inputs still get room for a full reply."""
+        estimator = TokenEstimator(floor=64)
+        assert estimator.max_tokens("Hi", "en", "ja") == 64
+    
+    def test_packed_budget_covers_each_text(self):
+        """Test a packed budget is at least the sum of its parts plus array syntax."""
+        estimator = TokenEstimator(floor=1)
+        texts = ["Hello there, friend."] * 10
+        single = estimator.estimate(texts[0], "en", "de").output_tokens
+        
+        assert estimator.packed_max_tokens(texts, "en", "de") >= single * 10 * estimator.headroom
+
+
+class TestCalibration:
+    """Test learning from observed usage."""
+    
+    def test_converges_to_observed_ratio(self):
+        """Test repeated observations pull the estimate toward reality."""
+        estimator = TokenEstimator(calibration_alpha=0.5)
+        text = "a" * 400
+        before = estimator.estimate(text, "en", "es").output_tokens
+        actual_output = before * 2
+        
+        for _ in range(20):
+            estimator.observe(text, "en", "es", PROMPT_OVERHEAD_TOKENS + 100 + actual_output)
+        
+        assert abs(estimator.estimate(text, "en", "es").output_tokens - actual_output) <= 2
+        assert set(estimator.stats()) == {"en->es"}
+    
+    def test_correction_is_bounded(self):
+        """Test outliers cannot push the correction past its bounds."""
+        estimator = TokenEstimator(calibration_alpha=1.0)
+        estimator.observe("a" * 400, "en", "es", 1000000)
+        assert estimator.stats()["en->es"] == 3.0
+    
+    def test_ignores_missing_usage(self):
+        """Test results without usage do not calibrate."""
+        estimator = TokenEstimator()
+        estimator.observe("a" * 400, "en", "es", None)
+        assert estimator.stats() == {}
+
+
+class TestPayload:
+    """Test the estimator sizes upstream requests."""
+    
+    def test_payload_uses_estimate(self):
+        """Test max_tokens comes from the estimator instead of character count."""
+        service = OpenRouterService(cache=None)
+        text = "Please confirm the delivery address for tomorrow. " * 10
+        
+        with patch("app.services.openrouter.token_estimator") as mock_estimator:
+            mock_estimator.max_tokens.return_value = 321
+            payload = service._build_payload(text, "en", "ja", "test-model")
+        
+        assert payload["max_tokens"] == 321
+        mock_estimator.max_tokens.assert_called_once_with(text, "en", "ja")
@@ -0,0 +1,109 @@
+"""Tests for request tracing."""
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from app.main import app
+from app.core.tracing import HttpTraceRecorder, Trace, _current_trace, span, to_otlp
+from app.services.openrouter import TranslationResult
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def trace():
+    """Make a trace current for the test."""
+    current = Trace("test")
+    token = _current_trace.set(current)
+    yield current
+    _current_trace.reset(token)
+
+
+class TestSpans:
+    """Test span recording."""
+    
+    def test_span_without_trace_is_noop(self):
+        """Test spans outside a traced request record nothing."""
+        with span("detect") as recorded:
+            assert recorded is None
+    
+    def test_nested_spans_and_breakdown(self, trace):
+        """Test parents, per-name totals and the Server-Timing rendering."""
+        with span("upstream") as outer:
+            with span("retry_wait") as inner:
+                pass
+        with span("upstream"):
+            pass
+        
+        assert inner.parent_id == outer.span_id
+        assert outer.parent_id == trace.root_id
+        assert list(trace.breakdown()) == ["retry_wait", "upstream"]
+        assert trace.server_timing().startswith("retry_wait;dur=")
+    
+    @pytest.mark.asyncio
+    async def test_spans_follow_tasks(self, trace):
+        """Test spans opened in child tasks land in the request trace."""
+        async def work():
+            with span("cache"):
+                await asyncio.sleep(0)
+        
+        with span("upstream") as parent:
+            await asyncio.gather(work(), work())
+        
+        children = [recorded for recorded in trace.spans if recorded.name == "cache"]
+        assert len(children) == 2
+        assert all(child.parent_id == parent.span_id for child in children)
+    
+    @pytest.mark.asyncio
+    async def test_http_trace_recorder(self, trace):
+        """Test httpcore events become acquire/connect/ttfb/body spans."""
+        recorder = HttpTraceRecorder()
+        for event in (
+            "connection.connect_tcp.started", "connection.connect_tcp.complete",
+            "http11.send_request_headers.started", "http11.receive_response_headers.complete",
+            "http11.receive_response_body.started", "http11.receive_response_body.complete"
+        ):
+            await recorder(event, {})
+        recorder.record(trace)
+        
+        assert [recorded.name for recorded in trace.spans] == ["acquire", "connect", "ttfb", "body"]
+    
+    def test_otlp_export_shape(self, trace):
+        """Test the OTLP/JSON document carries root and child spans."""
+        with span("detect", language="en"):
+            pass
+        trace.end = trace.start + 0.01
+        
+        spans = to_otlp(trace)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert spans[0]["spanId"] == trace.root_id
+        assert spans[1]["parentSpanId"] == trace.root_id
+        assert spans[1]["attributes"] == [{"key": "language", "value": {"stringValue": "en"}}]
+        assert all(recorded["traceId"] == trace.trace_id for recorded in spans)
+
+
+class TestTracingEndpoint:
+    """Test Server-Timing and the debug field."""
+    
+    @patch('app.routers.translate.openrouter_service.translate')
+    def test_server_timing_and_debug_timings(self, mock_translate):
+        """Test stages are reported in the header and debug field."""
+        mock_translate.return_value = TranslationResult(content="Hola", latency_ms=5, model="m")
+        
+        response = client.post("/api/translate?debug=true", json={
+            "text": "Hello, how are you doing today?",
+            "source": "auto",
+            "target": "es"
+        })
+        
+        assert response.status_code == 200
+        timing = response.headers["server-timing"]
+        assert "validation;dur=" in timing
+        assert "detect;dur=" in timing
+        assert "total;dur=" in timing
+        assert set(response.json()["timings"]) >= {"validation", "detect"}
+    
+    def test_non_api_paths_are_not_traced(self):
+        """Test health checks carry no Server-Timing header."""
+        response = client.get("/healthz")
+        assert "server-timing" not in response.headers
@@ -6,6 +6,7 @@ from unittest.mock import patch, AsyncMock
 import json
 
 from app.main import app
+from app.core.settings import settings
 from app.services.openrouter import TranslationResult
 
 client = TestClient(app)
@@ -23,6 +24,15 @@ class TestHealthEndpoint:
         assert data["status"] == "ok"
         assert "timestamp" in data
         assert data["service"] == "pollyglot-translator"
+    
+    def test_upstream_pool_stats(self):
+        """Test upstream pool statistics are exposed."""
+        response = client.get("/healthz/upstream")
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["status"] == "ok"
+        assert "connections" in data["pool"]
 
 
 class TestTranslationEndpoint:
@@ -55,6 +65,7 @@ class TestTranslationEndpoint:
         assert data["latency_ms"] == 250.5
         assert data["tokens_used"] == 15
         assert data["detected_language"] is None
+        assert data["cached"] is False
     
     @patch('app.routers.translate.openrouter_service.translate')
     @patch('app.routers.translate.detector.detect_language')
@@ -93,7 +104,8 @@ class TestTranslationEndpoint:
             text="Hello world",
             source="en",
             target="fr",
-            model=None
+            model=None,
+            segmented=False
         )
     
     def test_validation_errors(self):
@@ -132,7 +144,7 @@ class TestTranslationEndpoint:
         
         # Text too long
         response = client.post("/api/translate", json={
-            "text": "x" * 5001,
+            "text": "x" * (settings.max_input_chars + 1),
             "source": "en",
             "target": "es"
         })
@@ -196,10 +208,60 @@ class TestTranslationEndpoint:
             text="Hello world",
             source="en",
             target="es",
-            model="openai/gpt-4o"
+            model="openai/gpt-4o",
+            segmented=False
         )
 
 
+class TestStreamingEndpoint:
+    """Test streaming translation endpoint."""
+    
+    @patch('app.routers.translate.openrouter_service.translate_stream')
+    def test_stream_emits_tokens_and_trailing_metadata(self, mock_stream):
+        """Test tokens are forwarded and metadata arrives last."""
+        from app.services.openrouter import StreamEvent
+        
+        async def fake_stream(**kwargs):
+            yield StreamEvent("token", {"text": "Hola"})
+            yield StreamEvent("token", {"text": " mundo"})
+            yield StreamEvent("done", {
+                "model": "anthropic/claude-3.5-sonnet",
+                "latency_ms": 120.0,
+                "first_token_ms": 40.0,
+                "tokens_used": 15,
+                "cached": False
+            })
+        
+        mock_stream.side_effect = fake_stream
+        
+        response = client.post("/api/translate/stream", json={
+            "text": "Hello world",
+            "source": "en",
+            "target": "es"
+        })
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        
+        events = [block for block in response.text.split("\n\n") if block]
+        assert events[0] == 'event: token\ndata: {"text": "Hola"}'
+        assert events[-1].startswith("event: done")
+        
+        done = json.loads(events[-1].split("data: ", 1)[1])
+        assert done["tokens_used"] == 15
+        assert done["source_language"] == "en"
+        assert done["target_language"] == "es"
+    
+    def test_stream_validation(self):
+        """Test streaming shares TranslationRequest validation."""
+        response = client.post("/api/translate/stream", json={
+            "text": "Hello",
+            "source": "en",
+            "target": "auto"
+        })
+        assert response.status_code == 422
+
+
 class TestOpenRouterService:
     """Test OpenRouter service integration."""
     
@@ -207,9 +269,11 @@ class TestOpenRouterService:
     def mock_httpx_response(self):
         """Mock HTTP response fixture."""
         class MockResponse:
-            def __init__(self, status_code, json_data):
+            def __init__(self, status_code, json_data, headers=None):
                 self.status_code = status_code
                 self._json_data = json_data
+                self.headers = headers or {}
+                self.text = str(json_data)
             
             def json(self):
                 return self._json_data
@@ -237,7 +301,7 @@ class TestOpenRouterService:
         # Mock client
         mock_client = AsyncMock()
         mock_client.post.return_value = mock_response
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
         
         service = OpenRouterService()
         result = await service.translate("Hello world", "en", "es")
@@ -266,7 +330,7 @@ class TestOpenRouterService:
         # Mock client with rate limit then success
         mock_client = AsyncMock()
         mock_client.post.side_effect = [mock_rate_limit, mock_success]
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
         
         service = OpenRouterService()
         
@@ -290,7 +354,7 @@ class TestOpenRouterService:
         # Mock client that raises timeout
         mock_client = AsyncMock()
         mock_client.post.side_effect = httpx.TimeoutException("Request timeout")
-        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value = mock_client
         
         service = OpenRouterService()
         
@@ -299,6 +363,65 @@ class TestOpenRouterService:
         
         assert result.content == ""
         assert "timeout" in result.error.lower()
+    
+    @patch('app.services.openrouter.httpx.AsyncClient')
+    @pytest.mark.asyncio
+    async def test_client_reused_across_requests(self, mock_client_class, mock_httpx_response):
+        """Test the pooled client is created once and reused."""
+        from app.services.openrouter import OpenRouterService
+        
+        mock_client = AsyncMock()
+        mock_client.post.return_value = mock_httpx_response(200, {
+            "choices": [{"message": {"content": "Hola"}}]
+        })
+        mock_client_class.return_value = mock_client
+        
+        service = OpenRouterService()
+        await service.startup()
+        await service.translate("Hello", "en", "es")
+        await service.translate("Goodbye", "en", "es")
+        await service.shutdown()
+        
+        assert mock_client_class.call_count == 1
+        assert mock_client.post.call_count == 2
+        mock_client.aclose.assert_awaited_once()
+    
+    @pytest.mark.asyncio
+    async def test_translate_stream_parses_sse(self):
+        """Test OpenRouter SSE chunks become token events."""
+        from app.services.openrouter import OpenRouterService
+        
+        lines = [
+            ": OPENROUTER PROCESSING",
+            'data: {"choices": [{"delta": {"content": "Hola"}}]}',
+            'data: {"choices": [{"delta": {"content": " mundo"}}]}',
+            'data: {"choices": [], "usage": {"total_tokens": 12}}',
+            "data: [DONE]"
+        ]
+        
+        class MockStreamResponse:
+            status_code = 200
+            
+            async def aiter_lines(self):
+                for line in lines:
+                    yield line
+            
+            async def __aenter__(self):
+                return self
+            
+            async def __aexit__(self, *args):
+                return False
+        
+        mock_client = AsyncMock()
+        mock_client.stream = lambda *args, **kwargs: MockStreamResponse()
+        
+        service = OpenRouterService(client=mock_client)
+        events = [event async for event in service.translate_stream("Hello world", "en", "es")]
+        
+        assert [e.data["text"] for e in events if e.event == "token"] == ["Hola", " mundo"]
+        assert events[-1].event == "done"
+        assert events[-1].data["tokens_used"] == 12
+        assert events[-1].data["first_token_ms"] is not None
 
 
 class TestLanguageDetection:
@@ -335,6 +458,29 @@ class TestLanguageDetection:
         text = "xyz abc def ghi jkl mno pqr stu vwx"
         result = detector.detect_language(text)
         assert result == "auto"
+    
+    def test_detect_reports_confidence_and_ranking(self):
+        """Test detect returns confidence and ranked scores."""
+        from app.services.detect import detector
+        
+        result = detector.detect("The cat is on the table and the dog is in the garden.")
+        assert result.language == "en"
+        assert 0.5 < result.confidence <= 1.0
+        assert result.ranked[0][0] == "en"
+    
+    def test_matches_legacy_regex_detector(self):
+        """Test the indexed detector agrees with the regex implementation."""
+        from app.services.detect import detector
+        from benchmarks.bench_detect import legacy_detect
+        
+        samples = [
+            "Der Hund ist in dem Garten und die Katze hat einen Ball.",
+            "Il gatto è sul tavolo e il cane è nella casa della nonna.",
+            "O gato está em cima da mesa e o cão está com os outros.",
+            "Le chat est dans la maison avec les enfants pour le dîner."
+        ]
+        for text in samples:
+            assert detector.detect_language(text) == legacy_detect(text)
 
 
 # Test fixtures and utilities
@@ -358,7 +504,8 @@ def sample_translation_response():
         "model": "anthropic/claude-3.5-sonnet",
         "latency_ms": 250.5,
         "tokens_used": 15,
-        "detected_language": None
+        "detected_language": None,
+        "cached": False
     }
 
 
@@ -0,0 +1,118 @@
+"""Tests for catalog warm-up."""
+import json as jsonlib
+import pytest
+from unittest.mock import AsyncMock
+
+from app.services.cache import TranslationCache, make_cache_key
+from app.services.openrouter import OpenRouterService, TranslationResult
+from app.services.warmup import WarmupProgress, read_catalog, warm_cache
+
+
+class TestReadCatalog:
+    """Test catalog formats."""
+    
+    def test_json_nested_strings(self, tmp_path):
+        """Test every string leaf of a JSON resource file is read once."""
+        path = tmp_path / "en.json"
+        path.write_text(jsonlib.dumps({"nav": {"home": "Home", "help": " Help "}, "list": ["Home", "Save"], "n": 3}))
+        
+        assert read_catalog(str(path)) == ["Home", "Help", "Save"]
+    
+    def test_csv_column(self, tmp_path):
+        """Test the named CSV column is read and a missing one rejected."""
+        path = tmp_path / "strings.csv"
+        path.write_text('id,message\n1,"Hello, world"\n2,Bye\n3,\n')
+        
+        assert read_catalog(str(path), column="message") == ["Hello, world", "Bye"]
+        with pytest.raises(ValueError):
+            read_catalog(str(path))
+    
+    def test_po_msgids(self, tmp_path):
+        """Test msgids are read with continuation lines and escapes."""
+        path = tmp_path / "messages.po"
+        path.write_text(
+            'msgid ""\nmsgstr ""\n"Content-Type: text/plain; charset=UTF-8\\n"\n\n'
+            '#: app.py:1\nmsgid "Save"\nmsgstr ""\n\n'
+            'msgid ""\n"Say \\"hi\\" "\n"twice"\nmsgstr ""\n\n'
+            'msgid "One file"\nmsgid_plural "%d files"\nmsgstr[0] ""\nmsgstr[1] ""\n'
+        )
+        
+        assert read_catalog(str(path)) == ["Save", 'Say "hi" twice', "One file", "%d files"]
+    
+    def test_unknown_format(self, tmp_path):
+        """Test unsupported extensions are rejected."""
+        with pytest.raises(ValueError):
+            read_catalog(str(tmp_path / "strings.xml"))
+
+
+class TestWarmCache:
+    """Test warming the cache through OpenRouterService."""
+    
+    @pytest.mark.asyncio
+    async def test_populates_cache_and_resumes(self, tmp_path):
+        """Test results are cached, progress recorded and finished strings skipped."""
+        class MockResponse:
+            status_code = 200
+            
+            def __init__(self, content):
+                self._content = content
+            
+            def json(self):
+                return {"choices": [{"message": {"content": self._content}}], "usage": {"total_tokens": 8}}
+        
+        async def fake_post(url, json, **kwargs):
+            prompt = json["messages"][1]["content"].split("\n\n", 1)[1]
+            if prompt.startswith("["):
+                return MockResponse(jsonlib.dumps([text.upper() for text in jsonlib.loads(prompt)]))
+            return MockResponse(prompt.upper())
+        
+        mock_client = AsyncMock()
+        mock_client.post.side_effect = fake_post
+        service = OpenRouterService(client=mock_client, cache=TranslationCache(max_entries=100, ttl_seconds=60))
+        progress_path = tmp_path / "progress"
+        
+        report = await warm_cache(
+            service, ["Home", "Save", "Help"], "en", ["es", "fr"],
+            progress=WarmupProgress(str(progress_path))
+        )
+        
+        assert (report.translated, report.failed, report.skipped) == (6, 0, 0)
+        assert mock_client.post.call_count == 2
+        cached = await service.cache.get(make_cache_key("Save", "en", "fr", service.default_model))
+        assert cached["content"] == "SAVE"
+        assert len(progress_path.read_text().splitlines()) == 6
+        
+        resumed = await warm_cache(
+            service, ["Home", "Save", "Help", "Exit"], "en", ["es"],
+            progress=WarmupProgress(str(progress_path))
+        )
+        assert (resumed.translated, resumed.skipped) == (1, 3)
+    
+    @pytest.mark.asyncio
+    async def test_short_strings_hit_for_auto_source(self):
+        """Test a warmed string too short to detect is a hit for source=auto."""
+        mock_client = AsyncMock()
+        service = OpenRouterService(client=mock_client, cache=TranslationCache(max_entries=10, ttl_seconds=60))
+        service.translate_many = AsyncMock(return_value=[
+            TranslationResult(content="Guardar", latency_ms=0, model=service.default_model)
+        ])
+        
+        await warm_cache(service, ["Save"], "en", ["es"])
+        result = await service.translate("Save", "auto", "es")
+        
+        assert result.cached
+        assert result.content == "Guardar"
+        mock_client.post.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_overloaded_items_retried(self):
+        """Test items shed by admission control are retried after Retry-After."""
+        overloaded = TranslationResult(content="", latency_ms=0, model="m", error="busy", status_code=503, retry_after=0.01)
+        done = TranslationResult(content="Hola", latency_ms=0, model="m")
+        service = OpenRouterService(client=AsyncMock(), cache=TranslationCache(max_entries=10, ttl_seconds=60))
+        service.translate_many = AsyncMock(side_effect=[[overloaded], [done]])
+        
+        report = await warm_cache(service, ["Hello"], "en", ["es"])
+        
+        assert (report.translated, report.failed) == (1, 0)
+        assert service.translate_many.await_count == 2
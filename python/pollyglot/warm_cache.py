@@ -0,0 +1,83 @@
+"""
+Warm the translation cache from a string catalog before traffic arrives.
+
+Translates every string of a JSON, CSV or PO catalog into the given target
+languages and stores the results where the server looks them up: the Redis
+cache tier (REDIS_URL) and the translation memory (MEMORY_ENABLED). With
+neither configured the results only live in this process and are lost.
+
+Usage:
+    python warm_cache.py catalog.po --source en --targets es,fr,de
+    python warm_cache.py strings.csv --column message --targets ja --concurrency 4
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.settings import settings  # noqa: E402
+from app.services.openrouter import OpenRouterService  # noqa: E402
+from app.services.warmup import WarmupProgress, read_catalog, warm_cache  # noqa: E402
+
+
+async def run(args: argparse.Namespace) -> int:
+    texts = read_catalog(args.catalog, args.column)
+    targets = [target.strip() for target in args.targets.split(",") if target.strip()]
+    progress = WarmupProgress(args.progress or f"{args.catalog}.warmup-progress")
+
+    service = OpenRouterService()
+    if service.cache is None or (service.cache.redis_url is None and service.memory is None):
+        print("Warning: no shared cache (REDIS_URL) or translation memory (MEMORY_ENABLED); "
+              "results will not outlive this process")
+
+    print(
+        f"Warming {len(texts)} strings into {', '.join(targets)} "
+        f"({len(progress.done)} already done)"
+    )
+    await service.startup()
+    try:
+        report = await warm_cache(
+            service,
+            texts,
+            args.source,
+            targets,
+            model=args.model,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            progress=progress
+        )
+    finally:
+        await service.shutdown()
+
+    print(
+        f"Translated {report.translated}, already cached {report.cached}, "
+        f"skipped {report.skipped}, failed {report.failed}"
+    )
+    return 1 if report.failed else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompute translations for a string catalog")
+    parser.add_argument("catalog", help="Catalog file (.json, .csv or .po)")
+    parser.add_argument("--source", default="en", help="Source language code")
+    parser.add_argument("--targets", required=True, help="Comma-separated target language codes")
+    parser.add_argument("--model", default=None, help="Model to use (defaults to OPENROUTER_MODEL)")
+    parser.add_argument("--column", default="text", help="CSV column holding the source text")
+    parser.add_argument("--concurrency", type=int, default=2, help="Batches translated at once")
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.batch_max_texts, help="Strings per batch"
+    )
+    parser.add_argument(
+        "--progress", default=None, help="Progress file (defaults to <catalog>.warmup-progress)"
+    )
+    args = parser.parse_args()
+
+    if args.source == "auto":
+        parser.error("--source must be a language code; cache keys use the resolved source")
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()